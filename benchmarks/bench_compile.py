@@ -0,0 +1,208 @@
+"""Speed of compile paths with synthetic stylesheets.
+
+Cases cover cold start, warm embedded compiles, module depth,
+large-output framing and directory builds.
+It needs Dart Sass executable.
+
+Run all cases by :file:`benchmarks/run.py` to save and compare results as JSON.
+This script prints table only.
+
+.. code-block:: console
+
+   python benchmarks/bench_compile.py
+"""
+
+import statistics
+import tempfile
+import time
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+from stylesheets import (
+    make_large_output,
+    make_module_chain,
+    make_project,
+    make_stylesheet,
+)
+
+from sass_embedded import simple
+from sass_embedded.protocol.compiler import Host, make_compile_request
+
+Operation = Callable[[], object]
+
+
+@dataclass
+class Case:
+    """Benchmark case.
+
+    ``setup`` receives working directory and yields operation to measure.
+    Resources (for example host process) are released after all iterations.
+    """
+
+    name: str
+    setup: Callable[[Path], AbstractContextManager[Operation]]
+    repeat: int
+    """Default number of measured iterations."""
+
+
+CASES: list[Case] = []
+
+
+def case(name: str, repeat: int = 20):
+    """Register generator function as case."""
+
+    def _register(func: Callable[[Path], Iterator[Operation]]):
+        CASES.append(Case(name, contextmanager(func), repeat))
+        return func
+
+    return _register
+
+
+def _check(result: simple.Result):
+    if not result.ok:
+        raise Exception(result.error)
+
+
+# Cold start
+
+
+@case("cold/cli-compile-string", repeat=5)
+def cold_cli(workdir: Path):
+    source = make_stylesheet(10)
+    yield lambda: _check(simple.compile_string(source))
+
+
+@case("cold/host-start-compile", repeat=5)
+def cold_host(workdir: Path):
+    message = make_compile_request(source=make_stylesheet(10))
+
+    def run():
+        host = Host()
+        host.connect()
+        host.compile(message)
+        host.close()
+
+    yield run
+
+
+# Warm compiles on embedded host
+
+
+def _warm_string(rules: int):
+    def setup(workdir: Path):
+        source = make_stylesheet(rules)
+        with simple.Compiler(warm_up=True) as compiler:
+            compiler.host.wait_ready()
+            yield lambda: _check(compiler.compile_string(source))
+
+    return setup
+
+
+for _rules in (10, 1_000, 10_000):
+    case(f"warm/compile-string-{_rules}", repeat=50 if _rules < 10_000 else 10)(
+        _warm_string(_rules)
+    )
+
+
+@case("warm/host-compile-1000", repeat=50)
+def warm_host(workdir: Path):
+    message = make_compile_request(source=make_stylesheet(1_000))
+    host = Host()
+    host.connect(warm_up=True)
+    host.wait_ready()
+    try:
+        yield lambda: host.compile(message)
+    finally:
+        host.close()
+
+
+# Module depth
+
+
+def _modules(depth: int):
+    def setup(workdir: Path):
+        entry = make_module_chain(workdir / f"depth{depth}", depth)
+        dest = workdir / f"depth{depth}.css"
+        with simple.Compiler() as compiler:
+            yield lambda: _check(compiler.compile_file(entry, dest, no_sourcemap=True))
+
+    return setup
+
+
+for _depth in (1, 10, 50):
+    case(f"modules/use-depth-{_depth}")(_modules(_depth))
+
+
+# Large output
+
+
+def _large_output(rules: int):
+    def setup(workdir: Path):
+        message = make_compile_request(source=make_large_output(rules))
+        host = Host()
+        host.connect()
+        try:
+            yield lambda: host.compile(message)
+        finally:
+            host.close()
+
+    return setup
+
+
+for _rules in (10_000, 100_000):
+    case(f"framing/output-{_rules}-rules", repeat=10)(_large_output(_rules))
+
+
+# Directory builds
+
+
+@case("directory/cli-20-entries", repeat=5)
+def directory_cli(workdir: Path):
+    source = make_project(workdir / "cli", 20, 100)
+    dest = workdir / "cli-dist"
+    yield lambda: _check(simple.compile_directory(source, dest, no_sourcemap=True))
+
+
+@case("directory/parallel-20-entries", repeat=5)
+def directory_parallel(workdir: Path):
+    source = make_project(workdir / "parallel", 20, 100)
+    dest = workdir / "parallel-dist"
+
+    def run():
+        results = simple.compile_directory_parallel(source, dest, no_sourcemap=True)
+        for result in results.values():
+            _check(result)
+
+    yield run
+
+
+def measure(target: Case, workdir: Path, repeat: int | None = None) -> list[float]:
+    """Retrieve seconds of each iteration of case.
+
+    First iteration is not measured to exclude lazy initialization.
+    """
+    with target.setup(workdir) as operation:
+        operation()
+        times = []
+        for _ in range(repeat or target.repeat):
+            start = time.perf_counter()
+            operation()
+            times.append(time.perf_counter() - start)
+    return times
+
+
+def main():
+    print(f"{'case':<35} {'median ms':>10} {'min ms':>10}")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for target in CASES:
+            times = measure(target, Path(tmpdir))
+            print(
+                f"{target.name:<35} {statistics.median(times) * 1000:>10.2f}"
+                f" {min(times) * 1000:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Throughput of packet reader for large responses.
+
+This sends synthetic compile responses through OS pipe,
+and measures time to receive and parse them.
+It does not need Dart Sass executable.
+
+.. code-block:: console
+
+   python benchmarks/bench_framing.py
+"""
+
+import io
+import os
+import threading
+import time
+
+
+from sass_embedded.protocol._varint import encode_varint
+from sass_embedded.protocol.compiler import READ_BUFFER_SIZE, _receive
+from sass_embedded.protocol.embedded_sass_pb2 import OutboundMessage
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000, 5_000_000, 20_000_000]
+
+
+def make_packet(size: int) -> bytes:
+    msg = OutboundMessage()
+    msg.compile_response.success.css = "a" * size
+    body = encode_varint(1) + msg.SerializeToString()
+    return encode_varint(len(body)) + body
+
+
+def measure(size: int, repeat: int) -> float:
+    """Retrieve seconds to receive one packet of size."""
+    packet = make_packet(size)
+    rfd, wfd = os.pipe()
+
+    def write():
+        with os.fdopen(wfd, "wb", buffering=0) as fp:
+            for _ in range(repeat):
+                fp.write(packet)
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    with os.fdopen(rfd, "rb", buffering=0) as raw:
+        stream = io.BufferedReader(raw, buffer_size=READ_BUFFER_SIZE)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            _receive(stream)
+        elapsed = time.perf_counter() - start
+    writer.join()
+    return elapsed / repeat
+
+
+def main():
+    print(f"{'size':>12} {'msec/packet':>12} {'MB/s':>10}")
+    for size in SIZES:
+        repeat = max(3, min(1000, 20_000_000 // size))
+        sec = measure(size, repeat)
+        print(f"{size:>12,} {sec * 1000:>12.3f} {size / sec / 1_000_000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
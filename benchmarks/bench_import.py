@@ -0,0 +1,46 @@
+"""Time to import package in fresh interpreter.
+
+This runs new Python process for each statement and reports median time.
+It does not need Dart Sass executable.
+
+.. code-block:: console
+
+   python benchmarks/bench_import.py
+"""
+
+import statistics
+import subprocess
+import sys
+
+STATEMENTS = [
+    "pass",
+    "import sass_embedded",
+    "from sass_embedded import compile_string",
+    "import sass_embedded.protocol.compiler",
+]
+REPEAT = 10
+
+
+def measure(statement: str) -> float:
+    """Retrieve seconds to run statement, excluded startup of interpreter."""
+    code = (
+        "import time\n"
+        "start = time.perf_counter()\n"
+        f"{statement}\n"
+        "print(time.perf_counter() - start)"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return float(proc.stdout)
+
+
+def main():
+    print(f"{'statement':<45} {'median ms':>10}")
+    for statement in STATEMENTS:
+        times = [measure(statement) for _ in range(REPEAT)]
+        print(f"{statement:<45} {statistics.median(times) * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Speed of conversion between Sass values and protobuf for large maps.
+
+This compares :py:mod:`sass_embedded.values` with generic conversion
+by ``google.protobuf.json_format``.
+It does not need Dart Sass executable.
+
+.. code-block:: console
+
+   python benchmarks/bench_values.py
+"""
+
+import time
+
+from google.protobuf.json_format import MessageToDict
+
+from sass_embedded.values import (
+    SassColor,
+    SassMap,
+    SassNumber,
+    SassString,
+    decode,
+    encode,
+)
+
+SIZES = [100, 1_000, 10_000, 100_000]
+
+
+def make_map(size: int) -> SassMap:
+    return SassMap(
+        (
+            SassString(f"key-{i}", quoted=False),
+            SassColor("rgb", i % 256, 0, 0) if i % 2 else SassNumber(i, "px"),
+        )
+        for i in range(size)
+    )
+
+
+def measure(func, repeat: int) -> float:
+    """Retrieve seconds of one call."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    print(f"{'entries':>10} {'encode ms':>10} {'decode ms':>10} {'json_format ms':>15}")
+    for size in SIZES:
+        repeat = max(3, 100_000 // size)
+        obj = make_map(size)
+        value = encode(obj)
+        enc = measure(lambda: encode(obj), repeat)
+        dec = measure(lambda: decode(value), repeat)
+        naive = measure(lambda: MessageToDict(value), repeat)
+        print(
+            f"{size:>10,} {enc * 1000:>10.2f} {dec * 1000:>10.2f} {naive * 1000:>15.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""Runner of benchmark cases that saves and compares results as JSON.
+
+Cases are collected from ``CASES`` of :file:`benchmarks/bench_*.py`.
+Results have statistics in seconds and metadata of environment,
+so that they can be compared across commits.
+
+.. code-block:: console
+
+   python benchmarks/run.py run -o before.json
+   git switch feature
+   python benchmarks/run.py run -o after.json
+   python benchmarks/run.py compare before.json after.json
+"""
+
+import argparse
+import datetime
+import fnmatch
+import importlib
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+here = Path(__file__).parent
+
+
+def collect_cases() -> list:
+    cases = []
+    for path in sorted(here.glob("bench_*.py")):
+        module = importlib.import_module(path.stem)
+        cases += getattr(module, "CASES", [])
+    return cases
+
+
+def _git_commit() -> str | None:
+    proc = subprocess.run(
+        ["git", "rev-parse", "HEAD"], cwd=here, capture_output=True, text=True
+    )
+    return proc.stdout.strip() if proc.returncode == 0 else None
+
+
+def metadata() -> dict:
+    """Retrieve information of environment for results."""
+    from sass_embedded import __version__
+    from sass_embedded.dart_sass import resolve_executable
+
+    executable = resolve_executable()
+    return {
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "commit": _git_commit(),
+        "version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "dart_sass": {
+            "version": executable.version,
+            "mode": executable.mode,
+            "command": executable.command,
+        },
+    }
+
+
+def summarize(times: list[float]) -> dict:
+    return {
+        "repeat": len(times),
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.mean(times),
+        "stdev": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "times": times,
+    }
+
+
+def run(args: argparse.Namespace) -> int:
+    from bench_compile import measure
+
+    cases = [
+        c
+        for c in collect_cases()
+        if not args.filter or any(fnmatch.fnmatch(c.name, p) for p in args.filter)
+    ]
+    if not cases:
+        print("No cases are matched.", file=sys.stderr)
+        return 1
+    results = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for case in cases:
+            workdir = Path(tmpdir) / case.name.replace("/", "-")
+            workdir.mkdir()
+            results[case.name] = summarize(measure(case, workdir, args.repeat))
+            print(
+                f"{case.name:<35} {results[case.name]['median'] * 1000:>10.2f} ms",
+                file=sys.stderr,
+            )
+    data = {"metadata": metadata(), "results": results}
+    text = json.dumps(data, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+def compare(args: argparse.Namespace) -> int:
+    base = json.loads(args.base.read_text())["results"]
+    target = json.loads(args.target.read_text())["results"]
+    regressions = 0
+    print(f"{'case':<35} {'base ms':>10} {'target ms':>10} {'ratio':>7}")
+    for name in sorted(base.keys() & target.keys()):
+        before = base[name][args.stat]
+        after = target[name][args.stat]
+        ratio = after / before
+        mark = ""
+        if ratio > 1 + args.threshold:
+            mark = "slower"
+            regressions += 1
+        elif ratio < 1 - args.threshold:
+            mark = "faster"
+        print(
+            f"{name:<35} {before * 1000:>10.2f} {after * 1000:>10.2f}"
+            f" {ratio:>7.2f} {mark}"
+        )
+    for name in sorted(base.keys() ^ target.keys()):
+        print(f"{name:<35} (only in {'base' if name in base else 'target'})")
+    return 1 if regressions else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="Run cases and write JSON.")
+    run_parser.add_argument(
+        "-k",
+        dest="filter",
+        action="append",
+        help="Glob pattern of case names (for example 'warm/*').",
+    )
+    run_parser.add_argument("-n", "--repeat", type=int, help="Iterations per case.")
+    run_parser.add_argument("-o", "--output", type=Path, help="Path of JSON.")
+    run_parser.set_defaults(handler=run)
+    compare_parser = commands.add_parser(
+        "compare", help="Compare two JSON. Exit by 1 when any case is slower."
+    )
+    compare_parser.add_argument("base", type=Path)
+    compare_parser.add_argument("target", type=Path)
+    compare_parser.add_argument(
+        "--stat", default="median", choices=["min", "median", "mean"]
+    )
+    compare_parser.add_argument(
+        "--threshold", type=float, default=0.1, help="Allowed ratio of change."
+    )
+    compare_parser.set_defaults(handler=compare)
+    args = parser.parse_args()
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""Generators of synthetic stylesheets for benchmarks.
+
+Outputs are deterministic, so results can be compared across commits.
+"""
+
+from pathlib import Path
+
+
+def make_stylesheet(rules: int) -> str:
+    """Make SCSS source that has variables, mixins, nesting and loops.
+
+    :param rules: Number of top-level rules. Output CSS grows linearly by it.
+    """
+    lines = [
+        '@use "sass:math";',
+        "$base: 4px;",
+        "@mixin box($n) {",
+        "  margin: $base * $n;",
+        "  padding: math.div($base * $n, 2);",
+        "}",
+    ]
+    for i in range(rules):
+        lines += [
+            f".block-{i} {{",
+            f"  @include box({i % 8 + 1});",
+            f"  color: hsl({i % 360}, 50%, 50%);",
+            f"  &__item {{ width: {i % 100}%; }}",
+            f"  &:hover {{ opacity: {(i % 10) / 10}; }}",
+            "}",
+        ]
+    return "\n".join(lines) + "\n"
+
+
+def make_large_output(rules: int) -> str:
+    """Make short SCSS source that generates large CSS by loop.
+
+    :param rules: Number of generated rules. Each rule is about 60 bytes.
+    """
+    return (
+        f"@for $i from 1 through {rules} {{\n"
+        "  .u-#{$i} { margin: #{$i}px; padding: #{$i * 2}px; }\n"
+        "}\n"
+    )
+
+
+def make_module_chain(root: Path, depth: int) -> Path:
+    """Write modules that use next one by ``@use``, and retrieve entry point.
+
+    :param root: Directory to write modules.
+    :param depth: Number of modules in chain.
+    """
+    root.mkdir(parents=True, exist_ok=True)
+    for level in range(depth):
+        lines = []
+        if level + 1 < depth:
+            lines.append(f'@use "level{level + 1}";')
+        lines += [
+            f"$size-{level}: {level + 1}px;",
+            f"@mixin level-{level} {{ margin: $size-{level}; }}",
+            f".level-{level} {{ @include level-{level}; }}",
+        ]
+        (root / f"_level{level}.scss").write_text("\n".join(lines) + "\n")
+    entry = root / "main.scss"
+    entry.write_text('@use "level0";\n')
+    return entry
+
+
+def make_project(root: Path, entries: int, rules: int) -> Path:
+    """Write directory that has entry points sharing partials.
+
+    :param root: Directory to write project.
+    :param entries: Number of entry points.
+    :param rules: Number of rules per entry point.
+    :returns: Source directory.
+    """
+    source = root / "src"
+    source.mkdir(parents=True, exist_ok=True)
+    (source / "_tokens.scss").write_text(
+        "\n".join(f"$color-{i}: hsl({i * 7 % 360}, 40%, 50%);" for i in range(50))
+        + "\n"
+    )
+    for i in range(entries):
+        (source / f"page{i}.scss").write_text(
+            '@use "tokens";\n'
+            + make_stylesheet(rules)
+            + f".page-{i} {{ color: tokens.$color-{i % 50}; }}\n"
+        )
+    return source
@@ -1,7 +1,58 @@
-"""sass-embedded is Dart Sass bindings for Python."""
+"""sass-embedded is Dart Sass bindings for Python.
+
+Public functions are imported at first access,
+so ``import sass_embedded`` does not load protobuf and other dependencies.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING
 
 __version__ = "0.1.5"
 
-from .simple import compile_directory, compile_file, compile_string
+if TYPE_CHECKING:
+    from . import protocol as protocol
+    from .simple import (
+        Compiler,
+        compile_directory,
+        compile_directory_parallel,
+        compile_file,
+        compile_many,
+        compile_string,
+    )
+
+__all__ = [
+    "Compiler",
+    "compile_directory",
+    "compile_directory_parallel",
+    "compile_file",
+    "compile_many",
+    "compile_string",
+]
+
+_LAZY_ATTRIBUTES = {name: ".simple" for name in __all__}
+_LAZY_MODULES = {
+    "cache",
+    "dart_sass",
+    "metrics",
+    "protocol",
+    "simple",
+    "values",
+    "watch",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_MODULES:
+        return importlib.import_module(f".{name}", __name__)
+    if name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(_LAZY_ATTRIBUTES[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
-__all__ = ["compile_directory", "compile_file", "compile_string"]
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__) | _LAZY_MODULES)
@@ -0,0 +1,78 @@
+"""Command line entry point.
+
+Usage: ``python -m sass_embedded watch SOURCE DEST``
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .watch import watch
+
+if TYPE_CHECKING:
+    from .simple import Result
+
+
+def _report(entry: Path, result: Result[Path]):
+    if result.ok:
+        print(f"Compiled {entry} to {result.output}.")
+    else:
+        print(result.error)
+
+
+def make_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m sass_embedded")
+    commands = parser.add_subparsers(dest="command", required=True)
+    watch_parser = commands.add_parser(
+        "watch", help="Compile directory and recompile changed sources."
+    )
+    watch_parser.add_argument("source", type=Path, help="Source directory.")
+    watch_parser.add_argument("dest", type=Path, help="Output directory.")
+    watch_parser.add_argument(
+        "-I", "--load-path", type=Path, action="append", default=[], dest="load_paths"
+    )
+    watch_parser.add_argument(
+        "-s", "--style", choices=["expanded", "compressed"], default="expanded"
+    )
+    watch_parser.add_argument("--no-source-map", action="store_true")
+    watch_parser.add_argument("--embed-source-map", action="store_true")
+    watch_parser.add_argument("--embed-sources", action="store_true")
+    watch_parser.add_argument(
+        "--source-map-urls", choices=["relative", "absolute"], default="relative"
+    )
+    watch_parser.add_argument(
+        "--interval", type=float, default=0.5, help="Seconds between polling."
+    )
+    watch_parser.add_argument(
+        "--debounce",
+        type=float,
+        default=0.1,
+        help="Seconds to wait until burst of changes finishes.",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None):
+    args = make_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    if args.command == "watch":
+        watch(
+            args.source,
+            args.dest,
+            load_paths=args.load_paths,
+            style=args.style,
+            no_sourcemap=args.no_source_map,
+            embed_sourcemap=args.embed_source_map,
+            embed_sources=args.embed_sources,
+            source_urls=args.source_map_urls,
+            interval=args.interval,
+            debounce=args.debounce,
+            on_compiled=_report,
+        )
+
+
+if __name__ == "__main__":
+    main()
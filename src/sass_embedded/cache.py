@@ -0,0 +1,390 @@
+"""Cache of compile results.
+
+This module provides two caches.
+
+* :py:class:`CompileCache` is content-addressed cache for :py:func:`sass_embedded.simple.compile_string`.
+  Key of cache is hash of source text, syntax, compile options and version of bundled Dart Sass.
+* :py:class:`BuildManifest` is record of outputs for :py:func:`sass_embedded.simple.compile_file`.
+  It knows all dependencies of each output to skip compiling when nothing is changed.
+
+.. note::
+
+   For :py:class:`CompileCache`, contents of modules in load paths are not part of key.
+   When modules are changed, you must clear cache manually.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+from .dart_sass import resolve_executable
+
+if TYPE_CHECKING:
+    from .protocol.logs import LogEvent
+    from .simple import CompileOptions, Result, Syntax
+
+logger = logging.getLogger(__name__)
+
+
+def _copy(result: Result) -> Result:
+    """Copy result not to share mutable members between cache and callers."""
+    return dataclasses.replace(
+        result,
+        loaded_urls=list(result.loaded_urls),
+        log_events=list(result.log_events),
+        timings=None,
+    )
+
+
+def _load_event(data: dict) -> LogEvent:
+    """Restore log event from JSON object of :py:func:`dataclasses.asdict`."""
+    from .protocol.logs import LogEvent, SourceLocation, SourceSpan
+
+    span = data.get("span")
+    if span:
+        end = span.get("end")
+        span = SourceSpan(
+            **{
+                **span,
+                "start": SourceLocation(**span["start"]),
+                "end": SourceLocation(**end) if end else None,
+            }
+        )
+    return LogEvent(**{**data, "span": span})
+
+
+def _digest(payload: dict, body: bytes = b"") -> str:
+    digest = hashlib.sha256()
+    digest.update(json.dumps(payload, sort_keys=True, default=str).encode())
+    digest.update(b"\0")
+    digest.update(body)
+    return digest.hexdigest()
+
+
+def make_key(source: str, syntax: Syntax, options: CompileOptions) -> str:
+    """Create cache key from compile inputs.
+
+    Version of resolved executable is part of key,
+    because other executable can make other output.
+
+    :param source: Source text.
+    :param syntax: Source format.
+    :param options: Compile options.
+    :returns: Hex digest of SHA-256.
+    """
+    payload = {
+        "dart_sass": resolve_executable().version,
+        "syntax": syntax,
+        "options": dataclasses.asdict(options),
+    }
+    return _digest(payload, source.encode())
+
+
+def make_file_key(source: Path, options: CompileOptions) -> str:
+    """Create key of build from source path and options.
+
+    Contents of files are not part of key, because manifest tracks them.
+
+    :param source: Source path.
+    :param options: Compile options.
+    :returns: Hex digest of SHA-256.
+    """
+    payload = {
+        "dart_sass": resolve_executable().version,
+        "source": str(Path(source).resolve()),
+        "options": dataclasses.asdict(options),
+    }
+    return _digest(payload)
+
+
+class CompileCache:
+    """Cache of compile results with in-memory LRU and optional on-disk tier.
+
+    Only successful results are stored.
+    """
+
+    VERSION = 2
+    """Format version of files in on-disk tier. Files of other versions are ignored."""
+
+    max_entries: int
+    """Max number of results in memory."""
+    directory: Path | None
+    """Directory for on-disk tier. If it is ``None``, this uses only memory."""
+    max_disk_size: int
+    """Max total bytes of files in on-disk tier."""
+    hits: int
+    """Number of found results."""
+    misses: int
+    """Number of not found results."""
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        directory: Path | None = None,
+        max_disk_size: int = 64 * 1024 * 1024,
+    ):
+        self.max_entries = max_entries
+        self.directory = Path(directory) if directory else None
+        self.max_disk_size = max_disk_size
+        self.hits = 0
+        self.misses = 0
+        self._memory: OrderedDict[str, Result] = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_size: int | None = None
+
+    def get(self, key: str) -> Result | None:
+        """Retrieve cached result.
+
+        :param key: Cache key.
+        :returns: Result if it is cached.
+        """
+        with self._lock:
+            result = self._memory.get(key)
+            if result is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return _copy(result)
+        result = self._read_disk(key)
+        with self._lock:
+            if result is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._store_memory(key, result)
+        return _copy(result)
+
+    def set(self, key: str, result: Result):
+        """Store result.
+
+        :param key: Cache key.
+        :param result: Compile result. It is skipped when it is not successful.
+        """
+        if not result.ok:
+            return
+        with self._lock:
+            self._store_memory(key, _copy(result))
+        self._write_disk(key, result)
+
+    def clear(self):
+        """Remove all cached results."""
+        with self._lock:
+            self._memory.clear()
+            self._disk_size = None
+        if self.directory:
+            for path in self.directory.glob("*/*.json"):
+                path.unlink(missing_ok=True)
+
+    def _store_memory(self, key: str, result: Result):
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _path(self, key: str) -> Path:
+        assert self.directory
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _read_disk(self, key: str) -> Result | None:
+        if not self.directory:
+            return None
+        from .simple import Result
+
+        path = self._path(key)
+        try:
+            data = json.loads(path.read_text(encoding="utf8"))
+            if data.get("version") != self.VERSION:
+                return None
+            result = Result(
+                True,
+                output=data["output"],
+                source_map=data.get("source_map"),
+                loaded_urls=data["loaded_urls"],
+                log_events=[_load_event(e) for e in data["log_events"]],
+            )
+            # Update mtime to evict least recently used files at first.
+            os.utime(path)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return result
+
+    def _write_disk(self, key: str, result: Result):
+        if not self.directory:
+            return
+        path = self._path(key)
+        text = json.dumps(
+            {
+                "version": self.VERSION,
+                "output": result.output,
+                "source_map": result.source_map,
+                "loaded_urls": result.loaded_urls,
+                "log_events": [dataclasses.asdict(e) for e in result.log_events],
+            }
+        )
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text, encoding="utf8")
+        except OSError as err:
+            logger.warning(f"Failed to write cache file: {err}")
+            return
+        with self._lock:
+            if self._disk_size is None:
+                self._disk_size = sum(
+                    p.stat().st_size for p in self.directory.glob("*/*.json")
+                )
+            else:
+                self._disk_size += path.stat().st_size
+            if self._disk_size > self.max_disk_size:
+                self._evict_disk()
+
+    def _evict_disk(self):
+        """Remove least recently used files until total size is within limit."""
+        assert self.directory
+        files = []
+        for p in self.directory.glob("*/*.json"):
+            stat = p.stat()
+            files.append((stat.st_mtime, stat.st_size, p))
+        files.sort()
+        total = sum(f[1] for f in files)
+        for _, size, path in files:
+            if total <= self.max_disk_size:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+        self._disk_size = total
+
+
+def _file_hash(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+class BuildManifest:
+    """Persistent record of compiled outputs and their dependencies.
+
+    This records all loaded files of each output with mtime, size and content hash.
+    Output is fresh when none of these files is changed.
+    When mtime is changed but content is same (e.g. ``touch``), it is still fresh.
+
+    Dependencies that are not local files (loaded by custom importers) are not tracked.
+    """
+
+    VERSION = 1
+
+    path: Path
+    """Path of manifest file."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._outputs: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        try:
+            data = json.loads(self.path.read_text(encoding="utf8"))
+            if data.get("version") == self.VERSION:
+                self._outputs = data["outputs"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def save(self):
+        """Write manifest into file."""
+        with self._lock:
+            text = json.dumps({"version": self.VERSION, "outputs": self._outputs})
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.tmp")
+        tmp.write_text(text, encoding="utf8")
+        os.replace(tmp, self.path)
+
+    def is_fresh(self, dest: Path, key: str) -> bool:
+        """Check whether output is built by same key and no dependencies are changed.
+
+        :param dest: Path of output.
+        :param key: Key of build. See :py:func:`make_file_key`.
+        """
+        with self._lock:
+            entry = self._outputs.get(str(Path(dest).resolve()))
+        if not entry or entry["key"] != key:
+            return False
+        if not all(Path(p).exists() for p in entry["outputs"]):
+            return False
+        touched: dict[str, int] = {}
+        for name, record in entry["files"].items():
+            path = Path(name)
+            try:
+                stat = path.stat()
+                if (
+                    stat.st_mtime_ns == record["mtime"]
+                    and stat.st_size == record["size"]
+                ):
+                    continue
+                if stat.st_size != record["size"] or _file_hash(path) != record["hash"]:
+                    return False
+            except OSError:
+                return False
+            touched[name] = stat.st_mtime_ns
+        if touched:
+            # Keep new mtime not to hash same files again on next builds.
+            with self._lock:
+                files = entry["files"]
+                for name, mtime in touched.items():
+                    if name in files:
+                        files[name] = {**files[name], "mtime": mtime}
+            self.save()
+        return True
+
+    def record(
+        self,
+        dest: Path,
+        key: str,
+        loaded_urls: list[str],
+        started: int | None = None,
+    ) -> bool:
+        """Store output with its dependencies.
+
+        When any dependency is changed or removed while compiling,
+        output may be built from old contents, so it is not recorded
+        and previous record of it is removed.
+
+        :param dest: Path of output.
+        :param key: Key of build. See :py:func:`make_file_key`.
+        :param loaded_urls: URLs of all loaded stylesheets.
+        :param started: Time before compiling by :py:func:`time.time_ns`.
+            Dependencies that are modified after it are treated as changed.
+        :returns: Whether output is recorded.
+        """
+        dest = Path(dest).resolve()
+        outputs = [str(dest)]
+        map_path = dest.parent / f"{dest.name}.map"
+        if map_path.exists():
+            outputs.append(str(map_path))
+        files = {}
+        for url in loaded_urls:
+            if not url.startswith("file:"):
+                continue
+            path = Path(url2pathname(urlparse(url).path))
+            try:
+                stat = path.stat()
+                digest = _file_hash(path)
+                changed = path.stat().st_mtime_ns != stat.st_mtime_ns
+            except OSError:
+                changed = True
+            if changed or (started is not None and stat.st_mtime_ns >= started):
+                logger.debug(f"'{path}' is changed while compiling '{dest}'.")
+                with self._lock:
+                    self._outputs.pop(str(dest), None)
+                return False
+            files[str(path)] = {
+                "mtime": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "hash": digest,
+            }
+        with self._lock:
+            self._outputs[str(dest)] = {"key": key, "outputs": outputs, "files": files}
+        return True
@@ -5,18 +5,35 @@ This module works to
 
 from __future__ import annotations
 
+import json
 import logging
+import os
 import platform
+import shutil
+import subprocess
+import threading
+import time
 from dataclasses import dataclass
+from functools import cached_property
 from pathlib import Path
-from typing import Literal
-
-from packaging.tags import sys_tags
+from typing import TYPE_CHECKING, Literal
 
 from .._const import DART_SASS_VERSION
 
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from packaging.tags import Tag
+
 OSName = Literal["android", "linux", "macos", "windows"]
 ArchName = Literal["arm", "arm64", "ia32", "riscv64", "x64"]
+LaunchMode = Literal["snapshot", "native"]
+
+EXECUTABLE_ENV = "SASS_EMBEDDED_EXECUTABLE"
+"""Environment variable for path of native executable or snapshot of Dart Sass."""
+LAUNCH_ENV = "SASS_EMBEDDED_LAUNCH"
+"""Environment variable to select launch mode (``auto``, ``snapshot`` or ``native``)."""
+SNAPSHOT_SUFFIXES = (".snapshot", ".aot")
 
 logger = logging.getLogger(__name__)
 here = Path(__file__).parent
@@ -46,6 +63,13 @@ def resolve_arch() -> ArchName:
     return arch_name  # type: ignore[return-value]
 
 
+def sys_tags() -> Iterator[Tag]:
+    """Wrapper of ``packaging.tags.sys_tags`` to import ``packaging`` only when it is used."""
+    from packaging import tags
+
+    return tags.sys_tags()
+
+
 def resolve_musl() -> bool:
     """Detect whether current Python runtime is musl-based."""
     if platform.system() != "Linux":
@@ -124,17 +148,50 @@ class Executable:
     """Installed directory."""
     release: Release
     """Release information of installed components."""
+    mode: LaunchMode = "snapshot"
+    """How to launch Dart Sass.
 
-    @property
+    ``snapshot`` runs snapshot on Dart runtime of release,
+    and ``native`` runs single executable (for example ``sass`` on ``PATH``).
+    """
+    path: Path | None = None
+    """Path of native executable, or path of snapshot to use instead of bundled one
+    (for example AOT-compiled snapshot)."""
+
+    # Paths are resolved at first access, because they are used for every spawning.
+
+    @cached_property
+    def command(self) -> list[str]:
+        """Command to launch Dart Sass. Arguments are appended to it."""
+        if self.mode == "native":
+            if not self.path:
+                raise ValueError("Native executable needs path.")
+            return [str(self.path)]
+        return [str(self.dart_vm_path), str(self.sass_snapshot_path)]
+
+    @cached_property
+    def version(self) -> str:
+        """Version of Dart Sass.
+
+        It is version of release for bundled one, and it is asked to executable for others.
+        """
+        if self.mode == "snapshot" and self.path is None:
+            return self.release.version
+        data = _embedded_version(self, 10)
+        return data["compilerVersion"] if data else self.release.version
+
+    @cached_property
     def dart_vm_path(self) -> Path:
         """Full path of Dart runtime."""
         dir_ = self.release.resolve_dir(self.base_dir)
         ext_ = ".exe" if self.release.os == "windows" else ""
         return (dir_ / "dart-sass" / "src" / f"dart{ext_}").resolve()
 
-    @property
+    @cached_property
     def sass_snapshot_path(self) -> Path:
         """Full path of compiled module."""
+        if self.mode == "snapshot" and self.path:
+            return self.path.resolve()
         dir_ = self.release.resolve_dir(self.base_dir)
         return (dir_ / "dart-sass" / "src" / "sass.snapshot").resolve()
 
@@ -142,3 +199,158 @@ class Executable:
 def resolve_bin_base_dir() -> Path:
     """Retrieve base directory to install Dart Sass binaries."""
     return here / "_vendor"
+
+
+def _embedded_version(executable: Executable, timeout: float) -> dict | None:
+    """Run ``--embedded --version`` and retrieve parsed response."""
+    try:
+        proc = subprocess.run(
+            executable.command + ["--embedded", "--version"],
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+        )
+    except (OSError, subprocess.SubprocessError) as err:
+        logger.debug(f"Failed to run {executable.command}: {err}")
+        return None
+    # Dart Sass on JavaScript and old releases do not support embedded mode.
+    try:
+        data = json.loads(proc.stdout) if proc.returncode == 0 else None
+    except ValueError:
+        data = None
+    if not isinstance(data, dict) or "compilerVersion" not in data:
+        logger.debug(f"{executable.command} is not embedded Dart Sass: {proc.stdout}")
+        return None
+    return data
+
+
+def probe(
+    executable: Executable, timeout: float = 10, version: str | None = None
+) -> float | None:
+    """Check that executable works as embedded compiler, and measure time to start it.
+
+    Version of executable is set into :py:attr:`Executable.version`.
+
+    :param executable: Executable to check.
+    :param timeout: Seconds to wait for executable.
+    :param version: Required version of Dart Sass. ``None`` accepts any version.
+    :returns: Seconds to run ``--embedded --version``. ``None`` when it does not work.
+    """
+    start = time.perf_counter()
+    data = _embedded_version(executable, timeout)
+    elapsed = time.perf_counter() - start
+    if data is None:
+        return None
+    executable.version = data["compilerVersion"]
+    if version and executable.version != version:
+        logger.debug(
+            f"{executable.command} is Dart Sass {executable.version}, not {version}."
+        )
+        return None
+    return elapsed
+
+
+def find_executables(release: Release | None = None) -> list[Executable]:
+    """Find candidates of executable by priority.
+
+    1. Path of environment variable ``SASS_EMBEDDED_EXECUTABLE``.
+    2. Installed release in package.
+    3. ``sass`` on ``PATH``.
+    """
+    release = release or Release.init()
+    base_dir = resolve_bin_base_dir()
+    candidates = []
+    configured = os.environ.get(EXECUTABLE_ENV)
+    if configured:
+        path = Path(configured)
+        mode: LaunchMode = "snapshot" if path.suffix in SNAPSHOT_SUFFIXES else "native"
+        candidates.append(Executable(base_dir, release, mode=mode, path=path))
+    bundled = release.get_executable(base_dir)
+    if bundled.dart_vm_path.exists():
+        candidates.append(bundled)
+    found = shutil.which("sass")
+    if found:
+        candidates.append(
+            Executable(base_dir, release, mode="native", path=Path(found))
+        )
+    return candidates
+
+
+def select_executable(release: Release | None = None) -> Executable:
+    """Select executable to launch Dart Sass.
+
+    Launch mode can be fixed by environment variable ``SASS_EMBEDDED_LAUNCH``.
+    When it is ``auto``, this probes all candidates and selects fastest one to start
+    from ones that are same version as release.
+    Otherwise this selects first candidate that works.
+    Path of environment variable ``SASS_EMBEDDED_EXECUTABLE`` accepts any version,
+    but others must be same version as release.
+    Installed release is trusted without probing to keep startup fast.
+
+    :param release: Release for current environment.
+    """
+    release = release or Release.init()
+    launch = os.environ.get(LAUNCH_ENV, "")
+    candidates = find_executables(release)
+    if launch in ("snapshot", "native"):
+        candidates = [c for c in candidates if c.mode == launch]
+    bundled = release.get_executable()
+    if launch == "auto":
+        timings = [
+            (probe(c, version=release.version), i) for i, c in enumerate(candidates)
+        ]
+        works = sorted((t, i) for t, i in timings if t is not None)
+        if works:
+            selected = candidates[works[0][1]]
+            logger.debug(f"Select {selected.command} ({works[0][0]:.3f} sec).")
+            return selected
+    else:
+        configured = os.environ.get(EXECUTABLE_ENV)
+        for candidate in candidates:
+            if candidate == bundled:
+                return candidate
+            is_configured = configured and candidate.path == Path(configured)
+            required = None if is_configured else release.version
+            if probe(candidate, version=required) is not None:
+                return candidate
+    logger.warning("Executable of Dart Sass is not found. Use bundled one.")
+    return bundled
+
+
+_executable: Executable | None = None
+_executable_lock = threading.Lock()
+
+
+def resolve_executable() -> Executable:
+    """Retrieve executable for current environment.
+
+    Executable is selected by :py:func:`select_executable`.
+    Result is cached in process, because resolving platform is not cheap.
+    Use :py:func:`set_executable` to override it
+    and :py:func:`invalidate_executable` to resolve again.
+    """
+    global _executable
+    executable = _executable
+    if executable is None:
+        with _executable_lock:
+            if _executable is None:
+                _executable = select_executable()
+            executable = _executable
+    return executable
+
+
+def set_executable(executable: Executable):
+    """Override executable that is returned by :py:func:`resolve_executable`.
+
+    :param executable: Executable to use for all compiles.
+    """
+    global _executable
+    with _executable_lock:
+        _executable = executable
+
+
+def invalidate_executable():
+    """Drop cached executable. Next :py:func:`resolve_executable` resolves it again."""
+    global _executable
+    with _executable_lock:
+        _executable = None
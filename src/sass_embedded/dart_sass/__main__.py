@@ -1,7 +1,7 @@
 import argparse
 import logging
 
-from . import installer
+from . import find_executables, installer, probe
 
 logger = logging.getLogger(__name__)
 parser = argparse.ArgumentParser()
@@ -9,12 +9,28 @@ parser.add_argument("--clean", action="store_true", default=False)
 parser.add_argument("--os", default=None, type=str)
 parser.add_argument("--arch", default=None, type=str)
 parser.add_argument("--musl", action=argparse.BooleanOptionalAction, default=None)
+parser.add_argument(
+    "--probe",
+    action="store_true",
+    default=False,
+    help="Show candidates of executable and time to start them, without installing.",
+)
 
 logging.basicConfig(level=logging.DEBUG)
 
 logger.debug("START: Install dart-sass by CLI")
 
 args = parser.parse_args()
+if args.probe:
+    for executable in find_executables():
+        elapsed = probe(executable)
+        result = (
+            "not working"
+            if elapsed is None
+            else f"{executable.version}, {elapsed * 1000:.1f} ms"
+        )
+        print(f"{executable.mode:<10} {' '.join(executable.command)}: {result}")
+    raise SystemExit(0)
 if args.clean:
     installer.clean()
 if args.os and args.arch:
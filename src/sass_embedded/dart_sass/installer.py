@@ -12,7 +12,14 @@ import tempfile
 from pathlib import Path
 from urllib.request import urlopen
 
-from . import Release, resolve_arch, resolve_bin_base_dir, resolve_musl, resolve_os
+from . import (
+    Release,
+    invalidate_executable,
+    resolve_arch,
+    resolve_bin_base_dir,
+    resolve_musl,
+    resolve_os,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +28,7 @@ def clean():
     """Clean up all executables."""
     logger.info("Clean up executables.")
     shutil.rmtree(resolve_bin_base_dir(), ignore_errors=True)
+    invalidate_executable()
 
 
 def install(
@@ -56,3 +64,4 @@ def install(
     archive_path = Path(tempfile.mktemp())
     archive_path.write_bytes(resp.read())
     shutil.unpack_archive(archive_path, release_dir, release.archive_format)
+    invalidate_executable()
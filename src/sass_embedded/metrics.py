@@ -0,0 +1,184 @@
+"""Timings and metrics of compiles.
+
+Each result of :py:mod:`sass_embedded.simple` has :py:class:`CompileTimings`
+that tells where time goes.
+When hook is registered by :py:func:`set_hook`, counters and histograms
+are also passed to it, so that they can be exported into monitoring systems
+(for example Prometheus).
+
+Metrics by :py:mod:`sass_embedded.simple` (per compile):
+
+* ``sass_compiles_total`` (counter, labels: ``mode``, ``status``)
+* ``sass_compile_seconds`` (histogram, labels: ``mode``)
+* ``sass_compile_output_bytes`` (histogram, labels: ``mode``)
+* ``sass_compile_cache_hits_total`` and ``sass_compile_cache_misses_total`` (counter)
+
+Metrics by :py:class:`sass_embedded.protocol.compiler.Host` (per request):
+
+* ``sass_host_spawn_seconds`` (histogram)
+* ``sass_host_requests_total`` (counter, labels: ``status``)
+* ``sass_host_request_seconds`` (histogram, labels: ``phase``)
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Literal
+
+if TYPE_CHECKING:
+    Labels = dict[str, str]
+
+CompileMode = Literal["cli", "embedded", "cache"]
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CompileTimings:
+    """Timings and sizes of one compile. Times are in seconds."""
+
+    mode: CompileMode
+    """How result is made."""
+    total: float = 0.0
+    """Time of whole compile including writing outputs."""
+    spawn: float | None = None
+    """Time to start process. It is set only for first compile of spawned host."""
+    serialize: float | None = None
+    """Time to build and serialize request. It is set only by embedded mode."""
+    compile: float | None = None
+    """Time from sending request to receiving response.
+    It is mostly compiling by Dart Sass (and starting process for CLI mode).
+    """
+    parse: float | None = None
+    """Time to read and parse packets of response. It is set only by embedded mode."""
+    output_bytes: int = 0
+    """Size of CSS in UTF-8."""
+    cache_hit: bool = False
+    """Whether result is retrieved from cache."""
+
+
+class MetricsHook:
+    """Base class of receivers of metrics.
+
+    Subclass overrides methods to pass values into metrics library.
+    Methods are called on any threads (including reader thread of host),
+    so they must be thread-safe and fast.
+    """
+
+    def increment(self, name: str, value: float = 1, labels: Labels | None = None):
+        """Add value to counter.
+
+        :param name: Name of counter.
+        :param value: Amount to add.
+        :param labels: Labels of counter.
+        """
+
+    def observe(self, name: str, value: float, labels: Labels | None = None):
+        """Record value into histogram.
+
+        :param name: Name of histogram.
+        :param value: Observed value.
+        :param labels: Labels of histogram.
+        """
+
+
+class InMemoryMetrics(MetricsHook):
+    """Hook that keeps all values in memory. It is useful for tests and debugging."""
+
+    counters: dict[tuple[str, tuple], float]
+    histograms: dict[tuple[str, tuple], list[float]]
+
+    def __init__(self):
+        self.counters = {}
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(name: str, labels: Labels | None) -> tuple[str, tuple]:
+        return name, tuple(sorted((labels or {}).items()))
+
+    def increment(self, name: str, value: float = 1, labels: Labels | None = None):
+        key = self._key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, labels: Labels | None = None):
+        key = self._key(name, labels)
+        with self._lock:
+            self.histograms.setdefault(key, []).append(value)
+
+    def counter(self, name: str, **labels: str) -> float:
+        """Retrieve value of counter."""
+        return self.counters.get(self._key(name, labels), 0)
+
+    def values(self, name: str, **labels: str) -> list[float]:
+        """Retrieve observed values of histogram."""
+        return list(self.histograms.get(self._key(name, labels), []))
+
+
+_hook: MetricsHook | None = None
+
+
+def set_hook(hook: MetricsHook | None):
+    """Register hook to receive metrics. ``None`` removes it."""
+    global _hook
+    _hook = hook
+
+
+def get_hook() -> MetricsHook | None:
+    """Retrieve registered hook."""
+    return _hook
+
+
+def _emit(method: str, *args):
+    hook = _hook
+    if hook is None:
+        return
+    try:
+        getattr(hook, method)(*args)
+    except Exception as err:
+        logger.warning(f"Metrics hook raised error: {err}")
+
+
+def record_compile(timings: CompileTimings, ok: bool):
+    """Pass metrics of compile by :py:mod:`sass_embedded.simple` to hook."""
+    if _hook is None:
+        return
+    labels = {"mode": timings.mode}
+    _emit(
+        "increment",
+        "sass_compiles_total",
+        1,
+        {**labels, "status": "ok" if ok else "error"},
+    )
+    _emit("observe", "sass_compile_seconds", timings.total, labels)
+    if ok:
+        _emit("observe", "sass_compile_output_bytes", timings.output_bytes, labels)
+
+
+def record_cache(hit: bool):
+    """Pass result of cache lookup to hook."""
+    name = "sass_compile_cache_hits_total" if hit else "sass_compile_cache_misses_total"
+    _emit("increment", name, 1, None)
+
+
+def record_spawn(seconds: float):
+    """Pass time to start host process to hook."""
+    _emit("observe", "sass_host_spawn_seconds", seconds, None)
+
+
+def record_request(timings: CompileTimings, status: str):
+    """Pass metrics of request by host to hook.
+
+    :param timings: Timings of request that are measured by host.
+    :param status: ``success``, ``failure`` (compile error) or ``error``.
+    """
+    if _hook is None:
+        return
+    _emit("increment", "sass_host_requests_total", 1, {"status": status})
+    for phase in ("serialize", "compile", "parse"):
+        value = getattr(timings, phase)
+        if value is not None:
+            _emit("observe", "sass_host_request_seconds", value, {"phase": phase})
@@ -0,0 +1,42 @@
+"""Codec of unsigned varint for packet headers.
+
+:ref: https://protobuf.dev/programming-guides/encoding/#varints
+"""
+
+from __future__ import annotations
+
+
+def encode_varint(value: int) -> bytes:
+    """Encode unsigned integer into varint bytes."""
+    if value < 0:
+        raise ValueError("Varint of packet header must not be negative.")
+    if value < 0x80:
+        return bytes((value,))
+    data = bytearray()
+    while value >= 0x80:
+        data.append((value & 0x7F) | 0x80)
+        value >>= 7
+    data.append(value)
+    return bytes(data)
+
+
+def decode_varint(
+    data: bytes | bytearray | memoryview, pos: int = 0
+) -> tuple[int, int]:
+    """Decode varint from bytes.
+
+    :param data: Bytes that have varint.
+    :param pos: Start position of varint.
+    :returns: Decoded value and position of next byte.
+    """
+    value = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise ValueError("Varint is truncated.")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, pos
+        shift += 7
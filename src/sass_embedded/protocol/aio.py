@@ -0,0 +1,322 @@
+"""Process manager of Dart Sass Compiler for asyncio."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import subprocess
+from collections import deque
+from typing import TYPE_CHECKING
+
+from ..dart_sass import resolve_executable
+from ._varint import decode_varint
+from .compiler import (
+    READ_BUFFER_SIZE,
+    STDERR_LINES,
+    HostError,
+    HostTimeoutError,
+    Packet,
+    ProtocolError,
+    _Compilation,
+    _Pending,
+    _keep_line,
+    _Router,
+    embedded_command,
+    make_compile_request,
+)
+from .embedded_sass_pb2 import OutboundMessage
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Sequence
+    from pathlib import Path
+
+    from ..dart_sass import Executable
+    from .embedded_sass_pb2 import InboundMessage
+    from .functions import Functions
+    from .importers import FileImporter, Importer
+    from .logs import LogCallback
+
+logger = logging.getLogger(__name__)
+
+
+async def _read_varint(reader: asyncio.StreamReader) -> int:
+    value = 0
+    shift = 0
+    while True:
+        byte = (await reader.readexactly(1))[0]
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value
+        shift += 7
+
+
+async def _receive(reader: asyncio.StreamReader) -> tuple[int, OutboundMessage]:
+    """Receive one packet from stream."""
+    length = await _read_varint(reader)
+    data = await reader.readexactly(length)
+    cid, idx = decode_varint(data, 0)
+    msg = OutboundMessage()
+    msg.ParseFromString(memoryview(data)[idx:])
+    return cid, msg
+
+
+async def _drain(reader: asyncio.StreamReader, lines: deque[str]):
+    """Read all lines from stderr of host process into ring buffer and logging.
+
+    Stream is read by chunks, because ``readline`` fails by line over limit of reader.
+    """
+    rest = b""
+    while chunk := await reader.read(READ_BUFFER_SIZE):
+        *complete, rest = (rest + chunk).split(b"\n")
+        for raw in complete:
+            _keep_line(raw, lines)
+    if rest:
+        _keep_line(rest, lines)
+
+
+class AsyncHost(_Router):
+    """Host process of compiler for asyncio.
+
+    Received packets are routed to requests by compilation ID on reader task.
+    Therefore multiple tasks can await compiles concurrently.
+    """
+
+    executable: Executable
+    _proc: asyncio.subprocess.Process | None
+    _reader: asyncio.Task | None
+    _stderr: deque[str]
+    _stderr_reader: asyncio.Task | None
+    timeout: float | None
+    """Default seconds to wait for each response. ``None`` waits forever."""
+
+    def __init__(self, timeout: float | None = None):
+        """
+        :param timeout: Default seconds to wait for each response.
+        """
+        super().__init__()
+        self.executable = resolve_executable()
+        self.timeout = timeout
+        self._proc = None
+        self._reader = None
+        self._stderr = deque(maxlen=STDERR_LINES)
+        self._stderr_reader = None
+
+    async def __aenter__(self) -> AsyncHost:
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    @property
+    def is_alive(self) -> bool:
+        """Whether host process is running."""
+        return self._proc is not None and self._proc.returncode is None
+
+    @property
+    def stderr(self) -> str:
+        """Last lines of stderr of current (or last) host process."""
+        return "\n".join(self._stderr)
+
+    async def connect(self):
+        """Open and connect Sass process."""
+        if self._proc:
+            return
+        self._proc = await asyncio.create_subprocess_exec(
+            *embedded_command(self.executable),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        self._error = None
+        self._reader = asyncio.create_task(self._dispatch(self._proc.stdout))  # type: ignore[arg-type]
+        self._stderr = deque(maxlen=STDERR_LINES)
+        self._stderr_reader = asyncio.create_task(
+            _drain(self._proc.stderr, self._stderr)  # type: ignore[arg-type]
+        )
+
+    async def close(self, timeout: float | None = 5):
+        """Stop host process.
+
+        :param timeout: Seconds to wait for exit. Process is killed after it.
+        """
+        if not self._proc:
+            return
+        proc = self._proc
+        # Dart Sass finishes when stdin is closed.
+        try:
+            proc.stdin.close()  # type: ignore[union-attr]
+            await asyncio.wait_for(proc.wait(), timeout)
+        except (OSError, asyncio.TimeoutError):
+            logger.warning("Dart Sass process does not exit. Kill it.")
+            proc.kill()
+            await proc.wait()
+        if self._reader:
+            await self._reader
+        if self._stderr_reader:
+            try:
+                await self._stderr_reader
+            except Exception as err:
+                logger.warning(f"Failed to read stderr of Dart Sass: {err}")
+        self._proc = None
+        self._reader = None
+        self._stderr_reader = None
+
+    def _send(self, packet: Packet):
+        if not self._proc:
+            raise HostError("Dart Sass process is not started.")
+        self._proc.stdin.write(packet.to_bytes())  # type: ignore[union-attr]
+
+    async def _dispatch(self, reader: asyncio.StreamReader):
+        """Read all packets from stream and route them by compilation ID."""
+        try:
+            while True:
+                try:
+                    cid, msg = await _receive(reader)
+                except asyncio.IncompleteReadError:
+                    raise HostError("Dart Sass process is terminated.")
+                self._route(cid, msg)
+        except Exception as err:
+            if isinstance(err, HostError):
+                if self._stderr_reader and not isinstance(err, ProtocolError):
+                    # Wait for last output of terminated process.
+                    await asyncio.wait({self._stderr_reader}, timeout=1)
+                err.stderr = self.stderr
+            self._reject_all(err)
+
+    def _call(self, pending: _Compilation, handler: Callable[[], InboundMessage]):
+        """Run callback for request of compiler on executor, and send its reply on loop.
+
+        Reader task continues to route packets of other compilations meanwhile.
+        """
+
+        def reply(future: asyncio.Future):
+            if future.cancelled():
+                return
+            err = future.exception()
+            if err:
+                self._reject(pending, err)
+                return
+            try:
+                pending._reply(self, future.result())
+            except (HostError, OSError) as err:
+                logger.debug(f"Failed to reply for compilation: {err}")
+
+        loop = asyncio.get_running_loop()
+        loop.run_in_executor(None, handler).add_done_callback(reply)
+
+    async def _submit(
+        self, message: InboundMessage, pending: _Pending, timeout: float | None
+    ):
+        if not self._proc:
+            raise HostError("Dart Sass process is not started.")
+        packet = self._register(message, pending)
+        try:
+            self._send(packet)
+            await self._proc.stdin.drain()  # type: ignore[union-attr]
+        except OSError as err:
+            self._take(pending)
+            raise HostError(f"Failed to send request: {err}") from err
+        except Exception:
+            self._take(pending)
+            raise
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            return await asyncio.wait_for(asyncio.shield(pending.future), timeout)
+        except asyncio.TimeoutError:
+            # Messages for this request are skipped after this.
+            self._take(pending)
+            raise HostTimeoutError(
+                f"Response is not received in {timeout} seconds."
+            ) from None
+
+    async def send_message(
+        self, message: InboundMessage, timeout: float | None = None
+    ) -> OutboundMessage:
+        """Send protobuf message for host process.
+
+        :param message: Sending message.
+        :param timeout: Seconds to wait for response. Default is :py:attr:`timeout`.
+        :returns: Parsed protbuf message.
+        """
+        loop = asyncio.get_running_loop()
+        return await self._submit(message, _Pending(loop.create_future()), timeout)
+
+    async def compile(
+        self,
+        message: InboundMessage,
+        importers: Sequence[Importer | FileImporter] = (),
+        functions: Functions | None = None,
+        on_log: LogCallback | None = None,
+        timeout: float | None = None,
+    ) -> OutboundMessage.CompileResponse:
+        """Send compile request and wait for its response.
+
+        :param message: Message that has compile request.
+        :param importers: Custom importers that are passed to create message.
+        :param functions: Custom functions that are passed to create message.
+        :param on_log: Callback for log events. It is called on event loop.
+            When it is not passed, events are emitted into :py:mod:`logging`.
+        :param timeout: Seconds to wait for response. Default is :py:attr:`timeout`.
+        :returns: Compile response of request.
+        :raises HostTimeoutError: When response is not received in time.
+        """
+        loop = asyncio.get_running_loop()
+        pending = _Compilation(loop.create_future(), importers, functions, on_log)
+        return await self._submit(message, pending, timeout)
+
+    async def compile_string(
+        self,
+        source: str,
+        syntax: str = "scss",
+        style: str = "expanded",
+        load_paths: Iterable[Path] = (),
+        source_map: bool = False,
+        source_map_include_sources: bool = False,
+        importers: Sequence[Importer | FileImporter] = (),
+        functions: Functions | None = None,
+        on_log: LogCallback | None = None,
+    ) -> OutboundMessage.CompileResponse:
+        """Compile source text.
+
+        Arguments are same as :py:func:`~sass_embedded.protocol.compiler.make_compile_request`
+        excluded ``on_log``. It is same as :py:meth:`compile`.
+        """
+        message = make_compile_request(
+            source=source,
+            syntax=syntax,
+            style=style,
+            load_paths=load_paths,
+            source_map=source_map,
+            source_map_include_sources=source_map_include_sources,
+            importers=importers,
+            functions=functions,
+        )
+        return await self.compile(message, importers, functions, on_log)
+
+    async def compile_path(
+        self,
+        path: Path,
+        style: str = "expanded",
+        load_paths: Iterable[Path] = (),
+        source_map: bool = False,
+        source_map_include_sources: bool = False,
+        importers: Sequence[Importer | FileImporter] = (),
+        functions: Functions | None = None,
+        on_log: LogCallback | None = None,
+    ) -> OutboundMessage.CompileResponse:
+        """Compile source file.
+
+        Arguments are same as :py:func:`~sass_embedded.protocol.compiler.make_compile_request`
+        excluded ``on_log``. It is same as :py:meth:`compile`.
+        """
+        message = make_compile_request(
+            path=path,
+            style=style,
+            load_paths=load_paths,
+            source_map=source_map,
+            source_map_include_sources=source_map_include_sources,
+            importers=importers,
+            functions=functions,
+        )
+        return await self.compile(message, importers, functions, on_log)
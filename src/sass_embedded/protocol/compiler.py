@@ -2,18 +2,83 @@
 
 from __future__ import annotations
 
+import io
+import logging
+import os
 import subprocess
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
-from blackboxprotobuf.lib.types import varint
-
-from ..dart_sass import Release
-from .embedded_sass_pb2 import OutboundMessage
+from ..dart_sass import resolve_executable
+from ..metrics import CompileTimings, get_hook, record_request, record_spawn
+from ._varint import decode_varint, encode_varint
+from .embedded_sass_pb2 import (
+    COMPRESSED,
+    CSS,
+    EXPANDED,
+    INDENTED,
+    SCSS,
+    InboundMessage,
+    OutboundMessage,
+)
+from .importers import add_importers, handle_request, set_importer
+from .logs import LogEvent, emit
 
 if TYPE_CHECKING:
+    import asyncio
+    from collections.abc import Callable, Iterable, Sequence
+    from typing import IO
+
     from ..dart_sass import Executable
-    from .embedded_sass_pb2 import InboundMessage
+    from .aio import AsyncHost
+    from .functions import Functions
+    from .importers import FileImporter, Importer
+    from .logs import LogCallback
+
+logger = logging.getLogger(__name__)
+
+SYNTAXES = {"scss": SCSS, "sass": INDENTED, "css": CSS}
+"""Mapping from syntax name to protobuf enum value."""
+
+OUTPUT_STYLES = {"expanded": EXPANDED, "compressed": COMPRESSED}
+"""Mapping from output style name to protobuf enum value."""
+
+READ_BUFFER_SIZE = 64 * 1024
+"""Buffer size to read packets from host process."""
+
+STDERR_LINES = 200
+"""Max number of last lines of stderr that host keeps."""
+
+WATCHDOG_INTERVAL = 0.05
+"""Seconds between checks of deadlines of submitted requests."""
+
+
+class HostError(Exception):
+    """Host process is not available (not started, terminated or hung)."""
+
+    stderr: str = ""
+    """Last lines of stderr of host process when error is raised."""
+
+    def __str__(self) -> str:
+        message = super().__str__()
+        if not self.stderr:
+            return message
+        return f"{message}\nstderr of Dart Sass:\n{self.stderr}"
+
+
+class ProtocolError(HostError):
+    """Compiler sent ``ProtocolError`` message."""
+
+
+class HostTimeoutError(HostError, TimeoutError):
+    """Response is not received in time."""
 
 
 @dataclass
@@ -31,87 +96,829 @@ class Packet:
     def to_bytes(self) -> bytes:
         """Convert to bytes stream for Dart Sass."""
         msg = self.message.SerializeToString()
-        id_bytes = varint.encode_varint(self.compilation_id)
+        id_bytes = encode_varint(self.compilation_id)
         length = len(id_bytes + msg)
-        len_bytes = varint.encode_varint(length)
+        len_bytes = encode_varint(length)
         return bytes(len_bytes + id_bytes) + msg
 
 
-class Host:
-    """Host process of compiler."""
+def make_compile_request(
+    source: str | None = None,
+    path: Path | None = None,
+    syntax: str = "scss",
+    style: str = "expanded",
+    load_paths: Iterable[Path] = (),
+    source_map: bool = False,
+    source_map_include_sources: bool = False,
+    importers: Sequence[Importer | FileImporter] = (),
+    url: str | None = None,
+    source_importer: Importer | FileImporter | None = None,
+    functions: Functions | None = None,
+) -> InboundMessage:
+    """Create message to request compiling.
+
+    Either ``source`` or ``path`` must be passed.
+
+    :param source: Source text to compile.
+    :param path: Source path to compile. It is resolved as absolute path.
+    :param syntax: Syntax of source text. It is not used for ``path``.
+    :param style: Output style.
+    :param load_paths: List of additional load path.
+    :param source_map: Flag to generate source-map.
+    :param source_map_include_sources: Flag to embed sources into source-map.
+    :param importers: Custom importers. They are used before ``load_paths``.
+        Same importers must be passed when sending request.
+    :param url: URL of source text. It is not used for ``path``.
+    :param source_importer: Importer to load relative URLs of source text.
+        It must be one of ``importers``. It is not used for ``path``.
+    :param functions: Custom functions.
+        Same functions must be passed when sending request.
+    :returns: Message of compile request.
+    """
+    if (source is None) == (path is None):
+        raise ValueError("Either 'source' or 'path' must be passed.")
+    message = InboundMessage()
+    req = message.compile_request
+    if source is not None:
+        req.string.source = source
+        req.string.syntax = SYNTAXES[syntax]
+        if url:
+            req.string.url = url
+        if source_importer is not None:
+            if source_importer not in importers:
+                raise ValueError("'source_importer' must be one of 'importers'.")
+            idx = list(importers).index(source_importer)
+            set_importer(req.string.importer, idx, source_importer)
+    else:
+        req.path = str(Path(path).resolve())
+    req.style = OUTPUT_STYLES[style]
+    req.source_map = source_map
+    req.source_map_include_sources = source_map_include_sources
+    # Dart Sass CLI emits @charset or BOM by default.
+    req.charset = True
+    add_importers(req, importers)
+    for p in load_paths:
+        req.importers.add().path = str(p)
+    if functions:
+        req.global_functions.extend(functions.signatures)
+    return message
+
+
+def _read_varint(stream: IO[bytes]) -> int:
+    """Read varint from stream byte by byte."""
+    value = 0
+    shift = 0
+    while True:
+        byte = stream.read(1)
+        if not byte:
+            raise HostError("Dart Sass process is terminated.")
+        value |= (byte[0] & 0x7F) << shift
+        if not byte[0] & 0x80:
+            return value
+        shift += 7
+
+
+def _receive(stream: IO[bytes]) -> tuple[int, OutboundMessage]:
+    """Receive one packet from stream.
+
+    This reads length header at first, and reads rest of packet
+    into preallocated buffer to parse it without copying.
+
+    :param stream: Buffered stdout of host process.
+    :returns: Compilation ID and message.
+    """
+    return _read_packet(stream, _read_varint(stream))
+
+
+def _read_packet(stream: IO[bytes], length: int) -> tuple[int, OutboundMessage]:
+    """Read and parse rest of packet after length header."""
+    data = bytearray(length)
+    view = memoryview(data)
+    pos = 0
+    while pos < length:
+        size = stream.readinto(view[pos:])  # type: ignore[attr-defined]
+        if not size:
+            raise HostError("Dart Sass process is terminated.")
+        pos += size
+    cid, idx = decode_varint(data, 0)
+    msg = OutboundMessage()
+    msg.ParseFromString(view[idx:])
+    return cid, msg
+
+
+def _keep_line(raw: bytes, lines: deque[str]):
+    """Keep line of stderr in ring buffer and emit it into logging."""
+    line = raw.decode("utf-8", "replace").rstrip()
+    if line:
+        lines.append(line)
+        logger.warning(f"Dart Sass: {line}")
+
+
+def _drain(stream: IO[bytes], lines: deque[str]):
+    """Read all lines from stderr of host process.
+
+    This runs on background thread of host, so that process is not blocked
+    by filled pipe buffer. Lines are kept in ring buffer and emitted into logging.
+    Stream is buffered not to read it byte by byte.
+    """
+    reader = io.BufferedReader(stream, buffer_size=READ_BUFFER_SIZE)  # type: ignore[arg-type]
+    try:
+        for raw in iter(reader.readline, b""):
+            _keep_line(raw, lines)
+    except (OSError, ValueError):
+        # Stream is closed by host.
+        pass
+
+
+def _dispatch(ref: weakref.ref[Host], stream: IO[bytes]):
+    """Read all packets from stream and route them by compilation ID.
+
+    This runs on background thread of host.
+    It refers host weakly not to keep host alive while waiting packets.
+    """
+    reader = io.BufferedReader(stream, buffer_size=READ_BUFFER_SIZE)  # type: ignore[arg-type]
+    try:
+        while True:
+            # Time to wait for header is not part of reading.
+            length = _read_varint(reader)
+            start = time.perf_counter()
+            cid, msg = _read_packet(reader, length)
+            elapsed = time.perf_counter() - start
+            host = ref()
+            if host is None:
+                return
+            host._route(cid, msg, elapsed)
+            del host
+    except Exception as err:
+        host = ref()
+        if host is not None:
+            host._fail(err)
+
+
+def _watch(ref: weakref.ref[Host]):
+    """Fail submitted requests that are not answered until their deadline.
+
+    This runs on background thread of host while any request has deadline.
+    """
+    while True:
+        host = ref()
+        if host is None or not host._expire():
+            return
+        del host
+        time.sleep(WATCHDOG_INTERVAL)
+
+
+WARM_UP_SOURCE = """\
+@use "sass:color";
+@use "sass:map";
+@use "sass:math";
+
+$colors: (primary: #336699, secondary: #993366);
+
+@function rem($px) {
+  @return math.div($px, 16px) * 1rem;
+}
+
+@mixin theme($name) {
+  color: map.get($colors, $name);
+  background: color.adjust(map.get($colors, $name), $lightness: 40%);
+}
+
+@each $name, $_ in $colors {
+  .btn-#{$name} {
+    @include theme($name);
+    padding: rem(8px) rem(16px);
+    &:hover { opacity: 0.8; }
+  }
+}
+"""
+"""Stylesheet to compile for warm-up. It uses modules, functions, mixins and loops."""
+
+
+def embedded_command(executable: Executable) -> list[str]:
+    """Retrieve command to run Dart Sass as embedded mode."""
+    return executable.command + ["--embedded"]
+
+
+class _Pending:
+    """Request that waits for messages from host process.
+
+    This is resolved by first message of its compilation ID.
+    """
+
+    future: Future | asyncio.Future
+    compilation_id: int
+    timings: CompileTimings | None
+    """Timings to measure. It is measured only by :py:class:`Host`."""
+    sent_at: float
+    timeout: float | None
+    """Seconds to wait for response. It is watched only for submitted requests."""
+    deadline: float | None
+    """Monotonic time when request is failed by timeout."""
+
+    def __init__(
+        self,
+        future: Future | asyncio.Future | None = None,
+        timings: CompileTimings | None = None,
+    ):
+        self.future = future or Future()
+        self.compilation_id = 0
+        self.timings = timings
+        self.sent_at = 0.0
+        self.timeout = None
+        self.deadline = None
+
+    def handle(self, host: Host | AsyncHost, message: OutboundMessage) -> Any:
+        """Handle received message.
+
+        Future is resolved by host, after host finishes bookkeeping of request.
+
+        :returns: Result of request. ``None`` when request is not finished.
+        """
+        return message
+
+
+class _Compilation(_Pending):
+    """Compile request that waits for its response.
+
+    Requests for importers and functions are answered by worker of host,
+    so that slow callback does not block other compilations.
+    Log events are passed to callback as soon as they are received.
+    """
+
+    importers: Sequence[Importer | FileImporter]
+    functions: Functions | None
+    on_log: LogCallback | None
+
+    def __init__(
+        self,
+        future: Future | asyncio.Future | None = None,
+        importers: Sequence[Importer | FileImporter] = (),
+        functions: Functions | None = None,
+        on_log: LogCallback | None = None,
+        timings: CompileTimings | None = None,
+    ):
+        super().__init__(future, timings)
+        self.importers = importers
+        self.functions = functions
+        self.on_log = on_log
+
+    def _log(self, message: OutboundMessage.LogEvent):
+        event = LogEvent.from_message(message)
+        if not self.on_log:
+            emit(event)
+            return
+        try:
+            self.on_log(event)
+        except Exception as err:
+            logger.warning(f"Callback for log event raised error: {err}")
+
+    def _reply(self, host: Host | AsyncHost, message: InboundMessage):
+        host._send(Packet(compilation_id=self.compilation_id, message=message))
+
+    def handle(self, host: Host | AsyncHost, message: OutboundMessage) -> Any:
+        kind = message.WhichOneof("message")
+        if kind == "compile_response":
+            return message.compile_response
+        if kind == "log_event":
+            self._log(message.log_event)
+            return None
+        if kind in ("canonicalize_request", "import_request", "file_import_request"):
+            host._call(self, lambda: handle_request(self.importers, message))
+            return None
+        if kind == "function_call_request":
+            functions = self.functions
+            if not functions:
+                raise Exception("Function is called but no functions are registered.")
+            host._call(self, lambda: functions.handle_request(message))
+            return None
+        raise Exception(f"Unsupported message is received: {kind}")
+
+
+class _Router:
+    """Pending requests of host that are routed by compilation ID.
+
+    This is shared by :py:class:`Host` and :py:class:`~sass_embedded.protocol.aio.AsyncHost`.
+    Request is removed by only one of reader, timeout and failure,
+    and only the one that removes it resolves its future.
+    """
 
-    executable: Executable
-    _proc: subprocess.Popen | None
     _id: int
+    _pending: dict[int, _Pending]
+    _error: Exception | None
+    _lock: threading.Lock
 
     def __init__(self):
-        self.executable = Release.init().get_executable()
-        self._proc = None
         self._id = 1
+        self._pending = {}
+        self._error = None
+        self._lock = threading.Lock()
+
+    def make_packet(self, message: InboundMessage) -> Packet:
+        """Convert from protobuf message to packet structure.
+
+        :param message: Sending message.
+        :returns: Packet component.
+        """
+        cid = 0 if message.WhichOneof("message") == "version_request" else self._id
+        if cid:
+            self._id += 1
+        return Packet(compilation_id=cid, message=message)
+
+    def _register(self, message: InboundMessage, pending: _Pending) -> Packet:
+        """Make packet of message and wait for its messages by pending request."""
+        with self._lock:
+            if self._error:
+                raise self._error
+            packet = self.make_packet(message)
+            if packet.compilation_id in self._pending:
+                raise Exception("Other request of same compilation ID is waiting.")
+            pending.compilation_id = packet.compilation_id
+            self._pending[packet.compilation_id] = pending
+        return packet
+
+    def _take(self, pending: _Pending) -> bool:
+        """Remove pending request.
+
+        :returns: Whether it is removed by this call.
+        """
+        with self._lock:
+            if self._pending.get(pending.compilation_id) is not pending:
+                return False
+            del self._pending[pending.compilation_id]
+        return True
+
+    def _route(self, cid: int, msg: OutboundMessage, elapsed: float = 0.0):
+        """Pass received message to pending request of compilation ID.
+
+        Timings and metrics of request are recorded before its future is resolved,
+        so that waiting caller always sees them.
+
+        :param elapsed: Seconds to read and parse message.
+        """
+        with self._lock:
+            pending = self._pending.get(cid)
+        if pending and pending.timings:
+            pending.timings.parse = (pending.timings.parse or 0.0) + elapsed
+        result = None
+        error: Exception | None = None
+        if msg.WhichOneof("message") == "error":
+            error = ProtocolError(f"Protocol error: {msg.error.message}")
+            if not pending:
+                raise error
+        elif not pending:
+            logger.warning(f"Message for unknown compilation {cid} is skipped.")
+            return
+        else:
+            try:
+                result = pending.handle(self, msg)
+            except Exception as err:
+                error = err
+            if result is None and error is None:
+                return
+        if error:
+            status = "error"
+        elif isinstance(result, OutboundMessage.CompileResponse):
+            status = result.WhichOneof("result") or "error"
+        else:
+            status = "success"
+        if not self._take(pending):
+            # Request is already failed by timeout (or other thread) meanwhile.
+            return
+        self._record(pending, status)
+        if pending.future.done():
+            return
+        if error:
+            pending.future.set_exception(error)
+        else:
+            pending.future.set_result(result)
+
+    @staticmethod
+    def _record(pending: _Pending, status: str):
+        if pending.timings:
+            pending.timings.compile = time.perf_counter() - pending.sent_at
+            record_request(pending.timings, status)
+
+    def _reject(self, pending: _Pending, err: BaseException):
+        """Fail request by error out of reader."""
+        if not self._take(pending):
+            return
+        self._record(pending, "error")
+        if not pending.future.done():
+            pending.future.set_exception(err)
+
+    def _reject_all(self, err: Exception):
+        """Reject all pending requests and following requests."""
+        with self._lock:
+            self._error = err
+            pendings = list(self._pending.values())
+            self._pending.clear()
+        for pending in pendings:
+            if not pending.future.done():
+                pending.future.set_exception(err)
+
+
+class Host(_Router):
+    """Host process of compiler.
+
+    Received packets are routed to requests by compilation ID on background thread.
+    Therefore multiple threads can send compile requests concurrently.
+    """
+
+    executable: Executable
+    _proc: subprocess.Popen | None
+    _reader: threading.Thread | None
+    _stderr: deque[str]
+    _stderr_reader: threading.Thread | None
+    _write_lock: threading.Lock
+    _version_lock: threading.Lock
+    _ready: threading.Event
+    _warm_up_error: Exception | None
+    _workers: ThreadPoolExecutor | None
+    _watchdog: threading.Thread | None
+    timeout: float | None
+    """Default seconds to wait for each response. ``None`` waits forever."""
+    spawn_time: float | None
+    """Seconds to start current process."""
+
+    def __init__(self, timeout: float | None = None):
+        """
+        :param timeout: Default seconds to wait for each response.
+        """
+        super().__init__()
+        self.executable = resolve_executable()
+        self.timeout = timeout
+        self.spawn_time = None
+        self._proc = None
+        self._reader = None
+        self._stderr = deque(maxlen=STDERR_LINES)
+        self._stderr_reader = None
+        self._write_lock = threading.Lock()
+        self._version_lock = threading.Lock()
+        self._ready = threading.Event()
+        self._warm_up_error = None
+        self._workers = None
+        self._watchdog = None
 
     def __del__(self):
         self.close()
 
-    def connect(self):
-        """Open and connect Sass process."""
+    @property
+    def is_started(self) -> bool:
+        """Whether host process is started (it may be terminated after that)."""
+        return self._proc is not None
+
+    @property
+    def is_alive(self) -> bool:
+        """Whether host process is running."""
+        return self._proc is not None and self._proc.poll() is None
+
+    @property
+    def has_failed(self) -> bool:
+        """Whether reader is failed, so that all following requests are rejected."""
+        return self._error is not None
+
+    @property
+    def stderr(self) -> str:
+        """Last lines of stderr of current (or last) host process."""
+        return "\n".join(self._stderr)
+
+    @property
+    def rss(self) -> int | None:
+        """Resident memory of host process in bytes. It is available only on Linux."""
+        if not self._proc:
+            return None
+        try:
+            with open(f"/proc/{self._proc.pid}/statm") as fp:
+                pages = int(fp.read().split()[1])
+        except (OSError, ValueError, IndexError):
+            return None
+        return pages * os.sysconf("SC_PAGE_SIZE")
+
+    @property
+    def is_ready(self) -> bool:
+        """Whether host process is running and warm-up is finished."""
+        return self._ready.is_set() and not self._warm_up_error and self.is_alive
+
+    def connect(self, warm_up: bool = False):
+        """Open and connect Sass process.
+
+        :param warm_up: Flag to warm up process on background thread.
+            Use :py:meth:`wait_ready` to wait until it is finished.
+        """
         if self._proc:
             return
-        command = [
-            self.executable.dart_vm_path,
-            self.executable.sass_snapshot_path,
-            "--embedded",
-        ]
+        start = time.perf_counter()
         self._proc = subprocess.Popen(
-            command,
+            embedded_command(self.executable),
             stdin=subprocess.PIPE,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             text=False,
             bufsize=0,
         )
+        self.spawn_time = time.perf_counter() - start
+        record_spawn(self.spawn_time)
+        self._error = None
+        self._reader = threading.Thread(
+            target=_dispatch,
+            args=(weakref.ref(self), self._proc.stdout),
+            name="sass-embedded-host",
+            daemon=True,
+        )
+        self._reader.start()
+        self._stderr = deque(maxlen=STDERR_LINES)
+        self._stderr_reader = threading.Thread(
+            target=_drain,
+            args=(self._proc.stderr, self._stderr),
+            name="sass-embedded-stderr",
+            daemon=True,
+        )
+        self._stderr_reader.start()
+        # Event is replaced for each process not to be set by previous warm-up.
+        self._ready = threading.Event()
+        self._warm_up_error = None
+        if not warm_up:
+            self._ready.set()
+            return
+        threading.Thread(
+            target=self._warm_up_in_background,
+            args=(self._ready,),
+            name="sass-embedded-warm-up",
+            daemon=True,
+        ).start()
 
-    def close(self):
-        """Stop host process."""
-        if self._proc:
-            self._proc.communicate()
+    def warm_up(self, rounds: int = 3):
+        """Send version request and compile small stylesheet to warm up process.
 
-    def make_packet(self, message: InboundMessage) -> Packet:
-        """Convert from protobuf message to packet structure.
+        Dart VM compiles hot paths while first compiles,
+        so following compiles become faster.
 
-        :param message: Sending message.
-        :returns: Packet component.
+        :param rounds: Number of compiles.
         """
-        cid = 0 if message.WhichOneof("message") == "version_request" else self._id
-        if cid:
-            self._id += 1
-        return Packet(compilation_id=cid, message=message)
+        message = InboundMessage()
+        message.version_request.id = 0
+        self.send_message(message)
+        for _ in range(rounds):
+            response = self.compile(
+                make_compile_request(source=WARM_UP_SOURCE), on_log=lambda e: None
+            )
+            if response.WhichOneof("result") != "success":
+                raise Exception(f"Failed to warm up: {response.failure.message}")
+
+    def _warm_up_in_background(self, ready: threading.Event):
+        try:
+            self.warm_up()
+        except Exception as err:
+            if ready is self._ready:
+                logger.warning(f"Failed to warm up Dart Sass process: {err}")
+                self._warm_up_error = err
+        finally:
+            ready.set()
+
+    def wait_ready(self, timeout: float | None = None) -> bool:
+        """Wait until warm-up is finished.
+
+        :param timeout: Seconds to wait. ``None`` waits forever.
+        :returns: ``False`` when it is timed out.
+        """
+        if not self._proc:
+            raise HostError("Dart Sass process is not started.")
+        if not self._ready.wait(timeout):
+            return False
+        if self._warm_up_error:
+            raise self._warm_up_error
+        return True
+
+    def close(self, timeout: float | None = 5):
+        """Stop host process.
 
-    def send_message(self, message: InboundMessage) -> OutboundMessage:
+        :param timeout: Seconds to wait for exit. Process is killed after it.
+        """
+        if not self._proc:
+            return
+        proc = self._proc
+        self._ready.clear()
+        # Dart Sass finishes when stdin is closed.
+        try:
+            proc.stdin.close()  # type: ignore[union-attr]
+            proc.wait(timeout)
+        except (OSError, subprocess.TimeoutExpired):
+            logger.warning("Dart Sass process does not exit. Kill it.")
+            proc.kill()
+            proc.wait()
+        if self._reader and self._reader is not threading.current_thread():
+            self._reader.join()
+        if self._stderr_reader:
+            self._stderr_reader.join(1)
+        self._proc = None
+        self._reader = None
+        self._stderr_reader = None
+        if self._workers:
+            self._workers.shutdown(wait=False)
+            self._workers = None
+        proc.stdout.close()  # type: ignore[union-attr]
+        proc.stderr.close()  # type: ignore[union-attr]
+
+    def kill(self):
+        """Kill host process immediately. Pending requests are failed by it."""
+        if self._proc and self._proc.poll() is None:
+            self._proc.kill()
+            # Wait for exit so that is_alive is false after this.
+            self._proc.wait()
+
+    def _send(self, packet: Packet):
+        self._write(packet.to_bytes())
+
+    def _write(self, data: bytes):
+        if not self._proc:
+            raise HostError("Dart Sass process is not started.")
+        try:
+            with self._write_lock:
+                self._proc.stdin.write(data)  # type: ignore[union-attr]
+        except OSError as err:
+            raise HostError(f"Failed to send request: {err}") from err
+
+    def _call(self, pending: _Compilation, handler: Callable[[], InboundMessage]):
+        """Run callback for request of compiler on worker thread, and send its reply.
+
+        Reader thread continues to route packets of other compilations meanwhile.
+        """
+
+        def run():
+            try:
+                reply = handler()
+            except Exception as err:
+                self._reject(pending, err)
+                return
+            try:
+                pending._reply(self, reply)
+            except HostError as err:
+                logger.debug(f"Failed to reply for compilation: {err}")
+
+        with self._lock:
+            if self._workers is None:
+                self._workers = ThreadPoolExecutor(
+                    thread_name_prefix="sass-embedded-callback"
+                )
+            workers = self._workers
+        workers.submit(run)
+
+    def _watch(self, pending: _Pending, timeout: float):
+        """Fail request by :py:class:`HostTimeoutError` when it is not answered in time."""
+        pending.timeout = timeout
+        with self._lock:
+            pending.deadline = time.monotonic() + timeout
+            if self._watchdog is None:
+                self._watchdog = threading.Thread(
+                    target=_watch,
+                    args=(weakref.ref(self),),
+                    name="sass-embedded-watchdog",
+                    daemon=True,
+                )
+                self._watchdog.start()
+
+    def _expire(self) -> bool:
+        """Fail requests that are over deadline.
+
+        :returns: Whether any request is still watched.
+        """
+        now = time.monotonic()
+        with self._lock:
+            expired = [
+                p
+                for p in self._pending.values()
+                if p.deadline is not None and p.deadline <= now
+            ]
+            for pending in expired:
+                # Messages for this request are skipped after this.
+                del self._pending[pending.compilation_id]
+            watching = any(p.deadline is not None for p in self._pending.values())
+            if not watching:
+                self._watchdog = None
+        for pending in expired:
+            self._record(pending, "error")
+            pending.future.set_exception(
+                HostTimeoutError(
+                    f"Response is not received in {pending.timeout} seconds."
+                )
+            )
+        return watching
+
+    def _fail(self, err: Exception):
+        """Reject all pending requests and following requests."""
+        if isinstance(err, HostError):
+            if self._stderr_reader and not isinstance(err, ProtocolError):
+                # Wait for last output of terminated process.
+                self._stderr_reader.join(1)
+            err.stderr = self.stderr
+        self._reject_all(err)
+
+    def _submit(self, message: InboundMessage, pending: _Pending) -> Future:
+        if not self._proc:
+            raise HostError("Dart Sass process is not started.")
+        packet = self._register(message, pending)
+        try:
+            if pending.timings:
+                start = time.perf_counter()
+                data = packet.to_bytes()
+                pending.sent_at = time.perf_counter()
+                pending.timings.serialize = pending.sent_at - start
+            else:
+                data = packet.to_bytes()
+            self._write(data)
+        except Exception:
+            self._take(pending)
+            raise
+        return pending.future
+
+    def _wait(self, pending: _Pending, timeout: float | None):
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            return pending.future.result(timeout)
+        except FutureTimeoutError:
+            # Messages for this request are skipped after this.
+            self._take(pending)
+            raise HostTimeoutError(
+                f"Response is not received in {timeout} seconds."
+            ) from None
+
+    def send_message(
+        self, message: InboundMessage, timeout: float | None = None
+    ) -> OutboundMessage:
         """Send protobuf message for host process.
 
         :param message: Sending message.
+        :param timeout: Seconds to wait for response. Default is :py:attr:`timeout`.
         :returns: Parsed protbuf message.
         """
-        if not self._proc:
-            raise Exception("Dart Sass process is not started.")
-        # Sending packet.
-        packet = self.make_packet(message)
-        self._proc.stdin.write(packet.to_bytes())  # type: ignore[union-attr]
-        # Receive packet.
-        out = b""
-        idx = 0
-        length = 0
-        while not self._proc.stdout.closed:  # type: ignore[union-attr]
-            out += self._proc.stdout.read(8)  # type: ignore[union-attr]
-            if not out:
-                continue
-            length, idx = varint.decode_varint(out, 0)
-            if length == len(out[idx:]):
-                break
-        # Parse packet.
-        cid, cidx = varint.decode_varint(out, idx)
-        if cid != packet.compilation_id:
-            raise Exception("CompilationID of request and response are not matched.")
-        msg = OutboundMessage()
-        msg.ParseFromString(out[cidx:])
-        return msg
+        pending = _Pending()
+        if message.WhichOneof("message") != "version_request":
+            self._submit(message, pending)
+            return self._wait(pending, timeout)
+        with self._version_lock:
+            self._submit(message, pending)
+            return self._wait(pending, timeout)
+
+    def submit(
+        self,
+        message: InboundMessage,
+        importers: Sequence[Importer | FileImporter] = (),
+        functions: Functions | None = None,
+        on_log: LogCallback | None = None,
+        timings: CompileTimings | None = None,
+        timeout: float | None = None,
+    ) -> Future[OutboundMessage.CompileResponse]:
+        """Send compile request without waiting for its response.
+
+        :param message: Message that has compile request.
+        :param importers: Custom importers that are passed to create message.
+        :param functions: Custom functions that are passed to create message.
+        :param on_log: Callback for log events. It is called on reader thread.
+            When it is not passed, events are emitted into :py:mod:`logging`.
+        :param timings: Object to fill timings of request in.
+            They are measured also when metrics hook is registered.
+        :param timeout: Seconds to wait for response. Default is :py:attr:`timeout`.
+            Future is failed by :py:class:`HostTimeoutError` after it.
+        :returns: Future that is resolved by compile response.
+        """
+        pending = _Compilation(
+            None, importers, functions, on_log, self._timings(timings)
+        )
+        future = self._submit(message, pending)
+        timeout = self.timeout if timeout is None else timeout
+        if timeout is not None:
+            self._watch(pending, timeout)
+        return future
+
+    @staticmethod
+    def _timings(timings: CompileTimings | None) -> CompileTimings | None:
+        if timings is None and get_hook():
+            return CompileTimings("embedded")
+        return timings
+
+    def compile(
+        self,
+        message: InboundMessage,
+        importers: Sequence[Importer | FileImporter] = (),
+        functions: Functions | None = None,
+        on_log: LogCallback | None = None,
+        timeout: float | None = None,
+        timings: CompileTimings | None = None,
+    ) -> OutboundMessage.CompileResponse:
+        """Send compile request and wait for its response.
+
+        :param message: Message that has compile request.
+        :param importers: Custom importers that are passed to create message.
+        :param functions: Custom functions that are passed to create message.
+        :param on_log: Callback for log events. See :py:meth:`submit`.
+        :param timeout: Seconds to wait for response. Default is :py:attr:`timeout`.
+        :param timings: Object to fill timings of request in. See :py:meth:`submit`.
+        :returns: Compile response of request.
+        :raises HostTimeoutError: When response is not received in time.
+        """
+        pending = _Compilation(
+            None, importers, functions, on_log, self._timings(timings)
+        )
+        self._submit(message, pending)
+        return self._wait(pending, timeout)
@@ -0,0 +1,207 @@
+"""Custom Sass functions implemented in Python.
+
+Functions are registered into :py:class:`Functions` with signature of Sass,
+and host process answers ``FunctionCallRequest`` by them.
+
+Arguments are passed as values of :py:mod:`sass_embedded.values`,
+and returned value is encoded by :py:func:`sass_embedded.values.encode`.
+
+:ref: https://sass-lang.com/documentation/js-api/interfaces/options/#functions
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any
+
+from ..values import SassArgumentList, decode, encode
+from .embedded_sass_pb2 import InboundMessage, Value
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .embedded_sass_pb2 import OutboundMessage
+
+    SassFunction = Callable[..., Any]
+
+logger = logging.getLogger(__name__)
+
+
+_NAME_PATTERN = re.compile(r"^\s*([\w-]+)\s*\(")
+
+
+def _name_of(signature: str) -> str:
+    matched = _NAME_PATTERN.match(signature)
+    if not matched:
+        raise ValueError(f"'{signature}' is not valid signature of function.")
+    # Sass treats hyphens and underscores as same.
+    return matched.group(1).replace("_", "-")
+
+
+# Values that have ID of compilation can not be reused by other calls.
+_UNCACHEABLE_KINDS = {"compiler_function", "compiler_mixin", "host_function"}
+
+
+def _cache_key(name: str, arguments: list[Value]) -> tuple | None:
+    key: list = [name]
+    for arg in arguments:
+        kind = arg.WhichOneof("value")
+        if kind in _UNCACHEABLE_KINDS:
+            return None
+        if kind == "argument_list" and arg.argument_list.id:
+            arg = Value.FromString(arg.SerializeToString())
+            arg.argument_list.id = 0
+        key.append(arg.SerializeToString(deterministic=True))
+    return tuple(key)
+
+
+class Functions:
+    """Registry of Sass functions implemented in Python.
+
+    .. code-block:: python
+
+       functions = Functions()
+
+       @functions.register("asset-hash($path)", pure=True)
+       def asset_hash(path):
+           return hashes[path]
+
+    Results of pure functions are memoized by arguments with LRU eviction.
+    Cache is shared by all compilations that use same registry,
+    even if they run on different hosts of pool.
+    """
+
+    cache_size: int
+    """Max number of memoized results."""
+    hits: int
+    """Number of calls that are answered by memoized results."""
+    misses: int
+    """Number of calls of pure functions that are not memoized."""
+    _functions: dict[str, tuple[str, SassFunction, bool]]
+
+    def __init__(self, cache_size: int = 1024):
+        """
+        :param cache_size: Max number of memoized results of pure functions.
+        """
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self._functions = {}
+        self._cache: OrderedDict[tuple, tuple[Value, bool]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._functions)
+
+    @property
+    def signatures(self) -> list[str]:
+        """Signatures of all registered functions."""
+        return [entry[0] for entry in self._functions.values()]
+
+    def add(self, signature: str, func: SassFunction, pure: bool = False):
+        """Register function.
+
+        :param signature: Signature of Sass function. For example ``asset-hash($path)``.
+        :param func: Python callable. It receives converted arguments by position.
+        :param pure: Flag that function always returns same result for same arguments.
+            Results of pure function are memoized.
+        """
+        name = _name_of(signature)
+        self._functions[name] = (signature, func, pure)
+        self._clear_cache(name)
+
+    def register(
+        self, signature: str, pure: bool = False
+    ) -> Callable[[SassFunction], SassFunction]:
+        """Decorator to register function.
+
+        :param signature: Signature of Sass function.
+        :param pure: Flag that function always returns same result for same arguments.
+        """
+
+        def _register(func: SassFunction) -> SassFunction:
+            self.add(signature, func, pure)
+            return func
+
+        return _register
+
+    def clear_cache(self):
+        """Remove all memoized results."""
+        with self._lock:
+            self._cache.clear()
+
+    def _clear_cache(self, name: str):
+        with self._lock:
+            for key in [k for k in self._cache if k[0] == name]:
+                del self._cache[key]
+
+    def call(self, name: str, arguments: list[Value]) -> Value:
+        """Call function by name with protobuf arguments.
+
+        :param name: Name of function.
+        :param arguments: Arguments from compiler.
+        :returns: Returned value of function.
+        """
+        return self._call(name, arguments)[0]
+
+    def _call(self, name: str, arguments: list[Value]) -> tuple[Value, list[int]]:
+        """Call function, and retrieve result with IDs of accessed argument lists."""
+        name = name.replace("_", "-")
+        entry = self._functions.get(name)
+        if entry is None:
+            raise ValueError(f"Function '{name}' is not registered.")
+        _, func, pure = entry
+        key = _cache_key(name, arguments) if pure and self.cache_size > 0 else None
+        if key is not None:
+            with self._lock:
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+                    self.hits += 1
+            if cached is not None:
+                result, accessed = cached
+                ids = [
+                    a.argument_list.id for a in arguments if a.HasField("argument_list")
+                ]
+                return result, ids if accessed else []
+            with self._lock:
+                self.misses += 1
+        args = [decode(arg) for arg in arguments]
+        result = encode(func(*args))
+        ids = [
+            a.id
+            for a in args
+            if isinstance(a, SassArgumentList) and a.keywords_accessed
+        ]
+        if key is not None:
+            with self._lock:
+                self._cache[key] = (result, bool(ids))
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return result, ids
+
+    def handle_request(self, message: OutboundMessage) -> InboundMessage:
+        """Call function for request and make response message.
+
+        Exceptions that are raised by functions are sent as error of response.
+
+        :param message: Message that has function call request.
+        :returns: Message of response.
+        """
+        req = message.function_call_request
+        response = InboundMessage()
+        res = response.function_call_response
+        res.id = req.id
+        try:
+            if req.WhichOneof("identifier") != "name":
+                raise ValueError("Function must be called by name.")
+            result, accessed = self._call(req.name, list(req.arguments))
+            res.success.CopyFrom(result)
+            res.accessed_argument_lists.extend(accessed)
+        except Exception as err:
+            logger.debug(f"Failed to call function '{req.name}': {err}")
+            res.error = str(err)
+        return response
@@ -0,0 +1,327 @@
+"""Custom importers implemented in Python.
+
+Importers are passed with compile request, and host process answers
+``CanonicalizeRequest``, ``ImportRequest`` and ``FileImportRequest`` by them.
+
+:ref: https://sass-lang.com/documentation/js-api/interfaces/importer/
+"""
+
+from __future__ import annotations
+
+import logging
+import posixpath
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from .embedded_sass_pb2 import InboundMessage
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+
+    from .embedded_sass_pb2 import OutboundMessage
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CanonicalizeContext:
+    """Context of URL to canonicalize."""
+
+    from_import: bool
+    """Whether URL is loaded by ``@import`` rule."""
+    containing_url: str | None
+    """Canonical URL of stylesheet that contains loading rule."""
+
+
+@dataclass
+class ImporterResult:
+    """Loaded stylesheet by importer."""
+
+    contents: str
+    """Source text."""
+    syntax: str = "scss"
+    """Syntax of source text."""
+    source_map_url: str | None = None
+    """URL of source for source-map."""
+
+
+class Importer:
+    """Base class of importers that load stylesheets from anywhere.
+
+    Subclass must implement :py:meth:`canonicalize` and :py:meth:`load`.
+    """
+
+    non_canonical_schemes: Sequence[str] = ()
+    """URL schemes that are never returned by :py:meth:`canonicalize`."""
+
+    def canonicalize(self, url: str, context: CanonicalizeContext) -> str | None:
+        """Convert URL of loading rule into canonical URL.
+
+        :param url: URL of loading rule. It may be relative.
+        :param context: Context of loading rule.
+        :returns: Absolute URL. ``None`` when this does not know URL.
+        """
+        raise NotImplementedError()
+
+    def load(self, canonical_url: str) -> ImporterResult | None:
+        """Load stylesheet of canonical URL.
+
+        :param canonical_url: URL that is returned by :py:meth:`canonicalize`.
+        :returns: Loaded stylesheet. ``None`` when this does not know URL.
+        """
+        raise NotImplementedError()
+
+
+class FileImporter:
+    """Base class of importers that redirect URL to file on disk.
+
+    Subclass must implement :py:meth:`find_file_url`.
+    """
+
+    def find_file_url(self, url: str, context: CanonicalizeContext) -> str | None:
+        """Convert URL of loading rule into ``file:`` URL.
+
+        Dart Sass resolves partials, extensions and index files of returned URL.
+
+        :param url: URL of loading rule.
+        :param context: Context of loading rule.
+        :returns: Absolute ``file:`` URL. ``None`` when this does not know URL.
+        """
+        raise NotImplementedError()
+
+
+_SYNTAX_OF_EXTENSIONS = {".scss": "scss", ".sass": "sass", ".css": "css"}
+
+
+class VirtualFSImporter(Importer):
+    """Importer that loads stylesheets from in-memory files.
+
+    Files are referred by URL ``<scheme>:/<path>``
+    and relative URLs from them are resolved as same as files on disk.
+    Partials (``_name.scss``) and index files (``name/_index.scss``) are resolved
+    by same rules of Dart Sass.
+
+    Results of canonicalize are cached across compilations until files are changed.
+    """
+
+    scheme: str
+    """Scheme of URLs for files."""
+    hits: int
+    """Number of canonicalize that is found in cache."""
+    misses: int
+    """Number of canonicalize that is resolved from files."""
+
+    def __init__(self, files: Mapping[str, str] | None = None, scheme: str = "vfs"):
+        """
+        :param files: Mapping from path to source text. Path must have extension.
+        :param scheme: Scheme of URLs for files.
+        """
+        self.scheme = scheme
+        self.hits = 0
+        self.misses = 0
+        self._files: dict[str, str] = {}
+        self._canonicals: dict[tuple[str, bool], str | None] = {}
+        self._lock = threading.Lock()
+        for path, contents in (files or {}).items():
+            self.set(path, contents)
+
+    def _normalize(self, path: str) -> str:
+        return posixpath.normpath("/" + path.lstrip("/"))
+
+    def url_of(self, path: str) -> str:
+        """Retrieve canonical URL of file.
+
+        :param path: Path of file.
+        """
+        return f"{self.scheme}:{self._normalize(path)}"
+
+    def set(self, path: str, contents: str):
+        """Add or replace file.
+
+        :param path: Path of file. It must have extension.
+        :param contents: Source text.
+        """
+        path = self._normalize(path)
+        if posixpath.splitext(path)[1] not in _SYNTAX_OF_EXTENSIONS:
+            raise ValueError(f"'{path}' does not have extension of stylesheet.")
+        with self._lock:
+            if path not in self._files:
+                # Resolution of URLs may be changed by new file.
+                self._canonicals.clear()
+            self._files[path] = contents
+
+    def remove(self, path: str):
+        """Remove file.
+
+        :param path: Path of file.
+        """
+        with self._lock:
+            self._files.pop(self._normalize(path), None)
+            self._canonicals.clear()
+
+    def _candidates(self, path: str, from_import: bool) -> list[str]:
+        base, ext = posixpath.splitext(path)
+        dirname, name = posixpath.split(base)
+        if ext in _SYNTAX_OF_EXTENSIONS:
+            return self._exist([path, posixpath.join(dirname, f"_{name}{ext}")])
+        exts = list(_SYNTAX_OF_EXTENSIONS)
+        if from_import:
+            # Import-only files are prior for @import rule.
+            found = self._exist_with(dirname, f"{name}.import", exts)
+            if found:
+                return found
+        found = self._exist_with(dirname, name, exts)
+        if found:
+            return found
+        if from_import:
+            found = self._exist_with(base, "index.import", exts)
+            if found:
+                return found
+        return self._exist_with(base, "index", exts)
+
+    def _exist_with(self, dirname: str, name: str, exts: list[str]) -> list[str]:
+        # CSS files are used only when Sass files are not found.
+        for group in (exts[:2], exts[2:]):
+            paths = []
+            for ext in group:
+                paths.append(posixpath.join(dirname, f"{name}{ext}"))
+                paths.append(posixpath.join(dirname, f"_{name}{ext}"))
+            found = self._exist(paths)
+            if found:
+                return found
+        return []
+
+    def _exist(self, paths: list[str]) -> list[str]:
+        return [p for p in paths if p in self._files]
+
+    def _resolve(self, path: str, from_import: bool) -> str | None:
+        found = self._candidates(path, from_import)
+        if len(found) > 1:
+            raise ValueError(
+                f"It's not clear which file to import. Found: {', '.join(found)}"
+            )
+        return self.url_of(found[0]) if found else None
+
+    def canonicalize(self, url: str, context: CanonicalizeContext) -> str | None:
+        prefix = f"{self.scheme}:"
+        if url.startswith(prefix):
+            path = self._normalize(url[len(prefix) :])
+        elif ":" in url:
+            return None
+        else:
+            # Relative URL from stylesheets that are not loaded by this importer.
+            path = self._normalize(url)
+        key = (path, context.from_import)
+        with self._lock:
+            if key in self._canonicals:
+                self.hits += 1
+                return self._canonicals[key]
+            self.misses += 1
+            canonical = self._resolve(path, context.from_import)
+            self._canonicals[key] = canonical
+        return canonical
+
+    def load(self, canonical_url: str) -> ImporterResult | None:
+        path = self._normalize(canonical_url[len(self.scheme) + 1 :])
+        with self._lock:
+            contents = self._files.get(path)
+        if contents is None:
+            return None
+        syntax = _SYNTAX_OF_EXTENSIONS[posixpath.splitext(path)[1]]
+        return ImporterResult(contents, syntax=syntax)
+
+
+def add_importers(
+    request: InboundMessage.CompileRequest,
+    importers: Sequence[Importer | FileImporter],
+):
+    """Register importers into compile request.
+
+    ID of importer is index of ``importers``.
+    """
+    for idx, importer in enumerate(importers):
+        set_importer(request.importers.add(), idx, importer)
+
+
+def set_importer(
+    item: InboundMessage.CompileRequest.Importer,
+    idx: int,
+    importer: Importer | FileImporter,
+):
+    """Set ID of importer into message.
+
+    :param item: Message of importer.
+    :param idx: ID of importer.
+    :param importer: Importer object.
+    """
+    if isinstance(importer, FileImporter):
+        item.file_importer_id = idx
+    else:
+        item.importer_id = idx
+        item.non_canonical_scheme.extend(importer.non_canonical_schemes)
+
+
+def _context(req) -> CanonicalizeContext:
+    return CanonicalizeContext(
+        from_import=req.from_import,
+        containing_url=req.containing_url if req.HasField("containing_url") else None,
+    )
+
+
+def handle_request(
+    importers: Sequence[Importer | FileImporter], message: OutboundMessage
+) -> InboundMessage:
+    """Call importer for request and make response message.
+
+    Exceptions that are raised by importers are sent as error of response.
+
+    :param importers: Importers of compilation.
+    :param message: Message that has request for importer.
+    :returns: Message of response.
+    """
+    kind = message.WhichOneof("message")
+    response = InboundMessage()
+    if kind == "canonicalize_request":
+        req = message.canonicalize_request
+        res = response.canonicalize_response
+        res.id = req.id
+        try:
+            url = importers[req.importer_id].canonicalize(req.url, _context(req))  # type: ignore[union-attr]
+            if url is not None:
+                res.url = url
+        except Exception as err:
+            logger.debug(f"Failed to canonicalize '{req.url}': {err}")
+            res.error = str(err)
+    elif kind == "import_request":
+        req = message.import_request
+        res = response.import_response
+        res.id = req.id
+        try:
+            result = importers[req.importer_id].load(req.url)  # type: ignore[union-attr]
+            if result is not None:
+                from .compiler import SYNTAXES
+
+                res.success.contents = result.contents
+                res.success.syntax = SYNTAXES[result.syntax]
+                if result.source_map_url:
+                    res.success.source_map_url = result.source_map_url
+        except Exception as err:
+            logger.debug(f"Failed to load '{req.url}': {err}")
+            res.error = str(err)
+    elif kind == "file_import_request":
+        req = message.file_import_request
+        res = response.file_import_response
+        res.id = req.id
+        try:
+            url = importers[req.importer_id].find_file_url(req.url, _context(req))  # type: ignore[union-attr]
+            if url is not None:
+                if not url.startswith("file:"):
+                    raise ValueError(f"'{url}' is not file URL.")
+                res.file_url = url
+        except Exception as err:
+            logger.debug(f"Failed to find file for '{req.url}': {err}")
+            res.error = str(err)
+    else:
+        raise ValueError(f"'{kind}' is not request for importer.")
+    return response
@@ -0,0 +1,134 @@
+"""Structured log events and errors from compiler.
+
+Log events (``@warn``, ``@debug`` and deprecations) are sent while compiling.
+When no callback is passed, they are emitted into :py:mod:`logging`
+by logger ``sass_embedded.protocol.logs``.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Literal
+
+from .embedded_sass_pb2 import DEBUG, DEPRECATION_WARNING, WARNING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .embedded_sass_pb2 import OutboundMessage, SourceSpan as SpanMessage
+
+    LogCallback = Callable[["LogEvent"], None]
+
+LogEventType = Literal["warning", "deprecation", "debug"]
+
+_TYPES: dict[int, LogEventType] = {
+    WARNING: "warning",
+    DEPRECATION_WARNING: "deprecation",
+    DEBUG: "debug",
+}
+
+_LEVELS = {
+    "warning": logging.WARNING,
+    "deprecation": logging.WARNING,
+    "debug": logging.DEBUG,
+}
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SourceLocation:
+    """Position in source. All values start from 0."""
+
+    offset: int
+    line: int
+    column: int
+
+
+@dataclass(frozen=True)
+class SourceSpan:
+    """Range of source that is related to event."""
+
+    text: str
+    """Text of range."""
+    start: SourceLocation
+    end: SourceLocation | None
+    url: str | None
+    """Canonical URL of source. It is ``None`` for source text without URL."""
+    context: str | None
+    """Text around range (usually full lines)."""
+
+    @classmethod
+    def from_message(cls, span: SpanMessage) -> SourceSpan:
+        start = span.start
+        end = span.end if span.HasField("end") else None
+        return cls(
+            text=span.text,
+            start=SourceLocation(start.offset, start.line, start.column),
+            end=SourceLocation(end.offset, end.line, end.column) if end else None,
+            url=span.url or None,
+            context=span.context or None,
+        )
+
+
+@dataclass(frozen=True)
+class LogEvent:
+    """Log event from compiler."""
+
+    type: LogEventType
+    message: str
+    """Message without location."""
+    formatted: str
+    """Human-readable message with location (same as CLI)."""
+    span: SourceSpan | None
+    stack_trace: str
+    deprecation_type: str | None
+    """ID of deprecation. For example ``slash-div``."""
+
+    @classmethod
+    def from_message(cls, event: OutboundMessage.LogEvent) -> LogEvent:
+        return cls(
+            type=_TYPES[event.type],
+            message=event.message,
+            formatted=event.formatted,
+            span=SourceSpan.from_message(event.span)
+            if event.HasField("span")
+            else None,
+            stack_trace=event.stack_trace,
+            deprecation_type=(
+                event.deprecation_type if event.HasField("deprecation_type") else None
+            ),
+        )
+
+
+@dataclass(frozen=True)
+class CompileFailure:
+    """Error of compiling."""
+
+    message: str
+    """Message without location."""
+    formatted: str
+    """Human-readable message with location (same as CLI)."""
+    span: SourceSpan | None
+    stack_trace: str
+
+    @classmethod
+    def from_message(
+        cls, failure: OutboundMessage.CompileResponse.CompileFailure
+    ) -> CompileFailure:
+        return cls(
+            message=failure.message,
+            formatted=failure.formatted,
+            span=(
+                SourceSpan.from_message(failure.span)
+                if failure.HasField("span")
+                else None
+            ),
+            stack_trace=failure.stack_trace,
+        )
+
+
+def emit(event: LogEvent):
+    """Emit log event into :py:mod:`logging`."""
+    logger.log(_LEVELS[event.type], event.formatted or event.message)
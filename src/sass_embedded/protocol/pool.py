@@ -0,0 +1,365 @@
+"""Process pool of Dart Sass compiler."""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from .compiler import Host, HostError, HostTimeoutError
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from .embedded_sass_pb2 import InboundMessage, OutboundMessage
+    from .functions import Functions
+    from .importers import FileImporter, Importer
+    from .logs import LogCallback
+    from ..metrics import CompileTimings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PoolStats:
+    """Statistics of host pool."""
+
+    size: int
+    """Number of hosts in pool."""
+    alive: int
+    """Number of hosts that process is running."""
+    in_flight: int
+    """Number of requests that are sent or waiting for host."""
+    compiles: int
+    """Number of finished compile requests."""
+    failures: int
+    """Number of compile requests that raised error."""
+    restarts: int
+    """Number of restarted hosts."""
+    recycles: int
+    """Number of hosts that are replaced by limits of compiles or memory."""
+
+
+class _Slot:
+    """Host and its load in pool.
+
+    Lock is used to replace crashed host.
+    """
+
+    host: Host
+    load: int
+    lock: threading.Lock
+    compiles: int
+    """Number of finished compiles by current host."""
+    retiring: bool
+    """Flag that host is replaced when its all requests are finished."""
+
+    def __init__(self, host: Host):
+        self.host = host
+        self.load = 0
+        self.lock = threading.Lock()
+        self.compiles = 0
+        self.retiring = False
+
+
+class HostPool:
+    """Pool of host processes.
+
+    This dispatches compile requests to least-loaded host,
+    and restarts host when its process is crashed or does not respond in time.
+    To keep long-running workers stable,
+    host is also replaced after limits of compiles or memory.
+    """
+
+    size: int
+    timeout: float | None
+    retries: int
+    max_compiles: int | None
+    max_rss: int | None
+    _warm_up: bool
+    _slots: list[_Slot]
+    _lock: threading.Lock
+    _compiles: int
+    _failures: int
+    _restarts: int
+    _recycles: int
+
+    def __init__(
+        self,
+        size: int | None = None,
+        timeout: float | None = None,
+        retries: int = 1,
+        max_compiles: int | None = None,
+        max_rss: int | None = None,
+    ):
+        """
+        :param size: Number of hosts. Default is count of CPUs.
+        :param timeout: Seconds to wait for each response. ``None`` waits forever.
+        :param retries: Number of retries on other host when host is crashed.
+            Only compiles without importers and functions are retried.
+        :param max_compiles: Number of compiles to replace host by new one.
+        :param max_rss: Resident memory in bytes to replace host by new one.
+        """
+        self.size = size or os.cpu_count() or 1
+        if self.size < 1:
+            raise ValueError("Size of pool must be positive.")
+        if retries < 0:
+            raise ValueError("Retries must not be negative.")
+        self.timeout = timeout
+        self.retries = retries
+        self.max_compiles = max_compiles
+        self.max_rss = max_rss
+        self._warm_up = False
+        self._slots = [_Slot(self._make_host()) for _ in range(self.size)]
+        self._lock = threading.Lock()
+        self._compiles = 0
+        self._failures = 0
+        self._restarts = 0
+        self._recycles = 0
+
+    def __enter__(self) -> HostPool:
+        self.connect()
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def is_ready(self) -> bool:
+        """Whether all hosts are running and warmed up."""
+        return all(slot.host.is_ready for slot in self._slots)
+
+    def connect(self, warm_up: bool = False):
+        """Open and connect all Sass processes.
+
+        :param warm_up: Flag to warm up processes on background threads.
+            Restarted hosts are also warmed up.
+        """
+        self._warm_up = warm_up
+        for slot in self._slots:
+            slot.host.connect(warm_up=warm_up)
+
+    def wait_ready(self, timeout: float | None = None) -> bool:
+        """Wait until warm-up of all hosts is finished.
+
+        :param timeout: Seconds to wait for all hosts. ``None`` waits forever.
+        :returns: ``False`` when it is timed out.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for slot in self._slots:
+            rest = None if deadline is None else max(deadline - time.monotonic(), 0)
+            if not slot.host.wait_ready(rest):
+                return False
+        return True
+
+    def close(self):
+        """Stop all host processes."""
+        for slot in self._slots:
+            with slot.lock:
+                slot.host.close()
+
+    def stats(self) -> PoolStats:
+        """Retrieve current statistics of pool."""
+        with self._lock:
+            return PoolStats(
+                size=self.size,
+                alive=sum(1 for s in self._slots if s.host.is_alive),
+                in_flight=sum(s.load for s in self._slots),
+                compiles=self._compiles,
+                failures=self._failures,
+                restarts=self._restarts,
+                recycles=self._recycles,
+            )
+
+    def _make_host(self) -> Host:
+        return Host(timeout=self.timeout)
+
+    def _acquire(self) -> _Slot:
+        with self._lock:
+            slot = min(self._slots, key=lambda s: (s.retiring, s.load))
+            slot.load += 1
+        return slot
+
+    def _release(self, slot: _Slot, failed: bool):
+        with self._lock:
+            slot.load -= 1
+            slot.compiles += 1
+            self._compiles += 1
+            if failed:
+                self._failures += 1
+            if not slot.retiring:
+                slot.retiring = self._should_recycle(slot)
+            recycle = slot.retiring and slot.load == 0
+        if recycle:
+            self._recycle(slot)
+
+    def _should_recycle(self, slot: _Slot) -> bool:
+        if self.max_compiles is not None and slot.compiles >= self.max_compiles:
+            return True
+        if self.max_rss is not None:
+            rss = slot.host.rss
+            return rss is not None and rss > self.max_rss
+        return False
+
+    def _recycle(self, slot: _Slot):
+        """Replace host of slot by new one."""
+        with slot.lock:
+            with self._lock:
+                # Other request may acquire slot before recycling.
+                if not slot.retiring or slot.load:
+                    return
+                slot.retiring = False
+                slot.compiles = 0
+                self._recycles += 1
+            logger.info("Dart Sass process reaches limit. Replace it.")
+            old, slot.host = slot.host, self._make_host()
+            slot.host.connect(warm_up=self._warm_up)
+        old.close()
+
+    def _ensure_alive(self, slot: _Slot) -> Host:
+        """Retrieve host of slot, and replace it by new one if it is crashed.
+
+        Host that is not started yet is only connected, and it is not counted as restart.
+        Host whose reader is failed is also replaced even if its process is running.
+        """
+        with slot.lock:
+            if not slot.host.is_started:
+                slot.host.connect(warm_up=self._warm_up)
+            elif not slot.host.is_alive or slot.host.has_failed:
+                logger.warning("Dart Sass host is not available. Restart it.")
+                slot.host.close()
+                slot.host = self._make_host()
+                slot.host.connect(warm_up=self._warm_up)
+                with self._lock:
+                    self._restarts += 1
+            return slot.host
+
+    def _kill(self, slot: _Slot, host: Host):
+        """Stop hung host. It is restarted by next request."""
+        with slot.lock:
+            if slot.host is host:
+                host.kill()
+
+    def submit(
+        self,
+        message: InboundMessage,
+        importers: Sequence[Importer | FileImporter] = (),
+        functions: Functions | None = None,
+        on_log: LogCallback | None = None,
+        timings: CompileTimings | None = None,
+        timeout: float | None = None,
+    ) -> Future[OutboundMessage.CompileResponse]:
+        """Send compile request to least-loaded host without waiting for its response.
+
+        Hung host is killed and request is retried as same as :py:meth:`compile`.
+
+        :param message: Message that has compile request.
+        :param importers: Custom importers that are passed to create message.
+        :param functions: Custom functions that are passed to create message.
+        :param on_log: Callback for log events.
+        :param timings: Object to fill timings of request in.
+        :param timeout: Seconds to wait for response. Default is :py:attr:`timeout`.
+        :returns: Future that is resolved by compile response.
+        """
+        # Custom importers and functions may have side effects.
+        retries = 0 if importers or functions else self.retries
+        result: Future[OutboundMessage.CompileResponse] = Future()
+        self._submit(
+            result, retries, message, importers, functions, on_log, timings, timeout
+        )
+        return result
+
+    def _submit(
+        self,
+        result: Future,
+        retries: int,
+        message: InboundMessage,
+        *args,
+    ):
+        """Send request and pass its response into ``result``, or retry it."""
+        slot = self._acquire()
+        try:
+            host = self._ensure_alive(slot)
+            future = host.submit(message, *args)
+        except Exception:
+            self._release(slot, True)
+            raise
+
+        def _done(future: Future):
+            err = future.exception()
+            self._release(slot, err is not None)
+            if isinstance(err, HostError):
+                if isinstance(err, HostTimeoutError):
+                    self._kill(slot, host)
+                if retries > 0:
+                    logger.warning(f"Compile is failed by host: {err}. Retry it.")
+                    # Callback runs on thread of failed host that restarting joins.
+                    threading.Thread(
+                        target=self._retry,
+                        args=(result, retries - 1, message, *args),
+                        name="sass-embedded-retry",
+                        daemon=True,
+                    ).start()
+                    return
+            if err is not None:
+                result.set_exception(err)
+            else:
+                result.set_result(future.result())
+
+        future.add_done_callback(_done)
+
+    def _retry(self, result: Future, retries: int, message: InboundMessage, *args):
+        try:
+            self._submit(result, retries, message, *args)
+        except Exception as err:
+            result.set_exception(err)
+
+    def compile(
+        self,
+        message: InboundMessage,
+        importers: Sequence[Importer | FileImporter] = (),
+        functions: Functions | None = None,
+        on_log: LogCallback | None = None,
+        timeout: float | None = None,
+        timings: CompileTimings | None = None,
+    ) -> OutboundMessage.CompileResponse:
+        """Send compile request to least-loaded host and wait for its response.
+
+        :param message: Message that has compile request.
+        :param importers: Custom importers that are passed to create message.
+        :param functions: Custom functions that are passed to create message.
+        :param on_log: Callback for log events.
+        :param timeout: Seconds to wait for response. Default is :py:attr:`timeout`.
+        :param timings: Object to fill timings of request in.
+        :returns: Compile response of request.
+        :raises HostError: When all hosts of retries are crashed or timed out.
+        """
+        # Custom importers and functions may have side effects.
+        retries = 0 if importers or functions else self.retries
+        attempt = 0
+        while True:
+            slot = self._acquire()
+            failed = True
+            try:
+                host = self._ensure_alive(slot)
+                try:
+                    response = host.compile(
+                        message, importers, functions, on_log, timeout, timings
+                    )
+                except HostError as err:
+                    if isinstance(err, HostTimeoutError):
+                        self._kill(slot, host)
+                    self._ensure_alive(slot)
+                    if attempt >= retries:
+                        raise
+                    attempt += 1
+                    logger.warning(f"Compile is failed by host: {err}. Retry it.")
+                    continue
+                failed = False
+                return response
+            finally:
+                self._release(slot, failed)
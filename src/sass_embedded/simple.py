@@ -6,26 +6,54 @@ Finally, this provides all features of `Dart Sass CLI`_ excluded something.
 
 .. note:: This will not provide full-featured JavaScript API because it is to wrap CLI.
 
+When :py:class:`Compiler` is passed, compiling runs on long-lived process
+of `The Embedded Sass Protocol`_ instead of spawning CLI process every time.
+
 .. _Dart Sass CLI: https://sass-lang.com/documentation/cli/dart-sass/
+.. _The Embedded Sass Protocol: https://github.com/sass/sass/blob/main/spec/embedded-protocol.md
 """
 
 from __future__ import annotations
 
+import dataclasses
+import json
 import logging
+import os
 import subprocess
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from dataclasses import dataclass, field
+from functools import cached_property
 from pathlib import Path
-from typing import Generic, Literal, TypeVar
+from typing import TYPE_CHECKING, Generic, Literal, TypeVar
+from urllib.parse import quote, urlparse
+
+from .dart_sass import Executable, resolve_executable
+from .metrics import CompileTimings, record_cache, record_compile
 
-from .dart_sass import Executable, Release
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
+
+    from .cache import BuildManifest, CompileCache
+    from .protocol.aio import AsyncHost
+    from .protocol.compiler import Host
+    from .protocol.embedded_sass_pb2 import InboundMessage, OutboundMessage
+    from .protocol.functions import Functions
+    from .protocol.importers import FileImporter, Importer
+    from .protocol.logs import CompileFailure, LogCallback, LogEvent
+    from .protocol.pool import HostPool
 
 T = TypeVar("T")
 
 Syntax = Literal["scss", "sass", "css"]
 OutputStyle = Literal["expanded", "compressed"]
-SourceMapStyle = Literal["refer", "embed"]
+SourceMapStyle = Literal["refer", "embed", "separate"]
 SourceMapUrl = Literal["relative", "absolute"]
 
+SOURCE_SUFFIXES = (".scss", ".sass", ".css")
+
 logger = logging.getLogger(__name__)
 
 
@@ -36,6 +64,9 @@ class SourceMapOptions:
     style: SourceMapStyle = "refer"
     """Generating format for source-map.
 
+    ``separate`` keeps source-map only in :py:attr:`Result.source_map`.
+    It works only by embedded mode.
+
     :ref: https://sass-lang.com/documentation/cli/dart-sass/#embed-source-map
     """
     source_url: SourceMapUrl = "relative"
@@ -96,14 +127,11 @@ class CLI:
     options: CompileOptions
 
     def __init__(self, options: CompileOptions):
-        self.exe = Release.init().get_executable()
+        self.exe = resolve_executable()
         self.options = options
 
     def _command_base(self) -> list[str]:
-        return [
-            str(self.exe.dart_vm_path),
-            str(self.exe.sass_snapshot_path),
-        ]
+        return list(self.exe.command)
 
     def command_with_path(self, source: Path, dest: Path) -> list[str]:
         return (
@@ -125,6 +153,443 @@ class Result(Generic[T]):
     error: str | None = None
     options: CompileOptions | None = None
     output: T | None = None
+    loaded_urls: list[str] = field(default_factory=list)
+    """URLs of all loaded stylesheets. It is set only by embedded mode."""
+    elapsed: float | None = None
+    """Seconds to compile and write outputs. It is set only by parallel compiling."""
+    log_events: list[LogEvent] = field(default_factory=list)
+    """Warnings and debug messages in order of emitting. It is set only by embedded mode."""
+    failure: CompileFailure | None = None
+    """Structured error of compiling. It is set only by embedded mode."""
+    source_map: str | None = None
+    """JSON text of source-map. It is set only when style of source-map is ``separate``."""
+    timings: CompileTimings | None = None
+    """Timings and size of output. It is not set by async functions."""
+
+    @cached_property
+    def source_map_data(self) -> dict | None:
+        """Parsed object of :py:attr:`source_map`. It is parsed at first access."""
+        return json.loads(self.source_map) if self.source_map else None
+
+
+def _output_bytes(result: Result) -> int:
+    if not result.ok:
+        return 0
+    output = result.output
+    if isinstance(output, str):
+        return len(output.encode())
+    paths = output if isinstance(output, list) else [output]
+    return sum(p.stat().st_size for p in paths if isinstance(p, Path) and p.exists())
+
+
+def _finish(result: Result[T], timings: CompileTimings, start: float) -> Result[T]:
+    """Attach timings to result and pass them to metrics hook."""
+    timings.total = time.perf_counter() - start
+    timings.output_bytes = _output_bytes(result)
+    result.timings = timings
+    record_compile(timings, result.ok)
+    return result
+
+
+def _collector(events: list[LogEvent], on_log: LogCallback | None) -> LogCallback:
+    """Make callback that collects log events and passes them through."""
+    from .protocol.logs import emit
+
+    def _collect(event: LogEvent):
+        events.append(event)
+        if on_log:
+            on_log(event)
+        else:
+            emit(event)
+
+    return _collect
+
+
+class Compiler:
+    """Compile controls using host process of embedded mode.
+
+    This keeps one Dart Sass process and reuses it for all compiles.
+    It can be used as context manager to stop process when it exits.
+
+    When :py:class:`~sass_embedded.protocol.pool.HostPool` is passed as ``host``,
+    compiles are dispatched to multiple processes.
+
+    Log events (``@warn``, ``@debug`` and deprecations) are collected into
+    :py:attr:`Result.log_events`, and they are also passed to ``on_log``
+    as soon as they are emitted. When ``on_log`` is not passed,
+    they are emitted into :py:mod:`logging`.
+    """
+
+    host: Host | HostPool
+    on_log: LogCallback | None
+    _spawn: float | None
+
+    def __init__(
+        self,
+        host: Host | HostPool | None = None,
+        on_log: LogCallback | None = None,
+        warm_up: bool = False,
+    ):
+        """
+        :param host: Host of embedded mode. When it is not passed, this spawns new one.
+        :param on_log: Callback for log events. It is called on reader thread of host.
+        :param warm_up: Flag to warm up process on background.
+            Use ``host.wait_ready()`` or ``host.is_ready`` to know when it is finished.
+        """
+        spawned = host is None
+        if host is None:
+            from .protocol.compiler import Host
+
+            host = Host()
+        self.host = host
+        self.on_log = on_log
+        self.host.connect(warm_up=warm_up)
+        # Time to start process is charged to first compile.
+        self._spawn = host.spawn_time if spawned else None  # type: ignore[union-attr]
+
+    def __enter__(self) -> Compiler:
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Stop host process."""
+        self.host.close()
+
+    def _timings(self) -> CompileTimings:
+        spawn, self._spawn = self._spawn, None
+        return CompileTimings("embedded", spawn=spawn)
+
+    def _compile(
+        self,
+        message: InboundMessage,
+        importers: Sequence[Importer | FileImporter],
+        functions: Functions | None,
+        timings: CompileTimings,
+        start: float,
+    ) -> tuple[OutboundMessage.CompileResponse, list[LogEvent]]:
+        built = time.perf_counter() - start
+        events: list[LogEvent] = []
+        on_log = _collector(events, self.on_log)
+        response = self.host.compile(
+            message, importers, functions, on_log, timings=timings
+        )
+        timings.serialize = (timings.serialize or 0.0) + built
+        return response, events
+
+    def compile_string(
+        self,
+        source: str,
+        syntax: Syntax = "scss",
+        load_paths: list[Path] | None = None,
+        style: OutputStyle = "expanded",
+        embed_sourcemap: bool = False,
+        embed_sources: bool = False,
+        importers: Sequence[Importer | FileImporter] = (),
+        functions: Functions | None = None,
+        separate_sourcemap: bool = False,
+    ) -> Result[str]:
+        """Convert from Sass/SCSS source to CSS.
+
+        Arguments and result are same as :py:func:`compile_string`
+        excluded ``importers`` and ``functions``.
+
+        :param importers: Custom importers. They are used before ``load_paths``.
+        :param functions: Custom functions.
+        """
+        options = _string_options(
+            load_paths, style, embed_sourcemap, embed_sources, separate_sourcemap
+        )
+        return self._compile_string(source, syntax, options, importers, functions)
+
+    def _compile_string(
+        self,
+        source: str,
+        syntax: Syntax,
+        options: CompileOptions,
+        importers: Sequence[Importer | FileImporter] = (),
+        functions: Functions | None = None,
+    ) -> Result[str]:
+        start = time.perf_counter()
+        timings = self._timings()
+        message = _compile_request(
+            options,
+            source=source,
+            syntax=syntax,
+            importers=importers,
+            functions=functions,
+        )
+        response, events = self._compile(message, importers, functions, timings, start)
+        return _finish(_make_string_result(response, options, events), timings, start)
+
+    def _submit_string(
+        self,
+        source: str,
+        syntax: Syntax,
+        options: CompileOptions,
+        log_events: list[LogEvent] | None = None,
+        timings: CompileTimings | None = None,
+        timeout: float | None = None,
+    ) -> Future[OutboundMessage.CompileResponse]:
+        message = _string_request(source, syntax, options)
+        events = [] if log_events is None else log_events
+        return self.host.submit(
+            message,
+            on_log=_collector(events, self.on_log),
+            timings=timings,
+            timeout=timeout,
+        )
+
+    def compile_file(
+        self,
+        source: Path,
+        dest: Path,
+        load_paths: list[Path] | None = None,
+        style: OutputStyle = "expanded",
+        no_sourcemap: bool = False,
+        embed_sourcemap: bool = False,
+        embed_sources: bool = False,
+        source_urls: SourceMapUrl = "relative",
+        importers: Sequence[Importer | FileImporter] = (),
+        functions: Functions | None = None,
+        separate_sourcemap: bool = False,
+    ) -> Result[Path]:
+        """Convert from Sass/SCSS source to CSS.
+
+        Arguments and result are same as :py:func:`compile_file`
+        excluded ``importers`` and ``functions``.
+
+        :param importers: Custom importers. They are used before ``load_paths``.
+        :param functions: Custom functions.
+        """
+        options = _file_options(
+            load_paths,
+            style,
+            no_sourcemap,
+            embed_sourcemap,
+            embed_sources,
+            source_urls,
+            separate_sourcemap,
+        )
+        return self._compile_file(
+            Path(source), Path(dest), options, importers, functions
+        )
+
+    def _compile_file(
+        self,
+        source: Path,
+        dest: Path,
+        options: CompileOptions,
+        importers: Sequence[Importer | FileImporter] = (),
+        functions: Functions | None = None,
+    ) -> Result[Path]:
+        start = time.perf_counter()
+        timings = self._timings()
+        message = _compile_request(
+            options, path=source, importers=importers, functions=functions
+        )
+        response, events = self._compile(message, importers, functions, timings, start)
+        return _finish(
+            _make_file_result(response, dest, options, events), timings, start
+        )
+
+
+def _string_options(
+    load_paths: list[Path] | None,
+    style: OutputStyle,
+    embed_sourcemap: bool,
+    embed_sources: bool,
+    separate_sourcemap: bool = False,
+) -> CompileOptions:
+    sourcemap_options = None
+    if separate_sourcemap:
+        if embed_sourcemap:
+            raise ValueError(
+                "'embed_sourcemap' and 'separate_sourcemap' can not be used together."
+            )
+        sourcemap_options = SourceMapOptions(
+            style="separate", source_embed=embed_sources
+        )
+    elif embed_sourcemap:
+        sourcemap_options = SourceMapOptions(style="embed", source_embed=embed_sources)
+    elif embed_sources:
+        logger.warning("'embed_sourcemap' should be True when 'embed_sources' is True.")
+    return CompileOptions(load_paths or [], style, sourcemap_options=sourcemap_options)
+
+
+def _file_options(
+    load_paths: list[Path] | None,
+    style: OutputStyle,
+    no_sourcemap: bool,
+    embed_sourcemap: bool,
+    embed_sources: bool,
+    source_urls: SourceMapUrl,
+    separate_sourcemap: bool = False,
+) -> CompileOptions:
+    if separate_sourcemap and embed_sourcemap:
+        raise ValueError(
+            "'embed_sourcemap' and 'separate_sourcemap' can not be used together."
+        )
+    sourcemap_style: SourceMapStyle = "refer"
+    if separate_sourcemap:
+        sourcemap_style = "separate"
+    elif embed_sourcemap:
+        sourcemap_style = "embed"
+    sourcemap_options = (
+        None
+        if no_sourcemap
+        else SourceMapOptions(
+            style=sourcemap_style,
+            source_embed=embed_sources,
+            source_url=source_urls,
+        )
+    )
+    return CompileOptions(load_paths or [], style, sourcemap_options)
+
+
+def _compile_request(
+    options: CompileOptions,
+    source: str | None = None,
+    path: Path | None = None,
+    syntax: Syntax = "scss",
+    importers: Sequence[Importer | FileImporter] = (),
+    functions: Functions | None = None,
+) -> InboundMessage:
+    from .protocol.compiler import make_compile_request
+
+    return make_compile_request(
+        source=source,
+        path=path,
+        syntax=syntax,
+        importers=importers,
+        functions=functions,
+        style=options.output_style,
+        load_paths=options.paths,
+        source_map=options.sourcemap_options is not None,
+        source_map_include_sources=bool(
+            options.sourcemap_options and options.sourcemap_options.source_embed
+        ),
+    )
+
+
+def _string_request(
+    source: str, syntax: Syntax, options: CompileOptions
+) -> InboundMessage:
+    return _compile_request(options, source=source, syntax=syntax)
+
+
+def _source_map_comment(url: str, options: CompileOptions) -> str:
+    sep = "" if options.output_style == "compressed" else "\n\n"
+    return f"{sep}/*# sourceMappingURL={url} */"
+
+
+def _embedded_source_map_url(source_map: str) -> str:
+    # Keep reserved characters of URI as same as Dart Sass CLI.
+    data = quote(source_map, safe=";/?:@&=+$,!*'()")
+    return f"data:application/json;charset=utf-8,{data}"
+
+
+def _relative_source_url(url: str, base: Path) -> str:
+    if not url.startswith("file:"):
+        return url
+    # urllib.request is slow to import, and it is needed only here.
+    from urllib.request import url2pathname
+
+    try:
+        path = os.path.relpath(url2pathname(urlparse(url).path), base)
+    except ValueError:
+        # Paths on different drives (Windows) can not be relative.
+        return url
+    return quote(Path(path).as_posix())
+
+
+def _resolve_source_map(source_map: str, dest: Path, options: CompileOptions) -> str:
+    """Rewrite source-map as same as CLI writes for destination."""
+    data = json.loads(source_map)
+    if options.sourcemap_options and options.sourcemap_options.source_url == "relative":
+        base = dest.parent.resolve()
+        data["sources"] = [_relative_source_url(u, base) for u in data["sources"]]
+    data["file"] = dest.name
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def _make_failure_result(
+    response: OutboundMessage.CompileResponse,
+    options: CompileOptions,
+    log_events: list[LogEvent] | None,
+) -> Result:
+    from .protocol.logs import CompileFailure
+
+    return Result(
+        False,
+        error=response.failure.formatted,
+        options=options,
+        loaded_urls=list(response.loaded_urls),
+        log_events=log_events or [],
+        failure=CompileFailure.from_message(response.failure),
+    )
+
+
+def _make_file_result(
+    response: OutboundMessage.CompileResponse,
+    dest: Path,
+    options: CompileOptions,
+    log_events: list[LogEvent] | None = None,
+) -> Result[Path]:
+    """Write output files from compile response as same as CLI."""
+    if response.WhichOneof("result") != "success":
+        return _make_failure_result(response, options, log_events)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    css = response.success.css
+    source_map = separated = None
+    if options.sourcemap_options:
+        source_map = _resolve_source_map(response.success.source_map, dest, options)
+        style = options.sourcemap_options.style
+        if style == "separate":
+            separated = source_map
+        elif style == "embed":
+            url = _embedded_source_map_url(source_map)
+            css += _source_map_comment(url, options)
+        elif style == "refer":
+            map_path = dest.parent / f"{dest.name}.map"
+            map_path.write_text(source_map, encoding="utf8")
+            css += _source_map_comment(quote(map_path.name), options)
+    dest.write_text(css + "\n", encoding="utf8")
+    return Result(
+        True,
+        options=options,
+        output=dest,
+        loaded_urls=list(response.loaded_urls),
+        log_events=log_events or [],
+        source_map=separated,
+    )
+
+
+def _make_string_result(
+    response: OutboundMessage.CompileResponse,
+    options: CompileOptions,
+    log_events: list[LogEvent] | None = None,
+) -> Result[str]:
+    """Convert compile response into result as same as CLI."""
+    if response.WhichOneof("result") != "success":
+        return _make_failure_result(response, options, log_events)
+    css = response.success.css
+    source_map = None
+    if options.sourcemap_options:
+        if options.sourcemap_options.style == "separate":
+            source_map = response.success.source_map
+        else:
+            url = _embedded_source_map_url(response.success.source_map)
+            css += _source_map_comment(url, options)
+    return Result(
+        True,
+        options=options,
+        output=css + "\n",
+        loaded_urls=list(response.loaded_urls),
+        log_events=log_events or [],
+        source_map=source_map,
+    )
 
 
 def compile_string(
@@ -134,6 +599,9 @@ def compile_string(
     style: OutputStyle = "expanded",
     embed_sourcemap: bool = False,
     embed_sources: bool = False,
+    compiler: Compiler | None = None,
+    cache: CompileCache | None = None,
+    separate_sourcemap: bool = False,
 ) -> Result[str]:
     """Convert from Sass/SCSS source to CSS.
 
@@ -143,25 +611,147 @@ def compile_string(
     :param style: Output style.
     :param embed_sourcemap: Flag to embed source-map into output.
     :param embed_sources: Flag to embed sources into output. It works only when ``embed_sourcemap`` is ``True``.
+    :param compiler: Compiler of embedded mode. When it is passed, this does not spawn CLI process.
+    :param cache: Cache of results. When result for same inputs is cached, this returns it without compiling.
+    :param separate_sourcemap: Flag to keep source-map in :py:attr:`Result.source_map`
+        instead of embedding into output.
+        Compiling runs by embedded mode even if ``compiler`` is not passed.
     """
-    sourcemap_options = None
-    if embed_sourcemap:
-        sourcemap_options = SourceMapOptions(style="embed", source_embed=embed_sources)
-    elif embed_sources:
-        logger.warning("'embed_sourcemap' should be True when 'embed_sources' is True.")
-    options = CompileOptions(
-        load_paths or [], style, sourcemap_options=sourcemap_options
+    options = _string_options(
+        load_paths, style, embed_sourcemap, embed_sources, separate_sourcemap
     )
-    cli = CLI(options)
-    proc = subprocess.run(
-        cli.command_with_stdin(syntax),
-        input=source,
-        text=True,
-        capture_output=True,
+    start = time.perf_counter()
+    key = None
+    if cache:
+        from .cache import make_key
+
+        key = make_key(source, syntax, options)
+        cached = cache.get(key)
+        record_cache(cached is not None)
+        if cached:
+            result = dataclasses.replace(cached, options=options)
+            return _finish(result, CompileTimings("cache", cache_hit=True), start)
+    if compiler:
+        result = compiler._compile_string(source, syntax, options)
+    elif separate_sourcemap:
+        with Compiler() as compiler:
+            result = compiler._compile_string(source, syntax, options)
+    else:
+        cli = CLI(options)
+        proc = subprocess.run(
+            cli.command_with_stdin(syntax),
+            input=source,
+            text=True,
+            capture_output=True,
+        )
+        timings = CompileTimings("cli", compile=time.perf_counter() - start)
+        if proc.returncode != 0:
+            result = Result(False, error=proc.stderr, options=options)
+        else:
+            result = Result(True, options=options, output=proc.stdout)
+        _finish(result, timings, start)
+    if cache and key:
+        cache.set(key, result)
+    return result
+
+
+def compile_many(
+    sources: Iterable[str],
+    syntax: Syntax = "scss",
+    load_paths: list[Path] | None = None,
+    style: OutputStyle = "expanded",
+    embed_sourcemap: bool = False,
+    embed_sources: bool = False,
+    compiler: Compiler | None = None,
+    ordered: bool = True,
+    window: int = 64,
+    separate_sourcemap: bool = False,
+    timeout: float | None = None,
+) -> Iterator[tuple[int, Result[str]]]:
+    """Convert many Sass/SCSS sources to CSS on one compiler.
+
+    Requests are sent without waiting for previous responses,
+    and results are yielded as soon as they are ready.
+
+    Arguments are same as :py:func:`compile_string` excluded these.
+
+    :param sources: Source texts. It can be lazy iterable.
+    :param compiler: Compiler of embedded mode. When it is not passed, this spawns temporary one.
+    :param ordered: Flag to yield results in order of sources.
+        When it is ``False``, results are yielded in order of completion.
+    :param window: Max number of requests that are sent and not yielded yet.
+    :param timeout: Seconds to wait for each result. Default is timeout of host of compiler.
+        Result is failed when it is not received in time.
+    :returns: Pairs of index of source and its result.
+    """
+    if window < 1:
+        raise ValueError("Window must be positive.")
+    options = _string_options(
+        load_paths, style, embed_sourcemap, embed_sources, separate_sourcemap
     )
-    if proc.returncode != 0:
-        return Result(False, error=proc.stderr, options=options)
-    return Result(True, options=options, output=proc.stdout)
+
+    events: dict[Future, list[LogEvent]] = {}
+    submitted: dict[Future, tuple[CompileTimings, float]] = {}
+
+    def _result(
+        future: Future[OutboundMessage.CompileResponse], timeout: float | None
+    ) -> Result[str]:
+        log_events = events.pop(future, [])
+        timings, start = submitted.pop(future)
+        try:
+            response = future.result(timeout)
+            result = _make_string_result(response, options, log_events)
+        except FutureTimeoutError:
+            message = f"Response is not received in {timeout} seconds."
+            result = Result(False, error=message, options=options)
+        except Exception as err:
+            result = Result(False, error=str(err), options=options)
+        # Total includes waiting in window of pipeline.
+        return _finish(result, timings, start)
+
+    def _run(compiler: Compiler) -> Iterator[tuple[int, Result[str]]]:
+        limit = compiler.host.timeout if timeout is None else timeout
+        futures: deque[tuple[int, Future]] = deque()
+        indexes: dict[Future, int] = {}
+        for idx, source in enumerate(sources):
+            log_events: list[LogEvent] = []
+            start = time.perf_counter()
+            timings = compiler._timings()
+            try:
+                future = compiler._submit_string(
+                    source, syntax, options, log_events, timings, limit
+                )
+            except Exception as err:
+                future = Future()
+                future.set_exception(err)
+            events[future] = log_events
+            submitted[future] = (timings, start)
+            if ordered:
+                futures.append((idx, future))
+                if len(futures) >= window:
+                    idx, future = futures.popleft()
+                    yield idx, _result(future, limit)
+                continue
+            indexes[future] = idx
+            if len(indexes) >= window:
+                yield from _completed(indexes)
+        while futures:
+            idx, future = futures.popleft()
+            yield idx, _result(future, limit)
+        while indexes:
+            yield from _completed(indexes)
+
+    def _completed(indexes: dict[Future, int]) -> Iterator[tuple[int, Result[str]]]:
+        # Host fails each request by its own deadline, so this waits without limit.
+        done, _ = wait(indexes, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield indexes.pop(future), _result(future, None)
+
+    if compiler:
+        yield from _run(compiler)
+        return
+    with Compiler() as compiler:
+        yield from _run(compiler)
 
 
 def compile_file(
@@ -173,6 +763,9 @@ def compile_file(
     embed_sourcemap: bool = False,
     embed_sources: bool = False,
     source_urls: SourceMapUrl = "relative",
+    compiler: Compiler | None = None,
+    manifest: BuildManifest | None = None,
+    separate_sourcemap: bool = False,
 ) -> Result[Path]:
     """Convert from Sass/SCSS source to CSS.
 
@@ -184,26 +777,70 @@ def compile_file(
     :param embed_sourcemap: Flag to embed source-map into output.
     :param embed_sources: Flag to embed sources into output.
     :param source_urls: Style for refer to sources on source-map.
+    :param compiler: Compiler of embedded mode. When it is passed, this does not spawn CLI process.
+    :param manifest: Manifest of previous builds.
+        When it is passed, this skips compiling if source and all dependencies are not changed.
+        Compiling runs by embedded mode to collect dependencies.
+    :param separate_sourcemap: Flag to keep source-map in :py:attr:`Result.source_map`
+        instead of writing file. Compiling runs by embedded mode.
+        When compiling is skipped by ``manifest``, source-map is not set.
     """
     source = Path(source)
     dest = Path(dest)
-    sourcemap_options = (
-        None
-        if no_sourcemap
-        else SourceMapOptions(
-            style="embed" if embed_sourcemap else "refer",
-            source_embed=embed_sources,
-            source_url=source_urls,
-        )
+    options = _file_options(
+        load_paths,
+        style,
+        no_sourcemap,
+        embed_sourcemap,
+        embed_sources,
+        source_urls,
+        separate_sourcemap,
     )
-    options = CompileOptions(load_paths or [], style, sourcemap_options)
+    if manifest:
+        return _compile_file_with_manifest(source, dest, options, manifest, compiler)
+    if compiler:
+        return compiler._compile_file(source, dest, options)
+    if separate_sourcemap:
+        with Compiler() as compiler:
+            return compiler._compile_file(source, dest, options)
+    start = time.perf_counter()
     cli = CLI(options)
     proc = subprocess.run(
         cli.command_with_path(source, dest), capture_output=True, text=True
     )
+    timings = CompileTimings("cli", compile=time.perf_counter() - start)
     if proc.returncode != 0:
-        return Result(False, error=proc.stdout + proc.stderr, options=options)
-    return Result(True, options=options, output=dest)
+        result = Result(False, error=proc.stdout + proc.stderr, options=options)
+    else:
+        result = Result(True, options=options, output=dest)
+    return _finish(result, timings, start)
+
+
+def _compile_file_with_manifest(
+    source: Path,
+    dest: Path,
+    options: CompileOptions,
+    manifest: BuildManifest,
+    compiler: Compiler | None,
+) -> Result[Path]:
+    from .cache import make_file_key
+
+    start = time.perf_counter()
+    key = make_file_key(source, options)
+    if manifest.is_fresh(dest, key):
+        logger.debug(f"Skip compiling '{source}' because it is not changed.")
+        result = Result(True, options=options, output=dest)
+        return _finish(result, CompileTimings("cache", cache_hit=True), start)
+    started = time.time_ns()
+    if compiler:
+        result = compiler._compile_file(source, dest, options)
+    else:
+        with Compiler() as compiler:
+            result = compiler._compile_file(source, dest, options)
+    if result.ok:
+        manifest.record(dest, key, result.loaded_urls, started)
+        manifest.save()
+    return result
 
 
 def compile_directory(
@@ -231,20 +868,164 @@ def compile_directory(
     :param embed_sources: Flag to embed sources into output.
     :param source_urls: Style for refer to sources on source-maps.
     """
-    sourcemap_options = (
-        None
-        if no_sourcemap
-        else SourceMapOptions(
-            style="embed" if embed_sourcemap else "refer",
-            source_embed=embed_sources,
-            source_url=source_urls,
-        )
+    options = _file_options(
+        load_paths, style, no_sourcemap, embed_sourcemap, embed_sources, source_urls
     )
-    options = CompileOptions(load_paths or [], style, sourcemap_options)
+    start = time.perf_counter()
     cli = CLI(options)
     proc = subprocess.run(
         cli.command_with_path(source, dest), capture_output=True, text=True
     )
+    timings = CompileTimings("cli", compile=time.perf_counter() - start)
     if proc.returncode != 0:
-        return Result(False, error=proc.stdout + proc.stderr, options=options)
-    return Result(True, options=options, output=[p for p in Path(dest).glob("*.css")])
+        result = Result(False, error=proc.stdout + proc.stderr, options=options)
+    else:
+        outputs = [p for p in Path(dest).glob("*.css")]
+        result = Result(True, options=options, output=outputs)
+    return _finish(result, timings, start)
+
+
+def find_entries(source: Path) -> list[Path]:
+    """Find all entry points in directory.
+
+    Entry points are files that have extension of Sass and do not start with ``_``.
+    This is same rule as Many-to-Many Mode of Dart Sass CLI.
+
+    :param source: Source directory.
+    """
+    return sorted(
+        p
+        for p in Path(source).rglob("*")
+        if p.suffix in SOURCE_SUFFIXES and not p.name.startswith("_") and p.is_file()
+    )
+
+
+def compile_directory_parallel(
+    source: Path,
+    dest: Path,
+    load_paths: list[Path] | None = None,
+    style: OutputStyle = "expanded",
+    no_sourcemap: bool = False,
+    embed_sourcemap: bool = False,
+    embed_sources: bool = False,
+    source_urls: SourceMapUrl = "relative",
+    workers: int | None = None,
+    compiler: Compiler | None = None,
+) -> dict[Path, Result[Path]]:
+    """Compile all source files on specified directory in parallel.
+
+    Unlike :py:func:`compile_directory`, this compiles each entry points
+    on pool of embedded mode processes and writes outputs concurrently.
+
+    Arguments are same as :py:func:`compile_directory` excluded these.
+
+    :param workers: Number of host processes. Default is count of CPUs.
+    :param compiler: Compiler of embedded mode. When it is passed, this uses it instead of new pool.
+    :returns: Results of each entry points with elapsed time. Keys are source paths.
+    """
+    source = Path(source)
+    dest = Path(dest)
+    options = _file_options(
+        load_paths, style, no_sourcemap, embed_sourcemap, embed_sources, source_urls
+    )
+    entries = find_entries(source)
+
+    def _compile(compiler: Compiler, entry: Path) -> Result[Path]:
+        started = time.perf_counter()
+        output = dest / entry.relative_to(source).with_suffix(".css")
+        try:
+            result = compiler._compile_file(entry, output, options)
+        except Exception as err:
+            result = Result(False, error=str(err), options=options)
+        result.elapsed = time.perf_counter() - started
+        return result
+
+    def _run(compiler: Compiler) -> dict[Path, Result[Path]]:
+        from .protocol.pool import HostPool
+
+        size = compiler.host.size if isinstance(compiler.host, HostPool) else 1
+        # Keep some requests waiting on each host to hide latency of writing files.
+        with ThreadPoolExecutor(max_workers=size * 2) as executor:
+            results = executor.map(lambda e: _compile(compiler, e), entries)
+            return dict(zip(entries, results))
+
+    if compiler:
+        return _run(compiler)
+    from .protocol.pool import HostPool
+
+    size = min(workers or os.cpu_count() or 1, max(len(entries), 1))
+    with Compiler(HostPool(size)) as compiler:
+        return _run(compiler)
+
+
+async def compile_string_async(
+    source: str,
+    syntax: Syntax = "scss",
+    load_paths: list[Path] | None = None,
+    style: OutputStyle = "expanded",
+    embed_sourcemap: bool = False,
+    embed_sources: bool = False,
+    host: AsyncHost | None = None,
+    separate_sourcemap: bool = False,
+) -> Result[str]:
+    """Convert from Sass/SCSS source to CSS on asyncio.
+
+    Arguments and result are same as :py:func:`compile_string` excluded ``host``.
+
+    :param host: Connected host for asyncio. When it is not passed, this spawns temporary host.
+    """
+    options = _string_options(
+        load_paths, style, embed_sourcemap, embed_sources, separate_sourcemap
+    )
+    message = _string_request(source, syntax, options)
+    events: list[LogEvent] = []
+    on_log = _collector(events, None)
+    if host:
+        response = await host.compile(message, on_log=on_log)
+        return _make_string_result(response, options, events)
+    from .protocol.aio import AsyncHost
+
+    async with AsyncHost() as host:
+        response = await host.compile(message, on_log=on_log)
+        return _make_string_result(response, options, events)
+
+
+async def compile_file_async(
+    source: Path,
+    dest: Path,
+    load_paths: list[Path] | None = None,
+    style: OutputStyle = "expanded",
+    no_sourcemap: bool = False,
+    embed_sourcemap: bool = False,
+    embed_sources: bool = False,
+    source_urls: SourceMapUrl = "relative",
+    host: AsyncHost | None = None,
+    separate_sourcemap: bool = False,
+) -> Result[Path]:
+    """Convert from Sass/SCSS source to CSS on asyncio.
+
+    Arguments and result are same as :py:func:`compile_file` excluded ``host``.
+
+    :param host: Connected host for asyncio. When it is not passed, this spawns temporary host.
+    """
+    dest = Path(dest)
+    options = _file_options(
+        load_paths,
+        style,
+        no_sourcemap,
+        embed_sourcemap,
+        embed_sources,
+        source_urls,
+        separate_sourcemap,
+    )
+    message = _compile_request(options, path=Path(source))
+    events: list[LogEvent] = []
+    on_log = _collector(events, None)
+    if host:
+        response = await host.compile(message, on_log=on_log)
+        return _make_file_result(response, dest, options, events)
+    from .protocol.aio import AsyncHost
+
+    async with AsyncHost() as host:
+        response = await host.compile(message, on_log=on_log)
+        return _make_file_result(response, dest, options, events)
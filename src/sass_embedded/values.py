@@ -0,0 +1,603 @@
+"""Sass values for Python.
+
+These are immutable objects for values of Sass that are passed to custom functions,
+and they are converted from and to ``Value`` of protobuf by :py:func:`decode` and :py:func:`encode`.
+
+Python objects can be also encoded as values.
+
+============================ ==========================================
+Python                       Sass
+============================ ==========================================
+``True``, ``False``          ``true``, ``false``
+``None``                     ``null``
+``str``                      Quoted string
+``int``, ``float``           Number without units
+``list``, ``tuple``          Comma-separated list
+``dict``                     Map
+============================ ==========================================
+
+``true``, ``false`` and ``null`` of Sass are decoded as ``True``, ``False`` and ``None``.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from typing import TYPE_CHECKING, Any
+
+from .protocol.embedded_sass_pb2 import (
+    COMMA,
+    DIVIDE,
+    FALSE,
+    MINUS,
+    NULL,
+    PLUS,
+    SLASH,
+    SPACE,
+    TIMES,
+    TRUE,
+    UNDECIDED,
+    Value,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+SEPARATORS = {"comma": COMMA, "space": SPACE, "slash": SLASH, "undecided": UNDECIDED}
+"""Mapping from separator name of list to protobuf enum value."""
+
+OPERATORS = {"+": PLUS, "-": MINUS, "*": TIMES, "/": DIVIDE}
+"""Mapping from operator of calculation to protobuf enum value."""
+
+_SEPARATOR_NAMES = {v: k for k, v in SEPARATORS.items()}
+_OPERATOR_NAMES = {v: k for k, v in OPERATORS.items()}
+
+
+class SassValue:
+    """Base class of immutable Sass values."""
+
+    __slots__ = ()
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(f"'{type(self).__name__}' is immutable.")
+
+    def __delattr__(self, name: str):
+        raise AttributeError(f"'{type(self).__name__}' is immutable.")
+
+
+class SassString(SassValue):
+    """String of Sass.
+
+    It is equal to ``str`` that has same text.
+    """
+
+    __slots__ = ("text", "quoted")
+
+    text: str
+    quoted: bool
+
+    def __init__(self, text: str, quoted: bool = True):
+        object.__setattr__(self, "text", text)
+        object.__setattr__(self, "quoted", quoted)
+
+    def __str__(self) -> str:
+        return self.text
+
+    def __repr__(self) -> str:
+        return f"SassString({self.text!r}, quoted={self.quoted})"
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, SassString):
+            return self.text == other.text
+        if isinstance(other, str):
+            return self.text == other
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.text)
+
+
+class SassNumber(SassValue):
+    """Number of Sass with units.
+
+    Unitless number is equal to ``int`` or ``float`` that has same value.
+    """
+
+    __slots__ = ("value", "numerators", "denominators")
+
+    value: float
+    numerators: tuple[str, ...]
+    denominators: tuple[str, ...]
+
+    def __init__(
+        self,
+        value: float,
+        unit: str | None = None,
+        numerators: Iterable[str] = (),
+        denominators: Iterable[str] = (),
+    ):
+        """
+        :param value: Numeric value.
+        :param unit: Single unit. It is shortcut of ``numerators``.
+        :param numerators: Units of numerator.
+        :param denominators: Units of denominator.
+        """
+        nums = tuple(numerators)
+        if unit:
+            nums = (unit,) + nums
+        object.__setattr__(self, "value", value)
+        object.__setattr__(self, "numerators", nums)
+        object.__setattr__(self, "denominators", tuple(denominators))
+
+    @property
+    def unit(self) -> str:
+        """Units as string. For example ``px`` or ``px*em/s``."""
+        unit = "*".join(self.numerators)
+        if self.denominators:
+            unit += "/" + "*".join(self.denominators)
+        return unit
+
+    @property
+    def is_unitless(self) -> bool:
+        return not self.numerators and not self.denominators
+
+    def __float__(self) -> float:
+        return float(self.value)
+
+    def __int__(self) -> int:
+        return int(self.value)
+
+    def __repr__(self) -> str:
+        if self.is_unitless:
+            return f"SassNumber({self.value!r})"
+        return f"SassNumber({self.value!r}, {self.unit!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, SassNumber):
+            return (
+                self.value == other.value
+                and self.numerators == other.numerators
+                and self.denominators == other.denominators
+            )
+        if isinstance(other, (int, float)) and not isinstance(other, bool):
+            return self.is_unitless and self.value == other
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        if self.is_unitless:
+            return hash(self.value)
+        return hash((self.value, self.numerators, self.denominators))
+
+
+class SassColor(SassValue):
+    """Color of Sass.
+
+    Channels are values of color space. Missing channel is ``None``.
+    """
+
+    __slots__ = ("space", "channel1", "channel2", "channel3", "alpha")
+
+    space: str
+    channel1: float | None
+    channel2: float | None
+    channel3: float | None
+    alpha: float | None
+
+    def __init__(
+        self,
+        space: str,
+        channel1: float | None,
+        channel2: float | None,
+        channel3: float | None,
+        alpha: float | None = 1.0,
+    ):
+        object.__setattr__(self, "space", space)
+        object.__setattr__(self, "channel1", channel1)
+        object.__setattr__(self, "channel2", channel2)
+        object.__setattr__(self, "channel3", channel3)
+        object.__setattr__(self, "alpha", alpha)
+
+    def _tuple(self) -> tuple:
+        return (self.space, self.channel1, self.channel2, self.channel3, self.alpha)
+
+    def __repr__(self) -> str:
+        return "SassColor({!r}, {!r}, {!r}, {!r}, {!r})".format(*self._tuple())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, SassColor):
+            return self._tuple() == other._tuple()
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self._tuple())
+
+
+class SassList(SassValue, Sequence):
+    """List of Sass.
+
+    It is equal to ``list`` or ``tuple`` that has same contents.
+    """
+
+    __slots__ = ("contents", "separator", "brackets")
+
+    contents: tuple[Any, ...]
+    separator: str
+    brackets: bool
+
+    def __init__(
+        self,
+        contents: Iterable[Any] = (),
+        separator: str = "comma",
+        brackets: bool = False,
+    ):
+        """
+        :param contents: Items of list.
+        :param separator: ``comma``, ``space``, ``slash`` or ``undecided``.
+        :param brackets: Whether list has square brackets.
+        """
+        if separator not in SEPARATORS:
+            raise ValueError(f"'{separator}' is not separator of list.")
+        object.__setattr__(self, "contents", tuple(contents))
+        object.__setattr__(self, "separator", separator)
+        object.__setattr__(self, "brackets", brackets)
+
+    def __getitem__(self, idx):
+        return self.contents[idx]
+
+    def __len__(self) -> int:
+        return len(self.contents)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.contents)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self.contents)!r}, separator={self.separator!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, SassList):
+            return (
+                self.contents == other.contents
+                and self.separator == other.separator
+                and self.brackets == other.brackets
+            )
+        if isinstance(other, (list, tuple)):
+            return self.contents == tuple(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.contents)
+
+
+class SassArgumentList(SassList):
+    """Arguments that are passed into rest parameter (``$args...``).
+
+    Keyword arguments are available by :py:attr:`keywords`.
+    """
+
+    __slots__ = ("id", "_keywords", "_accessed")
+
+    id: int
+    _keywords: dict[str, Any]
+    _accessed: bool
+
+    def __init__(
+        self,
+        contents: Iterable[Any] = (),
+        keywords: Mapping[str, Any] | None = None,
+        separator: str = "comma",
+        id: int = 0,
+    ):
+        super().__init__(contents, separator)
+        object.__setattr__(self, "id", id)
+        object.__setattr__(self, "_keywords", dict(keywords or {}))
+        object.__setattr__(self, "_accessed", False)
+
+    @property
+    def keywords(self) -> Mapping[str, Any]:
+        """Keyword arguments. Names do not have ``$``."""
+        # Compiler must know it to report unknown keyword arguments.
+        object.__setattr__(self, "_accessed", True)
+        return self._keywords
+
+    @property
+    def keywords_accessed(self) -> bool:
+        """Whether :py:attr:`keywords` is accessed."""
+        return self._accessed
+
+
+class SassMap(SassValue, Mapping):
+    """Map of Sass.
+
+    It is equal to ``dict`` that has same items.
+    """
+
+    __slots__ = ("_items",)
+
+    _items: dict[Any, Any]
+
+    def __init__(self, items: Mapping[Any, Any] | Iterable[tuple[Any, Any]] = ()):
+        object.__setattr__(self, "_items", dict(items))
+
+    def __getitem__(self, key):
+        return self._items[key]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._items)
+
+    def __repr__(self) -> str:
+        return f"SassMap({self._items!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Mapping):
+            return self._items == dict(other.items())
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(frozenset(self._items.items()))
+
+
+class SassCalculation(SassValue):
+    """Calculation of Sass (``calc()``, ``clamp()`` and so on).
+
+    Arguments are :py:class:`SassNumber`, :py:class:`SassString` (unquoted),
+    :py:class:`CalculationOperation`, :py:class:`CalculationInterpolation`
+    or :py:class:`SassCalculation`.
+    """
+
+    __slots__ = ("name", "arguments")
+
+    name: str
+    arguments: tuple[Any, ...]
+
+    def __init__(self, name: str, arguments: Iterable[Any]):
+        object.__setattr__(self, "name", name)
+        object.__setattr__(self, "arguments", tuple(arguments))
+
+    def __repr__(self) -> str:
+        return f"SassCalculation({self.name!r}, {list(self.arguments)!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, SassCalculation):
+            return self.name == other.name and self.arguments == other.arguments
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((self.name, self.arguments))
+
+
+class CalculationOperation(SassValue):
+    """Binary operation in calculation."""
+
+    __slots__ = ("operator", "left", "right")
+
+    operator: str
+    left: Any
+    right: Any
+
+    def __init__(self, operator: str, left: Any, right: Any):
+        """
+        :param operator: ``+``, ``-``, ``*`` or ``/``.
+        """
+        if operator not in OPERATORS:
+            raise ValueError(f"'{operator}' is not operator of calculation.")
+        object.__setattr__(self, "operator", operator)
+        object.__setattr__(self, "left", left)
+        object.__setattr__(self, "right", right)
+
+    def __repr__(self) -> str:
+        return f"CalculationOperation({self.operator!r}, {self.left!r}, {self.right!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, CalculationOperation):
+            return (self.operator, self.left, self.right) == (
+                other.operator,
+                other.left,
+                other.right,
+            )
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((self.operator, self.left, self.right))
+
+
+class CalculationInterpolation(SassValue):
+    """Interpolation in calculation (``#{...}``)."""
+
+    __slots__ = ("text",)
+
+    text: str
+
+    def __init__(self, text: str):
+        object.__setattr__(self, "text", text)
+
+    def __repr__(self) -> str:
+        return f"CalculationInterpolation({self.text!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, CalculationInterpolation):
+            return self.text == other.text
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.text)
+
+
+_SINGLETONS = {TRUE: True, FALSE: False, NULL: None}
+
+
+def _decode_number(num: Value.Number) -> SassNumber:
+    return SassNumber(num.value, None, num.numerators, num.denominators)
+
+
+def _decode_calculation(calc: Value.Calculation) -> SassCalculation:
+    return SassCalculation(calc.name, [_decode_calc_value(a) for a in calc.arguments])
+
+
+def _decode_calc_value(arg: Value.Calculation.CalculationValue) -> Any:
+    kind = arg.WhichOneof("value")
+    if kind == "number":
+        return _decode_number(arg.number)
+    if kind == "string":
+        return SassString(arg.string, quoted=False)
+    if kind == "interpolation":
+        return CalculationInterpolation(arg.interpolation)
+    if kind == "operation":
+        op = arg.operation
+        return CalculationOperation(
+            _OPERATOR_NAMES[op.operator],
+            _decode_calc_value(op.left),
+            _decode_calc_value(op.right),
+        )
+    if kind == "calculation":
+        return _decode_calculation(arg.calculation)
+    raise ValueError(f"Calculation value of '{kind}' is not supported.")
+
+
+def _channel(color: Value.Color, name: str) -> float | None:
+    return getattr(color, name) if color.HasField(name) else None
+
+
+def decode(value: Value) -> Any:
+    """Convert from protobuf value into Python object.
+
+    :param value: Value from compiler.
+    :returns: Sass value. ``true``, ``false`` and ``null`` are Python singletons.
+    """
+    kind = value.WhichOneof("value")
+    if kind == "string":
+        s = value.string
+        return SassString(s.text, s.quoted)
+    if kind == "number":
+        return _decode_number(value.number)
+    if kind == "singleton":
+        return _SINGLETONS[value.singleton]
+    if kind == "list":
+        lst = value.list
+        return SassList(
+            [decode(v) for v in lst.contents],
+            _SEPARATOR_NAMES[lst.separator],
+            lst.has_brackets,
+        )
+    if kind == "map":
+        return SassMap([(decode(e.key), decode(e.value)) for e in value.map.entries])
+    if kind == "color":
+        c = value.color
+        return SassColor(
+            c.space,
+            _channel(c, "channel1"),
+            _channel(c, "channel2"),
+            _channel(c, "channel3"),
+            _channel(c, "alpha"),
+        )
+    if kind == "argument_list":
+        args = value.argument_list
+        return SassArgumentList(
+            [decode(v) for v in args.contents],
+            {k: decode(v) for k, v in args.keywords.items()},
+            _SEPARATOR_NAMES[args.separator],
+            args.id,
+        )
+    if kind == "calculation":
+        return _decode_calculation(value.calculation)
+    raise ValueError(f"Value of '{kind}' is not supported.")
+
+
+def _encode_number(obj: SassNumber, num: Value.Number):
+    num.value = obj.value
+    if obj.numerators:
+        num.numerators.extend(obj.numerators)
+    if obj.denominators:
+        num.denominators.extend(obj.denominators)
+
+
+def _encode_calc_value(obj: Any, arg: Value.Calculation.CalculationValue):
+    if isinstance(obj, SassNumber):
+        _encode_number(obj, arg.number)
+    elif isinstance(obj, (int, float)) and not isinstance(obj, bool):
+        arg.number.value = obj
+    elif isinstance(obj, (SassString, str)):
+        arg.string = str(obj)
+    elif isinstance(obj, CalculationInterpolation):
+        arg.interpolation = obj.text
+    elif isinstance(obj, CalculationOperation):
+        op = arg.operation
+        op.operator = OPERATORS[obj.operator]
+        _encode_calc_value(obj.left, op.left)
+        _encode_calc_value(obj.right, op.right)
+    elif isinstance(obj, SassCalculation):
+        _encode_calculation(obj, arg.calculation)
+    else:
+        raise ValueError(f"'{type(obj).__name__}' can not be used in calculation.")
+
+
+def _encode_calculation(obj: SassCalculation, calc: Value.Calculation):
+    calc.name = obj.name
+    for item in obj.arguments:
+        _encode_calc_value(item, calc.arguments.add())
+
+
+def encode(obj: Any, value: Value | None = None) -> Value:
+    """Convert from Python object into protobuf value.
+
+    :param obj: Sass value or Python object. See module document for Python types.
+    :param value: Message to write. When it is not passed, this creates new message.
+    :returns: Value for compiler.
+    """
+    value = Value() if value is None else value
+    if obj is None:
+        value.singleton = NULL
+    elif obj is True or obj is False:
+        value.singleton = TRUE if obj else FALSE
+    elif isinstance(obj, SassString):
+        value.string.text = obj.text
+        value.string.quoted = obj.quoted
+    elif isinstance(obj, str):
+        value.string.text = obj
+        value.string.quoted = True
+    elif isinstance(obj, SassNumber):
+        _encode_number(obj, value.number)
+    elif isinstance(obj, (int, float)):
+        value.number.value = obj
+    elif isinstance(obj, SassArgumentList):
+        args = value.argument_list
+        args.id = obj.id
+        args.separator = SEPARATORS[obj.separator]
+        for item in obj.contents:
+            encode(item, args.contents.add())
+        for key, item in obj._keywords.items():
+            encode(item, args.keywords[key])
+    elif isinstance(obj, SassList):
+        lst = value.list
+        lst.separator = SEPARATORS[obj.separator]
+        lst.has_brackets = obj.brackets
+        for item in obj.contents:
+            encode(item, lst.contents.add())
+    elif isinstance(obj, (list, tuple)):
+        lst = value.list
+        lst.separator = COMMA
+        lst.has_brackets = False
+        for item in obj:
+            encode(item, lst.contents.add())
+    elif isinstance(obj, Mapping):
+        entries = value.map.entries
+        value.map.SetInParent()
+        for key, item in obj.items():
+            entry = entries.add()
+            encode(key, entry.key)
+            encode(item, entry.value)
+    elif isinstance(obj, SassColor):
+        c = value.color
+        c.space = obj.space
+        for name in ("channel1", "channel2", "channel3", "alpha"):
+            channel = getattr(obj, name)
+            if channel is not None:
+                setattr(c, name, channel)
+    elif isinstance(obj, SassCalculation):
+        _encode_calculation(obj, value.calculation)
+    else:
+        raise ValueError(
+            f"'{type(obj).__name__}' can not be converted into Sass value."
+        )
+    return value
@@ -0,0 +1,308 @@
+"""Watch mode to recompile sources when they are changed.
+
+This keeps one host process of embedded mode and compiles entry points on it.
+When files are changed, only entry points that load changed files are compiled again.
+
+Changes are detected by polling mtime and size of files,
+because this does not depend on any file-system notification libraries.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+from .simple import SOURCE_SUFFIXES, Compiler, Result, _file_options, find_entries
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from .simple import CompileOptions, OutputStyle, SourceMapUrl
+
+    OnCompiled = Callable[[Path, Result[Path]], None]
+
+logger = logging.getLogger(__name__)
+
+
+def _url_to_path(url: str) -> Path | None:
+    if not url.startswith("file:"):
+        return None
+    return Path(url2pathname(urlparse(url).path))
+
+
+class DependencyGraph:
+    """Dependencies of entry points and reverse lookup from files to entry points."""
+
+    _dependencies: dict[Path, set[Path]]
+    _dependents: dict[Path, set[Path]]
+
+    def __init__(self):
+        self._dependencies = {}
+        self._dependents = {}
+
+    @property
+    def entries(self) -> set[Path]:
+        """All entry points in graph."""
+        return set(self._dependencies)
+
+    @property
+    def files(self) -> set[Path]:
+        """All files that are loaded by any entry points."""
+        return set(self._dependents)
+
+    def update(self, entry: Path, dependencies: Iterable[Path]):
+        """Replace dependencies of entry point.
+
+        :param entry: Path of entry point.
+        :param dependencies: Paths of all files that entry point loads.
+        """
+        self.remove(entry)
+        deps = set(dependencies) | {entry}
+        self._dependencies[entry] = deps
+        for dep in deps:
+            self._dependents.setdefault(dep, set()).add(entry)
+
+    def remove(self, entry: Path):
+        """Remove entry point from graph.
+
+        :param entry: Path of entry point.
+        """
+        for dep in self._dependencies.pop(entry, set()):
+            entries = self._dependents[dep]
+            entries.discard(entry)
+            if not entries:
+                del self._dependents[dep]
+
+    def affected(self, changed: Iterable[Path]) -> set[Path]:
+        """Find entry points that load any of changed files.
+
+        :param changed: Paths of changed files.
+        """
+        entries: set[Path] = set()
+        for path in changed:
+            entries |= self._dependents.get(path, set())
+        return entries
+
+
+class Watcher:
+    """Compile entry points of directory when they or their dependencies are changed.
+
+    Entry points are files in source directory that have extension of Sass
+    and do not start with ``_`` (same rule as Many-to-Many Mode of Dart Sass CLI).
+    """
+
+    source: Path
+    dest: Path
+    options: CompileOptions
+    graph: DependencyGraph
+    on_compiled: OnCompiled | None
+    _compiler: Compiler | None
+    _stats: dict[Path, tuple[int, int]]
+    _failed: set[Path]
+
+    def __init__(
+        self,
+        source: Path,
+        dest: Path,
+        options: CompileOptions,
+        on_compiled: OnCompiled | None = None,
+    ):
+        self.source = Path(source).resolve()
+        self.dest = Path(dest)
+        self.options = options
+        self.graph = DependencyGraph()
+        self.on_compiled = on_compiled
+        self._compiler = None
+        self._stats = {}
+        self._failed = set()
+
+    def __enter__(self) -> Watcher:
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Stop host process."""
+        if self._compiler:
+            self._compiler.close()
+            self._compiler = None
+
+    @property
+    def compiler(self) -> Compiler:
+        if not self._compiler:
+            self._compiler = Compiler()
+        return self._compiler
+
+    def entries(self) -> list[Path]:
+        """Find all entry points in source directory."""
+        return find_entries(self.source)
+
+    def dest_of(self, entry: Path) -> Path:
+        """Retrieve output path of entry point."""
+        return self.dest / entry.relative_to(self.source).with_suffix(".css")
+
+    def compile(self, entry: Path) -> Result[Path]:
+        """Compile entry point and update its dependencies.
+
+        When host process is crashed or hung, it is restarted
+        and compiling is retried once.
+
+        :param entry: Path of entry point.
+        """
+        from .protocol.compiler import HostError
+
+        dest = self.dest_of(entry)
+        try:
+            result = self.compiler._compile_file(entry, dest, self.options)
+        except HostError as err:
+            logger.warning(f"Dart Sass process is failed: {err}. Restart it.")
+            self.close()
+            try:
+                result = self.compiler._compile_file(entry, dest, self.options)
+            except HostError as err:
+                logger.warning(f"Dart Sass process is failed again: {err}")
+                self.close()
+                result = Result(False, error=str(err), options=self.options)
+        if result.ok:
+            self._failed.discard(entry)
+            deps = [p for p in map(_url_to_path, result.loaded_urls) if p]
+            self.graph.update(entry, deps)
+        else:
+            # Keep previous dependencies and retry at next change of any files.
+            self._failed.add(entry)
+            if entry not in self.graph.entries:
+                self.graph.update(entry, [])
+        if self.on_compiled:
+            self.on_compiled(entry, result)
+        return result
+
+    def build(self) -> dict[Path, Result[Path]]:
+        """Compile all entry points."""
+        results = {entry: self.compile(entry) for entry in self.entries()}
+        self._stats = self._scan()
+        return results
+
+    def _scan(self) -> dict[Path, tuple[int, int]]:
+        stats = {}
+        for path in set(self.entries()) | self.graph.files:
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            stats[path] = (stat.st_mtime_ns, stat.st_size)
+        # Partials that are not loaded yet can be used by failed entry points.
+        if self._failed:
+            for path in self.source.rglob("_*"):
+                if path.suffix not in SOURCE_SUFFIXES or path in stats:
+                    continue
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                stats[path] = (stat.st_mtime_ns, stat.st_size)
+        return stats
+
+    def poll(self) -> set[Path]:
+        """Find files that are changed, created or removed from previous polling."""
+        stats = self._scan()
+        changed = {
+            p
+            for p in stats.keys() | self._stats.keys()
+            if stats.get(p) != self._stats.get(p)
+        }
+        self._stats = stats
+        return changed
+
+    def rebuild(self, changed: set[Path]) -> dict[Path, Result[Path]]:
+        """Compile entry points that are affected by changed files.
+
+        :param changed: Paths of changed files.
+        """
+        entries = set(self.entries())
+        for entry in self.graph.entries:
+            if entry not in entries:
+                logger.info(f"Entry point '{entry}' is removed.")
+                self.graph.remove(entry)
+                self._failed.discard(entry)
+        targets = self.graph.affected(changed) & entries
+        targets |= {p for p in changed if p in entries}
+        if changed:
+            targets |= self._failed
+        results = {entry: self.compile(entry) for entry in sorted(targets)}
+        # Start watching new dependencies without missing changes while compiling.
+        for path, stat in self._scan().items():
+            self._stats.setdefault(path, stat)
+        return results
+
+    def run(
+        self,
+        interval: float = 0.5,
+        debounce: float = 0.1,
+        stop: threading.Event | None = None,
+    ):
+        """Build all entry points and watch changes until stopped.
+
+        :param interval: Seconds between polling.
+        :param debounce: Seconds to wait until burst of changes finishes.
+        :param stop: Event to stop watching. When it is not passed, this runs until interrupted.
+        """
+        stop = stop or threading.Event()
+        self.build()
+        while not stop.wait(interval):
+            changed = self.poll()
+            if not changed:
+                continue
+            # Collect changes while files are being written.
+            while not stop.wait(debounce):
+                more = self.poll()
+                if not more:
+                    break
+                changed |= more
+            logger.debug(f"Changed files: {sorted(str(p) for p in changed)}")
+            self.rebuild(changed)
+
+
+def watch(
+    source: Path,
+    dest: Path,
+    load_paths: list[Path] | None = None,
+    style: OutputStyle = "expanded",
+    no_sourcemap: bool = False,
+    embed_sourcemap: bool = False,
+    embed_sources: bool = False,
+    source_urls: SourceMapUrl = "relative",
+    interval: float = 0.5,
+    debounce: float = 0.1,
+    on_compiled: OnCompiled | None = None,
+    stop: threading.Event | None = None,
+):
+    """Compile all sources of directory, and compile again when they are changed.
+
+    This blocks until ``stop`` is set or process is interrupted.
+
+    :param source: Source directory.
+    :param dest: Output directory.
+    :param load_paths: List of additional load path for Sass compile.
+    :param style: Output style.
+    :param no_sourcemap: Flag to skip generating source-maps.
+    :param embed_sourcemap: Flag to embed source-map into output.
+    :param embed_sources: Flag to embed sources into output.
+    :param source_urls: Style for refer to sources on source-maps.
+    :param interval: Seconds between polling.
+    :param debounce: Seconds to wait until burst of changes finishes.
+    :param on_compiled: Callback that is called with entry point and result for each compiles.
+    :param stop: Event to stop watching.
+    """
+    options = _file_options(
+        load_paths, style, no_sourcemap, embed_sourcemap, embed_sources, source_urls
+    )
+    with Watcher(source, dest, options, on_compiled=on_compiled) as watcher:
+        try:
+            watcher.run(interval=interval, debounce=debounce, stop=stop)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,238 @@
+import os
+import shutil
+from pathlib import Path
+
+from sass_embedded import simple
+from sass_embedded.cache import BuildManifest, CompileCache, make_key
+
+here = Path(__file__).parent
+
+
+def _options(**kwargs) -> simple.CompileOptions:
+    return simple.CompileOptions(**kwargs)
+
+
+def test_make_key_depends_on_inputs():
+    base = make_key("a{b:c}", "scss", _options())
+    assert base == make_key("a{b:c}", "scss", _options())
+    assert base != make_key("a{b:d}", "scss", _options())
+    assert base != make_key("a{b:c}", "sass", _options())
+    assert base != make_key("a{b:c}", "scss", _options(output_style="compressed"))
+    assert base != make_key("a{b:c}", "scss", _options(paths=[Path("sass")]))
+    assert base != make_key(
+        "a{b:c}",
+        "scss",
+        _options(sourcemap_options=simple.SourceMapOptions(style="embed")),
+    )
+
+
+def test_make_key_depends_on_executable():
+    import dataclasses
+
+    from sass_embedded import dart_sass
+
+    base = make_key("a{b:c}", "scss", _options())
+    current = dart_sass.resolve_executable()
+    other = dataclasses.replace(current)
+    other.version = "0.0.0"
+    dart_sass.set_executable(other)
+    try:
+        assert base != make_key("a{b:c}", "scss", _options())
+    finally:
+        dart_sass.set_executable(current)
+
+
+def test_memory_lru():
+    cache = CompileCache(max_entries=2)
+    for key in ["a", "b", "c"]:
+        cache.set(key, simple.Result(True, output=key))
+    assert cache.get("a") is None
+    assert cache.get("b").output == "b"  # type: ignore[union-attr]
+    assert cache.get("c").output == "c"  # type: ignore[union-attr]
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_failure_is_not_stored():
+    cache = CompileCache()
+    cache.set("a", simple.Result(False, error="Error"))
+    assert cache.get("a") is None
+
+
+def test_disk_tier(tmp_path: Path):
+    CompileCache(directory=tmp_path).set("ab12", simple.Result(True, output="css"))
+    cache = CompileCache(directory=tmp_path)
+    assert cache.get("ab12").output == "css"  # type: ignore[union-attr]
+
+
+def test_disk_hit_is_same_as_original(tmp_path: Path):
+    (tmp_path / "_tokens.scss").write_text("$size: 2px;")
+    source = '@use "tokens";\n@warn "careful";\na { b: tokens.$size; }'
+    directory = tmp_path / "cache"
+    with simple.Compiler() as compiler:
+        original = simple.compile_string(
+            source,
+            load_paths=[tmp_path],
+            compiler=compiler,
+            cache=CompileCache(directory=directory),
+        )
+    cached = simple.compile_string(
+        source, load_paths=[tmp_path], cache=CompileCache(directory=directory)
+    )
+    assert cached.timings and cached.timings.cache_hit
+    assert original.loaded_urls and original.log_events
+    assert cached.output == original.output
+    assert cached.loaded_urls == original.loaded_urls
+    assert cached.log_events == original.log_events
+
+
+def test_disk_tier_ignores_old_format(tmp_path: Path):
+    path = tmp_path / "ab" / "ab12.json"
+    path.parent.mkdir()
+    path.write_text('{"output": "css", "source_map": null}')
+    assert CompileCache(directory=tmp_path).get("ab12") is None
+
+
+def test_disk_eviction(tmp_path: Path):
+    cache = CompileCache(max_entries=1, directory=tmp_path, max_disk_size=2500)
+    for i in range(5):
+        cache.set(f"{i:02d}", simple.Result(True, output="x" * 1000))
+    files = list(tmp_path.glob("*/*.json"))
+    assert sum(p.stat().st_size for p in files) <= 2500
+    assert cache.get("04") is not None
+
+
+def test_results_are_not_shared():
+    cache = CompileCache()
+    original = simple.Result(True, output="css", loaded_urls=["file:///a.scss"])
+    cache.set("a", original)
+    original.loaded_urls.append("file:///b.scss")
+    first = cache.get("a")
+    assert first and first.loaded_urls == ["file:///a.scss"]
+    first.loaded_urls.clear()
+    second = cache.get("a")
+    assert second and second.loaded_urls == ["file:///a.scss"]
+    assert second is not first
+
+
+def test_compile_string_hits_cache(monkeypatch):
+    cache = CompileCache()
+    source = (here / "test-basics" / "nesting/style.scss").read_text()
+    result1 = simple.compile_string(source, cache=cache)
+    assert result1.ok
+
+    def _run(*args, **kwargs):
+        raise AssertionError("Compiler must not be called")
+
+    monkeypatch.setattr(simple.subprocess, "run", _run)
+    result2 = simple.compile_string(source, cache=cache)
+    assert result2.output == result1.output
+    assert cache.hits == 1
+    assert result2.timings and result2.timings.mode == "cache"
+    assert result2.timings is not result1.timings
+    assert result1.timings and result1.timings.mode == "cli"
+
+
+class TestFor_BuildManifest:
+    def _setup(self, base: Path) -> Path:
+        src = base / "src"
+        src.mkdir()
+        for p in (here / "test-basics" / "modules/scss").glob("*.scss"):
+            shutil.copy(p, src / p.name)
+        return src / "style.scss"
+
+    def _forbid_compile(self, monkeypatch):
+        def _compile(*args, **kwargs):
+            raise AssertionError("Compiler must not be called")
+
+        monkeypatch.setattr(simple.Compiler, "_compile_file", _compile)
+
+    def test_skip_unchanged(self, tmp_path: Path, monkeypatch):
+        source = self._setup(tmp_path)
+        dest = tmp_path / "out/style.css"
+        manifest = BuildManifest(tmp_path / "manifest.json")
+        result = simple.compile_file(source, dest, manifest=manifest)
+        assert result.ok
+        assert any(u.endswith("/_base.scss") for u in result.loaded_urls)
+        self._forbid_compile(monkeypatch)
+        # Reload from file.
+        manifest = BuildManifest(tmp_path / "manifest.json")
+        result = simple.compile_file(source, dest, manifest=manifest)
+        assert result.ok
+        assert result.output == dest
+        # Touch without changes.
+        os.utime(source.parent / "_base.scss")
+        assert simple.compile_file(source, dest, manifest=manifest).ok
+
+    def test_touched_file_is_not_hashed_again(self, tmp_path: Path, monkeypatch):
+        source = self._setup(tmp_path)
+        dest = tmp_path / "out/style.css"
+        manifest = BuildManifest(tmp_path / "manifest.json")
+        simple.compile_file(source, dest, manifest=manifest)
+        os.utime(source.parent / "_base.scss", ns=(1, 1))
+        self._forbid_compile(monkeypatch)
+        assert simple.compile_file(source, dest, manifest=manifest).ok
+
+        def _hash(path):
+            raise AssertionError("File must not be hashed")
+
+        monkeypatch.setattr("sass_embedded.cache._file_hash", _hash)
+        # Reload to check that new mtime is saved.
+        manifest = BuildManifest(tmp_path / "manifest.json")
+        assert simple.compile_file(source, dest, manifest=manifest).ok
+
+    def test_dependency_changed_while_compiling(self, tmp_path: Path, monkeypatch):
+        source = self._setup(tmp_path)
+        dest = tmp_path / "out/style.css"
+        manifest = BuildManifest(tmp_path / "manifest.json")
+        compile_file = simple.Compiler._compile_file
+
+        def _compile(compiler, *args, **kwargs):
+            result = compile_file(compiler, *args, **kwargs)
+            base = source.parent / "_base.scss"
+            base.write_text(base.read_text() + "\n// changed")
+            return result
+
+        monkeypatch.setattr(simple.Compiler, "_compile_file", _compile)
+        assert simple.compile_file(source, dest, manifest=manifest).ok
+        monkeypatch.undo()
+        result = simple.compile_file(source, dest, manifest=manifest)
+        assert result.timings and not result.timings.cache_hit
+
+    def test_dependency_removed_while_compiling(self, tmp_path: Path):
+        source = self._setup(tmp_path)
+        dest = tmp_path / "out/style.css"
+        manifest = BuildManifest(tmp_path / "manifest.json")
+        result = simple.compile_file(source, dest, manifest=manifest)
+        (source.parent / "_base.scss").unlink()
+        assert not manifest.record(dest, "key", result.loaded_urls)
+        assert not manifest.is_fresh(dest, "key")
+
+    def test_recompile_changed_dependency(self, tmp_path: Path):
+        source = self._setup(tmp_path)
+        dest = tmp_path / "out/style.css"
+        manifest = BuildManifest(tmp_path / "manifest.json")
+        simple.compile_file(source, dest, manifest=manifest, no_sourcemap=True)
+        base = source.parent / "_base.scss"
+        base.write_text(base.read_text().replace("#333", "#444"))
+        result = simple.compile_file(source, dest, manifest=manifest, no_sourcemap=True)
+        assert result.loaded_urls
+        assert "#444" in dest.read_text()
+
+    def test_recompile_changed_options(self, tmp_path: Path):
+        source = self._setup(tmp_path)
+        dest = tmp_path / "out/style.css"
+        manifest = BuildManifest(tmp_path / "manifest.json")
+        simple.compile_file(source, dest, manifest=manifest)
+        result = simple.compile_file(
+            source, dest, manifest=manifest, style="compressed"
+        )
+        assert result.loaded_urls
+
+    def test_recompile_removed_output(self, tmp_path: Path):
+        source = self._setup(tmp_path)
+        dest = tmp_path / "out/style.css"
+        manifest = BuildManifest(tmp_path / "manifest.json")
+        simple.compile_file(source, dest, manifest=manifest)
+        dest.unlink()
+        simple.compile_file(source, dest, manifest=manifest)
+        assert dest.exists()
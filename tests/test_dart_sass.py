@@ -75,3 +75,150 @@ def test_windows_release_object():
     e = r.get_executable(P.resolve_bin_base_dir())
     assert e.dart_vm_path.name == "dart.exe"
     assert e.sass_snapshot_path.name == "sass.snapshot"
+
+
+class TestFor_resolve_executable:
+    @pytest.fixture(autouse=True)
+    def reset(self):
+        P.invalidate_executable()
+        yield
+        P.invalidate_executable()
+
+    def test_cached(self, monkeypatch):
+        calls = []
+        init = P.Release.init
+
+        def _init():
+            calls.append(1)
+            return init()
+
+        monkeypatch.setattr(P.Release, "init", _init)
+        first = P.resolve_executable()
+        assert P.resolve_executable() is first
+        assert len(calls) == 1
+        P.invalidate_executable()
+        assert P.resolve_executable() is not first
+        assert len(calls) == 2
+
+    def test_override(self, tmp_path):
+        exe = P.Executable(tmp_path, P.Release("linux", "x64"))
+        P.set_executable(exe)
+        assert P.resolve_executable() is exe
+        assert exe.dart_vm_path.is_relative_to(tmp_path.resolve())
+
+    def test_release_init_is_not_cached(self, monkeypatch):
+        P.resolve_executable()
+        monkeypatch.setattr(P, "resolve_arch", lambda: "riscv64")
+        assert P.Release.init().arch == "riscv64"
+        assert P.resolve_executable().release.arch != "riscv64"
+
+
+def _write_script(path, body: str):
+    path.write_text(f"#!/bin/sh\n{body}\n")
+    path.chmod(0o755)
+    return path
+
+
+@pytest.mark.skipif('sys.platform == "win32"')
+class TestFor_launch_modes:
+    @pytest.fixture(autouse=True)
+    def reset(self, monkeypatch):
+        monkeypatch.delenv(P.EXECUTABLE_ENV, raising=False)
+        monkeypatch.delenv(P.LAUNCH_ENV, raising=False)
+        P.invalidate_executable()
+        yield
+        P.invalidate_executable()
+
+    @pytest.fixture
+    def bundled(self):
+        return P.Release.init().get_executable()
+
+    @pytest.fixture
+    def native(self, tmp_path, bundled):
+        # Wrapper that behaves as same as native executable.
+        cmd = " ".join(bundled.command)
+        return _write_script(tmp_path / "sass", f'exec {cmd} "$@"')
+
+    def test_command(self, bundled, tmp_path):
+        assert bundled.command == [
+            str(bundled.dart_vm_path),
+            str(bundled.sass_snapshot_path),
+        ]
+        native = P.Executable(
+            bundled.base_dir, bundled.release, mode="native", path=tmp_path / "sass"
+        )
+        assert native.command == [str(tmp_path / "sass")]
+        aot = P.Executable(
+            bundled.base_dir, bundled.release, path=tmp_path / "sass.aot"
+        )
+        assert aot.command[1] == str((tmp_path / "sass.aot").resolve())
+
+    def test_probe(self, bundled, native, tmp_path):
+        assert P.probe(bundled) is not None
+        native_exe = P.Executable(
+            bundled.base_dir, bundled.release, mode="native", path=native
+        )
+        assert P.probe(native_exe) is not None
+        assert native_exe.version == bundled.release.version
+        assert P.probe(native_exe, version="0.0.0") is None
+        js = _write_script(
+            tmp_path / "js-sass", "echo '1.99.0 compiled with dart2js 3.9.0'"
+        )
+        js_exe = P.Executable(bundled.base_dir, bundled.release, mode="native", path=js)
+        assert P.probe(js_exe) is None
+        missing = P.Executable(
+            bundled.base_dir, bundled.release, mode="native", path=tmp_path / "none"
+        )
+        assert P.probe(missing) is None
+
+    def test_find_executables(self, monkeypatch, native, tmp_path):
+        monkeypatch.setenv(P.EXECUTABLE_ENV, str(tmp_path / "sass.snapshot"))
+        monkeypatch.setattr(P.shutil, "which", lambda name: str(native))
+        found = P.find_executables()
+        assert [e.mode for e in found] == ["snapshot", "snapshot", "native"]
+        assert found[0].path == tmp_path / "sass.snapshot"
+        assert found[2].path == native
+
+    def test_select_by_env(self, monkeypatch, native, bundled):
+        monkeypatch.setattr(P.shutil, "which", lambda name: None)
+        assert P.select_executable() == bundled
+        monkeypatch.setenv(P.EXECUTABLE_ENV, str(native))
+        selected = P.select_executable()
+        assert selected.mode == "native" and selected.path == native
+        monkeypatch.setenv(P.LAUNCH_ENV, "snapshot")
+        assert P.select_executable() == bundled
+
+    def test_select_falls_back(self, monkeypatch, tmp_path, bundled):
+        monkeypatch.setattr(P.shutil, "which", lambda name: None)
+        monkeypatch.setenv(P.EXECUTABLE_ENV, str(tmp_path / "none"))
+        assert P.select_executable() == bundled
+
+    def test_select_auto(self, monkeypatch, native):
+        monkeypatch.setattr(P.shutil, "which", lambda name: str(native))
+        monkeypatch.setenv(P.LAUNCH_ENV, "auto")
+        timings = {"snapshot": 0.2, "native": 0.1}
+        monkeypatch.setattr(P, "probe", lambda exe, version: timings[exe.mode])
+        assert P.select_executable().mode == "native"
+
+    def test_select_requires_version(self, monkeypatch, tmp_path, bundled):
+        other = _write_script(
+            tmp_path / "sass",
+            'echo \'{"compilerVersion": "0.0.0", "protocolVersion": "3.2.0"}\'',
+        )
+        monkeypatch.setattr(P.shutil, "which", lambda name: str(other))
+        monkeypatch.setenv(P.LAUNCH_ENV, "native")
+        assert P.select_executable() == bundled
+        monkeypatch.setenv(P.EXECUTABLE_ENV, str(other))
+        selected = P.select_executable()
+        assert selected.path == other and selected.version == "0.0.0"
+
+    def test_compile_with_native(self, native, bundled):
+        from sass_embedded import simple
+
+        exe = P.Executable(
+            bundled.base_dir, bundled.release, mode="native", path=native
+        )
+        P.set_executable(exe)
+        with simple.Compiler() as compiler:
+            assert compiler.host.executable is exe
+            assert compiler.compile_string("a { b: c; }").ok
@@ -0,0 +1,183 @@
+import threading
+
+import pytest
+
+from sass_embedded import simple
+from sass_embedded.protocol.compiler import Host, make_compile_request
+from sass_embedded.protocol.functions import Functions
+from sass_embedded.values import SassNumber, SassString, decode, encode
+
+
+@pytest.fixture(scope="module")
+def host():
+    host = Host()
+    host.connect()
+    yield host
+    host.close()
+
+
+def _compile(host: Host, source: str, functions: Functions) -> str:
+    message = make_compile_request(
+        source=source, style="compressed", functions=functions
+    )
+    response = host.compile(message, functions=functions)
+    assert response.WhichOneof("result") == "success", response.failure.message
+    return response.success.css
+
+
+def test_register_signatures():
+    functions = Functions()
+    functions.add("double($n)", lambda n: n.value * 2)
+
+    @functions.register("asset_hash($path, $length: 8)")
+    def asset_hash(path, length):
+        return path
+
+    assert functions.signatures == ["double($n)", "asset_hash($path, $length: 8)"]
+    assert decode(functions.call("asset-hash", [encode("a")] * 2)) == "a"
+
+
+class TestFor_compile:
+    def test_values(self, host: Host):
+        functions = Functions()
+
+        @functions.register("asset-hash($path)")
+        def asset_hash(path):
+            return {"logo.svg": "abc123"}[path]
+
+        @functions.register("double($n)")
+        def double(n):
+            return SassNumber(n.value * 2, None, n.numerators, n.denominators)
+
+        @functions.register("asset-url($path)")
+        def asset_url(path):
+            return SassString(f"url(/assets/{path}?{asset_hash(path)})", quoted=False)
+
+        @functions.register("keys($map)")
+        def keys(map):
+            return list(map)
+
+        source = """
+        a {
+          hash: asset-hash("logo.svg");
+          width: double(2px);
+          count: double(3);
+          background: asset-url("logo.svg");
+          keys: keys((a: 1, b: 2));
+        }
+        """
+        assert _compile(host, source, functions) == (
+            'a{hash:"abc123";width:4px;count:6;'
+            "background:url(/assets/logo.svg?abc123);keys:a,b}"
+        )
+
+    def test_rest_arguments(self, host: Host):
+        functions = Functions()
+        functions.add("sum($args...)", lambda args: sum(a.value for a in args))
+        assert _compile(host, "a{b: sum(1, 2, 3)}", functions) == "a{b:6}"
+
+    def test_keyword_arguments(self, host: Host):
+        functions = Functions()
+        functions.add("kw($args...)", lambda args: args.keywords["size"], pure=True)
+        functions.add("positional($args...)", lambda args: args[0])
+        css = _compile(host, "a{b: kw($size: 2px); c: kw($size: 2px)}", functions)
+        assert css == "a{b:2px;c:2px}"
+        message = make_compile_request(
+            source="a{b: positional(1, $size: 2px)}", functions=functions
+        )
+        response = host.compile(message, functions=functions)
+        assert "No parameter named $size" in response.failure.message
+
+    def test_error(self, host: Host):
+        functions = Functions()
+
+        @functions.register("broken()")
+        def broken():
+            raise ValueError("Broken function")
+
+        message = make_compile_request(source="a{b: broken()}", functions=functions)
+        response = host.compile(message, functions=functions)
+        assert "Broken function" in response.failure.message
+
+    def test_compiler(self):
+        functions = Functions()
+        functions.add("double($n)", lambda n: n.value * 2)
+        with simple.Compiler() as compiler:
+            result = compiler.compile_string(
+                "a{b: double(2)}", style="compressed", functions=functions
+            )
+        assert result.output == "a{b:4}\n"
+
+    def test_slow_function_does_not_block_others(self, host: Host):
+        released = threading.Event()
+        functions = Functions()
+        functions.add("slow()", lambda: released.wait(5) and "done")
+        message = make_compile_request(source="a{b:slow()}", functions=functions)
+        future = host.submit(message, functions=functions)
+        other = host.compile(make_compile_request(source="a{b:c}"), timeout=3)
+        assert other.success.css == "a {\n  b: c;\n}"
+        assert not future.done()
+        released.set()
+        assert future.result(5).success.css == 'a {\n  b: "done";\n}'
+
+
+class TestFor_memoization:
+    def test_pure_function(self, host: Host):
+        functions = Functions()
+        calls: list[str] = []
+
+        @functions.register("asset-url($path)", pure=True)
+        def asset_url(path):
+            calls.append(path)
+            return SassString(f"url(/{path})", quoted=False)
+
+        source = (
+            'a{b: asset-url("a.svg"); c: asset-url("a.svg"); d: asset-url("b.svg")}'
+        )
+        for _ in range(3):
+            css = _compile(host, source, functions)
+            assert css == "a{b:url(/a.svg);c:url(/a.svg);d:url(/b.svg)}"
+        assert calls == ["a.svg", "b.svg"]
+        assert (functions.hits, functions.misses) == (7, 2)
+
+    def test_not_pure_function(self, host: Host):
+        functions = Functions()
+        calls: list[int] = []
+        functions.add("count()", lambda: calls.append(1) or len(calls))
+        assert _compile(host, "a{b: count(); c: count()}", functions) == "a{b:1;c:2}"
+        assert functions.hits == functions.misses == 0
+
+    def test_lru(self):
+        functions = Functions(cache_size=2)
+        calls: list[int] = []
+        functions.add("double($n)", lambda n: calls.append(n) or n.value * 2, pure=True)
+        for n in [1, 2, 1, 3, 2]:
+            functions.call("double", [encode(n)])
+        # "2" is evicted by "3".
+        assert calls == [1, 2, 3, 2]
+
+    def test_rest_arguments(self, host: Host):
+        functions = Functions()
+        calls: list[list] = []
+        functions.add(
+            "sum($args...)",
+            lambda args: calls.append(args) or sum(a.value for a in args),
+            pure=True,
+        )
+        assert (
+            _compile(host, "a{b: sum(1, 2); c: sum(1, 2)}", functions) == "a{b:3;c:3}"
+        )
+        assert len(calls) == 1
+
+    def test_shared_by_hosts(self, host: Host):
+        functions = Functions()
+        calls: list[int] = []
+        functions.add("double($n)", lambda n: calls.append(n) or n.value * 2, pure=True)
+        other = Host()
+        other.connect()
+        try:
+            for h in [host, other, host, other]:
+                assert _compile(h, "a{b: double(2)}", functions) == "a{b:4}"
+        finally:
+            other.close()
+        assert calls == [2]
@@ -0,0 +1,241 @@
+import asyncio
+import threading
+from pathlib import Path
+
+import pytest
+
+from sass_embedded import simple
+from sass_embedded.protocol.aio import AsyncHost
+from sass_embedded.protocol.compiler import Host, make_compile_request
+from sass_embedded.protocol.importers import (
+    CanonicalizeContext,
+    FileImporter,
+    Importer,
+    ImporterResult,
+    VirtualFSImporter,
+)
+
+
+class DictImporter(Importer):
+    def __init__(self, sources: dict[str, str]):
+        self.sources = sources
+
+    def canonicalize(self, url, context):
+        if url.startswith("memory:"):
+            url = url[len("memory:") :]
+        return f"memory:{url}" if url in self.sources else None
+
+    def load(self, canonical_url):
+        name = canonical_url[len("memory:") :]
+        return ImporterResult(self.sources[name])
+
+
+class BrokenImporter(Importer):
+    def canonicalize(self, url, context):
+        raise ValueError("Broken")
+
+    def load(self, canonical_url):
+        return None
+
+
+class BlockingImporter(DictImporter):
+    def __init__(self, sources: dict[str, str]):
+        super().__init__(sources)
+        self.released = threading.Event()
+
+    def canonicalize(self, url, context):
+        self.released.wait(5)
+        return super().canonicalize(url, context)
+
+
+class DirImporter(FileImporter):
+    def __init__(self, base: Path):
+        self.base = base
+
+    def find_file_url(self, url, context):
+        if not url.startswith("tokens/"):
+            return None
+        return (self.base / url).as_uri()
+
+
+@pytest.fixture(scope="module")
+def host():
+    host = Host()
+    host.connect()
+    yield host
+    host.close()
+
+
+def test_importer(host: Host):
+    importer = DictImporter(
+        {
+            "tokens": '@forward "colors";\n$size: 2px;',
+            "colors": "$primary: #333;",
+        }
+    )
+    message = make_compile_request(
+        source='@use "tokens";\na { color: tokens.$primary; width: tokens.$size; }',
+        importers=[importer],
+    )
+    response = host.compile(message, [importer])
+    assert response.success.css == "a {\n  color: #333;\n  width: 2px;\n}"
+    assert "memory:tokens" in response.loaded_urls
+    assert "memory:colors" in response.loaded_urls
+
+
+def test_importer_error(host: Host):
+    importer = BrokenImporter()
+    message = make_compile_request(source='@use "tokens";', importers=[importer])
+    response = host.compile(message, [importer])
+    assert response.WhichOneof("result") == "failure"
+    assert "Broken" in response.failure.message
+
+
+def test_file_importer(host: Host, tmp_path: Path):
+    (tmp_path / "tokens").mkdir()
+    (tmp_path / "tokens/_colors.scss").write_text("$primary: #333;")
+    importer = DirImporter(tmp_path)
+    message = make_compile_request(
+        source='@use "tokens/colors";\na { color: colors.$primary; }',
+        importers=[importer],
+    )
+    response = host.compile(message, [importer])
+    assert response.success.css == "a {\n  color: #333;\n}"
+    assert (tmp_path / "tokens/_colors.scss").as_uri() in response.loaded_urls
+
+
+def test_slow_importer_does_not_block_others(host: Host):
+    importer = BlockingImporter({"tokens": "$primary: #333;"})
+    message = make_compile_request(
+        source='@use "tokens";\na { color: tokens.$primary; }', importers=[importer]
+    )
+    future = host.submit(message, [importer])
+    other = host.compile(make_compile_request(source="a { b: c; }"), timeout=3)
+    assert other.success.css == "a {\n  b: c;\n}"
+    assert not future.done()
+    importer.released.set()
+    assert future.result(5).success.css == "a {\n  color: #333;\n}"
+
+
+def test_compiler_with_importers():
+    importer = DictImporter({"tokens": "$primary: #333;"})
+    with simple.Compiler() as compiler:
+        result = compiler.compile_string(
+            '@use "tokens";\na { color: tokens.$primary; }',
+            importers=[importer],
+            style="compressed",
+        )
+    assert result.output == "a{color:#333}\n"
+
+
+def test_async_host():
+    importer = DictImporter({"tokens": "$primary: #333;"})
+
+    async def _compile():
+        async with AsyncHost() as host:
+            return await host.compile_string(
+                '@use "tokens";\na { color: tokens.$primary; }', importers=[importer]
+            )
+
+    response = asyncio.run(_compile())
+    assert response.success.css == "a {\n  color: #333;\n}"
+
+
+def test_async_slow_importer_does_not_block_others():
+    importer = BlockingImporter({"tokens": "$primary: #333;"})
+
+    async def _compile():
+        async with AsyncHost() as host:
+            slow = asyncio.create_task(
+                host.compile_string(
+                    '@use "tokens";\na { color: tokens.$primary; }',
+                    importers=[importer],
+                )
+            )
+            message = make_compile_request(source="a { b: c; }")
+            other = await host.compile(message, timeout=3)
+            assert not slow.done()
+            importer.released.set()
+            return other, await slow
+
+    other, slow = asyncio.run(asyncio.wait_for(_compile(), 10))
+    assert other.success.css == "a {\n  b: c;\n}"
+    assert slow.success.css == "a {\n  color: #333;\n}"
+
+
+class TestFor_VirtualFSImporter:
+    def _importer(self) -> VirtualFSImporter:
+        return VirtualFSImporter(
+            {
+                "theme/_colors.scss": "$primary: #333;",
+                "theme/_index.scss": '@forward "colors";',
+                "layout/grid.sass": ".grid\n  display: grid",
+                "plain.css": ".plain { color: red; }",
+            }
+        )
+
+    @pytest.mark.parametrize(
+        "url,expected",
+        [
+            ("theme/colors", "vfs:/theme/_colors.scss"),
+            ("vfs:/theme/colors", "vfs:/theme/_colors.scss"),
+            ("theme", "vfs:/theme/_index.scss"),
+            ("layout/grid", "vfs:/layout/grid.sass"),
+            ("layout/grid.sass", "vfs:/layout/grid.sass"),
+            ("plain", "vfs:/plain.css"),
+            ("missing", None),
+            ("other:theme", None),
+        ],
+    )
+    def test_canonicalize(self, url: str, expected: str | None):
+        importer = self._importer()
+        context = CanonicalizeContext(from_import=False, containing_url=None)
+        assert importer.canonicalize(url, context) == expected
+
+    def test_ambiguous(self):
+        importer = VirtualFSImporter({"_a.scss": "", "a.scss": ""})
+        context = CanonicalizeContext(from_import=False, containing_url=None)
+        with pytest.raises(ValueError):
+            importer.canonicalize("a", context)
+
+    def test_cache(self):
+        importer = self._importer()
+        context = CanonicalizeContext(from_import=False, containing_url=None)
+        importer.canonicalize("theme", context)
+        importer.canonicalize("theme", context)
+        assert (importer.hits, importer.misses) == (1, 1)
+        # New file can change resolution.
+        importer.set("theme.scss", "")
+        assert importer.canonicalize("theme", context) == "vfs:/theme.scss"
+
+    def test_compile(self, host: Host):
+        importer = self._importer()
+        importer.set(
+            "main.scss",
+            '@use "theme";\n@use "layout/grid";\na { color: theme.$primary; }',
+        )
+        for _ in range(2):
+            message = make_compile_request(
+                source='@use "vfs:/main";',
+                importers=[importer],
+                style="compressed",
+            )
+            response = host.compile(message, [importer])
+            assert response.success.css == ".grid{display:grid}a{color:#333}"
+        assert importer.hits
+
+    def test_compile_source_with_importer(self, host: Host):
+        importer = self._importer()
+        message = make_compile_request(
+            source='@use "colors";\na { color: colors.$primary; }',
+            url="vfs:/theme/main.scss",
+            importers=[importer],
+            source_importer=importer,
+            style="compressed",
+        )
+        response = host.compile(message, [importer])
+        assert response.success.css == "a{color:#333}"
+
+    def test_source_importer_must_be_registered(self):
+        with pytest.raises(ValueError):
+            make_compile_request(source="", source_importer=self._importer())
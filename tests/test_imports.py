@@ -0,0 +1,62 @@
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = ["google.protobuf", "packaging", "blackboxprotobuf"]
+
+
+def _loaded_modules(code: str) -> set[str]:
+    script = f"import sys\n{code}\nprint('\\n'.join(sys.modules))"
+    proc = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    )
+    return set(proc.stdout.split())
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "import sass_embedded",
+        "from sass_embedded import compile_string, compile_file, Compiler",
+        "import sass_embedded.simple",
+    ],
+)
+def test_import_does_not_load_heavy_modules(code: str):
+    modules = _loaded_modules(code)
+    for name in HEAVY_MODULES:
+        assert name not in modules
+    assert "sass_embedded.protocol.compiler" not in modules
+
+
+def test_protocol_is_loaded_lazily():
+    modules = _loaded_modules("import sass_embedded\nsass_embedded.protocol")
+    assert "sass_embedded.protocol" in modules
+    assert "google.protobuf" not in modules
+
+
+@pytest.mark.parametrize("name", ["simple", "dart_sass", "cache", "values"])
+def test_submodule_as_attribute(name: str):
+    code = f"import sass_embedded\nprint(sass_embedded.{name}.__name__)"
+    proc = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert proc.stdout.strip() == f"sass_embedded.{name}"
+
+
+def test_simple_after_package_import():
+    code = (
+        "import sass_embedded\n"
+        "print(sass_embedded.simple.compile_string('a{b:c}').output, end='')"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert proc.stdout == "a {\n  b: c;\n}\n"
+
+
+def test_unknown_attribute():
+    import sass_embedded
+
+    with pytest.raises(AttributeError):
+        sass_embedded.unknown  # noqa: B018
@@ -0,0 +1,107 @@
+import asyncio
+import logging
+from pathlib import Path
+
+import pytest
+
+from sass_embedded import simple
+from sass_embedded.protocol.aio import AsyncHost
+from sass_embedded.protocol.compiler import Host, make_compile_request
+from sass_embedded.protocol.logs import LogEvent
+
+SOURCE = """\
+@warn "first";
+@debug "second";
+a {
+  width: percentage(0.5);
+}
+"""
+
+
+@pytest.fixture(scope="module")
+def host():
+    host = Host()
+    host.connect()
+    yield host
+    host.close()
+
+
+class TestFor_Host:
+    def test_events_in_order(self, host: Host):
+        events: list[LogEvent] = []
+        message = make_compile_request(source=SOURCE, url="memory:main.scss")
+        response = host.compile(message, on_log=events.append)
+        assert response.WhichOneof("result") == "success"
+        assert [e.type for e in events] == ["warning", "debug", "deprecation"]
+        assert [e.message for e in events][:2] == ["first", "second"]
+        assert events[0].span is None
+        assert events[1].span and events[1].span.start.line == 1
+        assert events[1].span.url == "memory:main.scss"
+        assert events[2].deprecation_type == "global-builtin"
+        assert events[2].span and events[2].span.start.line == 3
+
+    def test_default_into_logging(self, host: Host, caplog):
+        caplog.set_level(logging.DEBUG, logger="sass_embedded.protocol.logs")
+        response = host.compile(make_compile_request(source=SOURCE))
+        assert response.WhichOneof("result") == "success"
+        records = [r for r in caplog.records if r.name.endswith(".logs")]
+        assert [r.levelno for r in records] == [
+            logging.WARNING,
+            logging.DEBUG,
+            logging.WARNING,
+        ]
+        assert "first" in records[0].getMessage()
+
+    def test_callback_error_is_ignored(self, host: Host):
+        def on_log(event):
+            raise ValueError("Oops")
+
+        response = host.compile(make_compile_request(source=SOURCE), on_log=on_log)
+        assert response.WhichOneof("result") == "success"
+
+
+def test_async_host():
+    async def _compile() -> list[LogEvent]:
+        events: list[LogEvent] = []
+        async with AsyncHost() as host:
+            await host.compile_string(SOURCE, on_log=events.append)
+        return events
+
+    events = asyncio.run(_compile())
+    assert [e.type for e in events] == ["warning", "debug", "deprecation"]
+
+
+class TestFor_Compiler:
+    def test_result_has_events(self):
+        streamed: list[LogEvent] = []
+        with simple.Compiler(on_log=streamed.append) as compiler:
+            result = compiler.compile_string(SOURCE)
+        assert result.ok
+        assert [e.message for e in result.log_events][:2] == ["first", "second"]
+        assert result.log_events == streamed
+
+    def test_failure(self, tmp_path: Path):
+        source = tmp_path / "style.scss"
+        source.write_text("@warn 'before';\na {\n  width: 1px + 1s;\n}\n")
+        with simple.Compiler(on_log=lambda e: None) as compiler:
+            result = compiler.compile_file(source, tmp_path / "style.css")
+        assert not result.ok
+        assert result.failure
+        assert result.failure.span and result.failure.span.start.line == 2
+        assert result.failure.span.url == source.as_uri()
+        assert result.error == result.failure.formatted
+        assert [e.message for e in result.log_events] == ["before"]
+
+    def test_compile_many(self):
+        with simple.Compiler(on_log=lambda e: None) as compiler:
+            results = dict(
+                simple.compile_many(['@warn "a";', "a{b:c}"], compiler=compiler)
+            )
+        assert [e.message for e in results[0].log_events] == ["a"]
+        assert results[1].log_events == []
+
+    def test_compile_string_async(self, caplog):
+        caplog.set_level(logging.WARNING, logger="sass_embedded.protocol.logs")
+        result = asyncio.run(simple.compile_string_async('@warn "async";'))
+        assert [e.message for e in result.log_events] == ["async"]
+        assert any("async" in r.getMessage() for r in caplog.records)
@@ -0,0 +1,133 @@
+from pathlib import Path
+
+import pytest
+
+from sass_embedded import metrics, simple
+from sass_embedded.cache import BuildManifest, CompileCache
+from sass_embedded.metrics import CompileTimings, InMemoryMetrics, MetricsHook
+from sass_embedded.protocol.compiler import Host, make_compile_request
+
+
+@pytest.fixture
+def hook():
+    hook = InMemoryMetrics()
+    metrics.set_hook(hook)
+    yield hook
+    metrics.set_hook(None)
+
+
+class TestFor_Host:
+    def test_timings(self):
+        timings = CompileTimings("embedded")
+        host = Host()
+        host.connect()
+        host.compile(make_compile_request(source="a{b:c}"), timings=timings)
+        host.close()
+        assert host.spawn_time is not None
+        assert timings.serialize is not None and timings.serialize > 0
+        assert timings.compile is not None and timings.compile > 0
+        assert timings.parse is not None and timings.parse > 0
+
+    def test_hook(self, hook: InMemoryMetrics):
+        host = Host()
+        host.connect()
+        host.compile(make_compile_request(source="a{b:c}"))
+        host.compile(make_compile_request(source="a{b:"))
+        host.close()
+        assert len(hook.values("sass_host_spawn_seconds")) == 1
+        assert hook.counter("sass_host_requests_total", status="success") == 1
+        assert hook.counter("sass_host_requests_total", status="failure") == 1
+        assert len(hook.values("sass_host_request_seconds", phase="compile")) == 2
+
+    def test_recorded_before_resolved(self, hook: InMemoryMetrics):
+        timings = CompileTimings("embedded")
+        seen = []
+        host = Host()
+        host.connect()
+        future = host.submit(make_compile_request(source="a{b:c}"), timings=timings)
+        future.add_done_callback(
+            lambda f: seen.append(
+                (
+                    timings.compile,
+                    hook.counter("sass_host_requests_total", status="success"),
+                )
+            )
+        )
+        future.result(5)
+        host.close()
+        compile_time, count = seen[0]
+        assert compile_time is not None and count == 1
+
+    def test_error_of_hook_is_ignored(self):
+        class BrokenHook(MetricsHook):
+            def observe(self, name, value, labels=None):
+                raise ValueError("Oops")
+
+        metrics.set_hook(BrokenHook())
+        try:
+            host = Host()
+            host.connect()
+            resp = host.compile(make_compile_request(source="a{b:c}"))
+            host.close()
+        finally:
+            metrics.set_hook(None)
+        assert resp.success.css
+
+
+class TestFor_simple:
+    def test_embedded(self, hook: InMemoryMetrics):
+        with simple.Compiler() as compiler:
+            first = compiler.compile_string("a{b:c}")
+            second = compiler.compile_string("a{b:c}")
+        assert first.timings and second.timings
+        assert first.timings.mode == "embedded"
+        assert first.timings.spawn is not None
+        assert second.timings.spawn is None
+        assert second.timings.total >= (second.timings.compile or 0)
+        assert second.timings.output_bytes == len(second.output or "")
+        assert hook.counter("sass_compiles_total", mode="embedded", status="ok") == 2
+
+    def test_file(self, tmp_path: Path):
+        source = tmp_path / "style.scss"
+        source.write_text("a{b:c}")
+        dest = tmp_path / "style.css"
+        with simple.Compiler() as compiler:
+            result = compiler.compile_file(source, dest, no_sourcemap=True)
+        assert result.timings
+        assert result.timings.output_bytes == dest.stat().st_size
+
+    def test_cli(self, hook: InMemoryMetrics):
+        result = simple.compile_string("a{b:")
+        assert not result.ok
+        assert result.timings and result.timings.mode == "cli"
+        assert result.timings.compile is not None
+        assert hook.counter("sass_compiles_total", mode="cli", status="error") == 1
+
+    def test_cache(self, hook: InMemoryMetrics):
+        cache = CompileCache()
+        with simple.Compiler() as compiler:
+            simple.compile_string("a{b:c}", compiler=compiler, cache=cache)
+            result = simple.compile_string("a{b:c}", compiler=compiler, cache=cache)
+        assert result.timings and result.timings.cache_hit
+        assert result.timings.mode == "cache"
+        assert hook.counter("sass_compile_cache_hits_total") == 1
+        assert hook.counter("sass_compile_cache_misses_total") == 1
+
+    def test_manifest(self, hook: InMemoryMetrics, tmp_path: Path):
+        source = tmp_path / "style.scss"
+        source.write_text("a{b:c}")
+        dest = tmp_path / "style.css"
+        manifest = BuildManifest(tmp_path / "manifest.json")
+        with simple.Compiler() as compiler:
+            simple.compile_file(source, dest, manifest=manifest, compiler=compiler)
+            result = simple.compile_file(
+                source, dest, manifest=manifest, compiler=compiler
+            )
+        assert result.timings and result.timings.cache_hit
+        assert result.timings.output_bytes == dest.stat().st_size
+        assert hook.counter("sass_compiles_total", mode="cache", status="ok") == 1
+
+    def test_compile_many(self):
+        with simple.Compiler() as compiler:
+            results = dict(simple.compile_many(["a{b:c}", "a{b:d}"], compiler=compiler))
+        assert all(r.timings and r.timings.compile for r in results.values())
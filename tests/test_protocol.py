@@ -0,0 +1,531 @@
+import asyncio
+import io
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from sass_embedded.protocol.aio import AsyncHost
+from sass_embedded.protocol._varint import decode_varint, encode_varint
+from sass_embedded.protocol import aio, compiler
+from sass_embedded.protocol.compiler import (
+    STDERR_LINES,
+    Host,
+    HostError,
+    HostTimeoutError,
+    ProtocolError,
+    _receive,
+    make_compile_request,
+)
+from sass_embedded.protocol.embedded_sass_pb2 import InboundMessage, OutboundMessage
+from sass_embedded.protocol.functions import Functions
+from sass_embedded.protocol.pool import HostPool
+
+here = Path(__file__).parent
+
+
+def test_make_compile_request_requires_one_input():
+    with pytest.raises(ValueError):
+        make_compile_request()
+    with pytest.raises(ValueError):
+        make_compile_request(source="a{b:c}", path=Path("style.scss"))
+
+
+def _outbound_packet(cid: int, css: str) -> bytes:
+    msg = OutboundMessage()
+    msg.compile_response.success.css = css
+    body = encode_varint(cid) + msg.SerializeToString()
+    return encode_varint(len(body)) + body
+
+
+@pytest.mark.parametrize("value", [0, 1, 127, 128, 300, 2**31, 2**63])
+def test_varint_round_trip(value: int):
+    data = encode_varint(value)
+    assert decode_varint(b"\xff" + data, 1) == (value, len(data) + 1)
+
+
+def test_varint_truncated():
+    with pytest.raises(ValueError):
+        decode_varint(b"\x80")
+
+
+def test_receive_packets_in_sequence():
+    sizes = [0, 1, 127, 128, 70_000, 3_000_000]
+    stream = io.BufferedReader(
+        io.BytesIO(
+            b"".join(_outbound_packet(i + 1, "a" * n) for i, n in enumerate(sizes))
+        ),  # type: ignore[arg-type]
+        buffer_size=1024,
+    )
+    for i, n in enumerate(sizes):
+        cid, msg = _receive(stream)
+        assert cid == i + 1
+        assert len(msg.compile_response.success.css) == n
+    with pytest.raises(Exception):
+        _receive(stream)
+
+
+def test_host_compile():
+    host = Host()
+    host.connect()
+    source = here / "test-basics" / "nesting/style.scss"
+    expect = here / "test-basics" / "nesting/style.expanded.css"
+    resp = host.compile(make_compile_request(source=source.read_text()))
+    host.close()
+    assert resp.success.css + "\n" == expect.read_text()
+
+
+class TestFor_HostPool:
+    def test_compile_concurrently(self):
+        source = here / "test-basics" / "nesting/style.scss"
+        expect = here / "test-basics" / "nesting/style.expanded.css"
+        with HostPool(2) as pool:
+            with ThreadPoolExecutor(4) as executor:
+                responses = list(
+                    executor.map(
+                        lambda _: pool.compile(
+                            make_compile_request(source=source.read_text())
+                        ),
+                        range(8),
+                    )
+                )
+            stats = pool.stats()
+        assert all(r.success.css + "\n" == expect.read_text() for r in responses)
+        assert stats.size == 2
+        assert stats.compiles == 8
+        assert stats.failures == 0
+        assert stats.in_flight == 0
+
+    def test_submit(self):
+        with HostPool(2) as pool:
+            futures = [
+                pool.submit(make_compile_request(source=f"a{{b:{i}}}"))
+                for i in range(8)
+            ]
+            responses = [f.result() for f in futures]
+        assert [r.success.css for r in responses] == [
+            f"a {{\n  b: {i};\n}}" for i in range(8)
+        ]
+
+    def test_lazy_start_is_not_restart(self):
+        pool = HostPool(1)
+        try:
+            resp = pool.compile(make_compile_request(source="a{b:c}"))
+            stats = pool.stats()
+        finally:
+            pool.close()
+        assert resp.success.css
+        assert stats.alive == 1
+        assert stats.restarts == 0
+
+    def test_restart_crashed_host(self):
+        with HostPool(1) as pool:
+            pool._slots[0].host._proc.kill()  # type: ignore[union-attr]
+            pool._slots[0].host._proc.wait()  # type: ignore[union-attr]
+            assert pool.stats().alive == 0
+            resp = pool.compile(make_compile_request(source="a{b:c}"))
+            stats = pool.stats()
+        assert resp.success.css
+        assert stats.alive == 1
+        assert stats.restarts == 1
+
+
+def test_host_compile_concurrently():
+    sources = [f".item-{i} {{ width: {i}px; }}" for i in range(50)]
+    host = Host()
+    host.connect()
+    with ThreadPoolExecutor(8) as executor:
+        responses = list(
+            executor.map(
+                lambda s: host.compile(make_compile_request(source=s)), sources
+            )
+        )
+    host.close()
+    for i, resp in enumerate(responses):
+        assert f".item-{i} {{\n  width: {i}px;\n}}" == resp.success.css
+
+
+def test_host_submit_pipelined():
+    host = Host()
+    host.connect()
+    futures = [
+        host.submit(make_compile_request(source=f"a {{ b: {i}; }}")) for i in range(20)
+    ]
+    responses = [f.result() for f in futures]
+    host.close()
+    assert [r.success.css for r in responses] == [
+        f"a {{\n  b: {i};\n}}" for i in range(20)
+    ]
+
+
+def test_host_rejects_after_terminated():
+    host = Host()
+    host.connect()
+    host._proc.kill()  # type: ignore[union-attr]
+    host._reader.join()  # type: ignore[union-attr]
+    with pytest.raises(Exception):
+        host.compile(make_compile_request(source="a{b:c}"))
+    host.close()
+
+
+class TestFor_warm_up:
+    def test_background(self):
+        host = Host()
+        with pytest.raises(Exception):
+            host.wait_ready()
+        host.connect(warm_up=True)
+        assert host.wait_ready(timeout=60)
+        assert host.is_ready
+        resp = host.compile(make_compile_request(source="a{b:c}"))
+        host.close()
+        assert resp.success.css
+        assert not host.is_ready
+
+    def test_without_warm_up(self):
+        host = Host()
+        host.connect()
+        assert host.is_ready
+        assert host.wait_ready(timeout=0)
+        host.close()
+
+    def test_timeout(self, monkeypatch):
+        monkeypatch.setattr(Host, "warm_up", lambda self: time.sleep(0.5))
+        host = Host()
+        host.connect(warm_up=True)
+        assert not host.is_ready
+        assert not host.wait_ready(timeout=0.01)
+        assert host.wait_ready()
+        host.close()
+
+    def test_failure(self, monkeypatch):
+        def _warm_up(self):
+            raise ValueError("Oops")
+
+        monkeypatch.setattr(Host, "warm_up", _warm_up)
+        host = Host()
+        host.connect(warm_up=True)
+        with pytest.raises(ValueError):
+            host.wait_ready(timeout=10)
+        assert not host.is_ready
+        host.close()
+
+    def test_pool(self):
+        pool = HostPool(2)
+        pool.connect(warm_up=True)
+        try:
+            assert pool.wait_ready(timeout=60)
+            assert pool.is_ready
+        finally:
+            pool.close()
+
+
+def _slow_functions(seconds: float) -> Functions:
+    functions = Functions()
+    functions.add("slow()", lambda: time.sleep(seconds) or "done")
+    return functions
+
+
+SLOW_SOURCE = "@for $i from 1 through 50000 { .a-#{$i} { b: $i; } }"
+"""Source that takes about a second to compile."""
+
+
+class TestFor_health:
+    def test_timeout(self):
+        functions = _slow_functions(1)
+        message = make_compile_request(source="a{b:slow()}", functions=functions)
+        host = Host(timeout=0.2)
+        host.connect()
+        with pytest.raises(HostTimeoutError):
+            host.compile(message, functions=functions)
+        assert not host._pending
+        resp = host.compile(make_compile_request(source="a{b:c}"), timeout=5)
+        host.close()
+        assert resp.success.css
+
+    def test_submit_timeout(self):
+        functions = _slow_functions(1)
+        message = make_compile_request(source="a{b:slow()}", functions=functions)
+        host = Host(timeout=0.2)
+        host.connect()
+        future = host.submit(message, functions=functions)
+        assert isinstance(future.exception(5), HostTimeoutError)
+        assert not host._pending
+        resp = host.compile(make_compile_request(source="a{b:c}"), timeout=5)
+        host.close()
+        assert resp.success.css
+
+    def test_response_after_timeout(self, monkeypatch):
+        handle = compiler._Compilation.handle
+
+        def expire_while_handling(pending, host, message):
+            result = handle(pending, host, message)
+            if result is not None:
+                # Watchdog fails request between lookup and resolving by reader.
+                pending.deadline = 0.0
+                host._expire()
+            return result
+
+        monkeypatch.setattr(compiler._Compilation, "handle", expire_while_handling)
+        host = Host()
+        host.connect()
+        future = host.submit(make_compile_request(source="a{b:c}"))
+        assert isinstance(future.exception(5), HostTimeoutError)
+        monkeypatch.undo()
+        resp = host.compile(make_compile_request(source="a{b:c}"), timeout=5)
+        error = host._error
+        host.close()
+        assert error is None
+        assert resp.success.css
+
+    def test_protocol_error(self):
+        host = Host()
+        host.connect()
+        with pytest.raises(ProtocolError):
+            host.send_message(InboundMessage(), timeout=5)
+        host.close()
+
+    def test_close_kills_process(self):
+        host = Host()
+        host.connect()
+        proc = host._proc
+        host.close(timeout=0)
+        assert proc and proc.returncode is not None
+
+    def test_rss(self):
+        host = Host()
+        host.connect()
+        rss = host.rss
+        host.close()
+        if rss is None:
+            pytest.skip("RSS is not available on this platform.")
+        assert rss > 0
+
+    def test_pool_retry(self):
+        with HostPool(1) as pool:
+            host = pool._slots[0].host
+
+            def crash(*args, **kwargs):
+                host._proc.kill()  # type: ignore[union-attr]
+                host._proc.wait()  # type: ignore[union-attr]
+                raise HostError("Dart Sass process is terminated.")
+
+            host.compile = crash  # type: ignore[method-assign]
+            resp = pool.compile(make_compile_request(source="a{b:c}"))
+            stats = pool.stats()
+        assert resp.success.css
+        assert stats.restarts == 1
+        assert stats.failures == 1
+
+    def test_pool_restart_failed_reader(self):
+        with HostPool(1) as pool:
+            host = pool._slots[0].host
+            host._fail(ProtocolError("Protocol error: broken"))
+            assert host.is_alive and host.has_failed
+            resp = pool.compile(make_compile_request(source="a{b:c}"))
+            stats = pool.stats()
+            assert pool._slots[0].host is not host
+        assert resp.success.css
+        assert stats.restarts == 1
+
+    def test_pool_submit_retry(self):
+        with HostPool(1) as pool:
+            host = pool._slots[0].host
+            submit = host.submit
+
+            def crash(*args, **kwargs):
+                future = submit(*args, **kwargs)
+                host.kill()
+                return future
+
+            host.submit = crash  # type: ignore[method-assign]
+            resp = pool.submit(make_compile_request(source=SLOW_SOURCE)).result(10)
+            stats = pool.stats()
+        assert resp.success.css
+        assert stats.restarts == 1
+        assert stats.failures == 1
+
+    def test_pool_submit_restart_after_timeout(self):
+        message = make_compile_request(source=SLOW_SOURCE)
+        with HostPool(1, timeout=0.2) as pool:
+            with pytest.raises(HostTimeoutError):
+                pool.submit(message).result(10)
+            resp = pool.submit(make_compile_request(source="a{b:c}")).result(5)
+            stats = pool.stats()
+        assert resp.success.css
+        assert stats.failures == 2
+        assert stats.restarts == 2
+
+    def test_pool_restart_after_timeout(self):
+        functions = _slow_functions(1)
+        message = make_compile_request(source="a{b:slow()}", functions=functions)
+        with HostPool(1, timeout=0.2) as pool:
+            with pytest.raises(HostTimeoutError):
+                pool.compile(message, functions=functions)
+            resp = pool.compile(make_compile_request(source="a{b:c}"))
+            stats = pool.stats()
+        assert resp.success.css
+        assert stats.restarts == 1
+
+    def test_pool_recycle(self):
+        with HostPool(1, max_compiles=2) as pool:
+            first = pool._slots[0].host
+            for _ in range(3):
+                pool.compile(make_compile_request(source="a{b:c}"))
+            stats = pool.stats()
+            assert pool._slots[0].host is not first
+        assert not first.is_alive
+        assert stats.recycles == 1
+        assert stats.compiles == 3
+
+    def test_async_timeout(self):
+        functions = _slow_functions(1)
+
+        async def main():
+            async with AsyncHost(timeout=0.2) as host:
+                with pytest.raises(HostTimeoutError):
+                    await host.compile_string("a{b:slow()}", functions=functions)
+
+        asyncio.run(main())
+
+
+NOISY_PROCESS = """\
+import sys
+for i in range(5000):
+    print(f"DEPRECATION WARNING: line {i} " + "x" * 80, file=sys.stderr)
+print("boom", file=sys.stderr)
+sys.exit(1)
+"""
+
+
+class TestFor_stderr:
+    @pytest.fixture
+    def noisy(self, monkeypatch):
+        def command(exe):
+            return [sys.executable, "-c", NOISY_PROCESS]
+
+        monkeypatch.setattr(compiler, "embedded_command", command)
+        monkeypatch.setattr(aio, "embedded_command", command)
+
+    def test_drain_into_ring_buffer(self, caplog):
+        lines: compiler.deque[str] = compiler.deque(maxlen=3)
+        stream = io.BytesIO(b"first\n\nsecond\nthird\nfourth\n")
+        compiler._drain(stream, lines)
+        assert list(lines) == ["second", "third", "fourth"]
+        assert "Dart Sass: first" in caplog.text
+
+    def test_drain_is_buffered(self):
+        class CountingStream(io.RawIOBase):
+            """Unbuffered stream as same as stderr of process."""
+
+            def __init__(self, data: bytes):
+                self.data = io.BytesIO(data)
+                self.reads = 0
+
+            def readable(self):
+                return True
+
+            def readinto(self, buffer):
+                self.reads += 1
+                return self.data.readinto(buffer)
+
+        stream = CountingStream(b"warning\n" * 10_000)
+        lines: compiler.deque[str] = compiler.deque(maxlen=3)
+        compiler._drain(stream, lines)
+        assert list(lines) == ["warning"] * 3
+        assert stream.reads < 100
+
+    def test_async_drain_long_line(self):
+        async def main():
+            reader = asyncio.StreamReader()
+            reader.feed_data(b"x" * 100_000 + b"\nnext\nlast")
+            reader.feed_eof()
+            lines: compiler.deque[str] = compiler.deque(maxlen=3)
+            await aio._drain(reader, lines)
+            return list(lines)
+
+        lines = asyncio.run(main())
+        assert lines == ["x" * 100_000, "next", "last"]
+
+    def test_error_has_stderr(self, noisy):
+        host = Host()
+        host.connect()
+        with pytest.raises(HostError) as exc_info:
+            host.compile(make_compile_request(source="a{b:c}"), timeout=10)
+        host.close()
+        assert exc_info.value.stderr.endswith("boom")
+        assert "boom" in str(exc_info.value)
+        assert len(host.stderr.splitlines()) == STDERR_LINES
+
+    def test_async_error_has_stderr(self, noisy):
+        async def main():
+            host = AsyncHost()
+            await host.connect()
+            try:
+                await host.compile(make_compile_request(source="a{b:c}"), timeout=10)
+            finally:
+                await host.close()
+
+        with pytest.raises(HostError) as exc_info:
+            asyncio.run(main())
+        assert exc_info.value.stderr.endswith("boom")
+
+
+class TestFor_AsyncHost:
+    def test_compile_concurrently(self):
+        async def main():
+            async with AsyncHost() as host:
+                return await asyncio.gather(
+                    *[host.compile_string(f"a {{ b: {i}; }}") for i in range(20)]
+                )
+
+        responses = asyncio.run(main())
+        assert [r.success.css for r in responses] == [
+            f"a {{\n  b: {i};\n}}" for i in range(20)
+        ]
+
+    def test_response_after_failure(self, monkeypatch):
+        handle = compiler._Compilation.handle
+
+        def fail_while_handling(pending, host, message):
+            result = handle(pending, host, message)
+            if result is not None:
+                # Request is failed between lookup and resolving by reader.
+                host._reject(pending, HostTimeoutError("Timed out."))
+            return result
+
+        monkeypatch.setattr(compiler._Compilation, "handle", fail_while_handling)
+
+        async def main():
+            async with AsyncHost() as host:
+                with pytest.raises(HostTimeoutError):
+                    await host.compile_string("a { b: c; }")
+                monkeypatch.undo()
+                resp = await host.compile_string("a { b: c; }")
+                return resp, host._error
+
+        resp, error = asyncio.run(main())
+        assert error is None
+        assert resp.success.css
+
+    def test_compile_path(self):
+        source = here / "test-basics" / "nesting/style.sass"
+        expect = here / "test-basics" / "nesting/style.compressed.css"
+
+        async def main():
+            async with AsyncHost() as host:
+                return await host.compile_path(source, style="compressed")
+
+        resp = asyncio.run(main())
+        assert resp.success.css + "\n" == expect.read_text()
+
+    def test_version(self):
+        async def main():
+            async with AsyncHost() as host:
+                req = InboundMessage()
+                req.version_request.id = 0
+                return await host.send_message(req)
+
+        resp = asyncio.run(main())
+        assert resp.version_response.compiler_version
@@ -1,3 +1,4 @@
+import asyncio
 import filecmp
 import shutil
 from pathlib import Path
@@ -15,6 +16,12 @@ targets = [
 ]
 
 
+@pytest.fixture(scope="module")
+def compiler():
+    with M.Compiler() as compiler:
+        yield compiler
+
+
 class TestFor_compie_string:
     @pytest.mark.parametrize("target", targets)
     @pytest.mark.parametrize("syntax", ["sass", "scss"])
@@ -99,6 +106,49 @@ class TestFor_compie_string:
         assert not result.output
 
 
+class TestFor_Compiler:
+    @pytest.mark.parametrize("target", targets)
+    @pytest.mark.parametrize("syntax", ["sass", "scss"])
+    @pytest.mark.parametrize("style", ["expanded", "compressed"])
+    def test_compile_string(
+        self, compiler: M.Compiler, target: str, syntax: str, style: str
+    ):
+        source = here / "test-basics" / f"{target}/style.{syntax}"
+        expect = here / "test-basics" / f"{target}/style.{style}.css"
+        result = compiler.compile_string(source.read_text(), syntax=syntax, style=style)  # type: ignore[arg-type]
+        assert result.ok
+        assert result.output == expect.read_text()
+
+    @pytest.mark.parametrize("style", ["expanded", "compressed"])
+    def test_compile_string_with_embed_sourcemap(self, compiler: M.Compiler, style):
+        source = here / "test-basics" / "nesting/style.scss"
+        expect = here / "test-basics" / f"nesting/style.{style}.css"
+        result = M.compile_string(
+            source.read_text(),
+            style=style,
+            embed_sourcemap=True,
+            compiler=compiler,
+        )
+        assert result.output
+        assert expect.read_text().strip() in result.output
+        assert "sourceMappingURL=data:application/json" in result.output
+
+    def test_compile_string_moduled(self, compiler: M.Compiler):
+        source = here / "test-basics" / "modules/scss" / "style.scss"
+        expect = here / "test-basics" / "modules/style.expanded.css"
+        result = M.compile_string(
+            source.read_text(), load_paths=[source.parent], compiler=compiler
+        )
+        assert result.output == expect.read_text()
+
+    def test_invalid(self, compiler: M.Compiler):
+        source = here / "test-invalids" / "no-variables.scss"
+        result = M.compile_string(source.read_text(), compiler=compiler)
+        assert not result.ok
+        assert result.error
+        assert not result.output
+
+
 class TestFor_compie_file:
     @pytest.mark.parametrize("target", targets)
     @pytest.mark.parametrize("syntax", ["sass", "scss"])
@@ -145,6 +195,128 @@ class TestFor_compie_file:
         assert r_relative != r_absolute
 
 
+class TestFor_separate_sourcemap:
+    def test_compile_string(self, compiler: M.Compiler):
+        source = here / "test-basics" / "nesting/style.scss"
+        expect = here / "test-basics" / "nesting/style.expanded.css"
+        result = M.compile_string(
+            source.read_text(), compiler=compiler, separate_sourcemap=True
+        )
+        assert result.output == expect.read_text()
+        assert result.source_map
+        assert "sourceMappingURL" not in result.output
+        assert "source_map_data" not in vars(result)
+        assert result.source_map_data and result.source_map_data["mappings"]
+        assert "source_map_data" in vars(result)
+
+    def test_compile_string_without_compiler(self):
+        result = M.compile_string("a { b: c; }", separate_sourcemap=True)
+        assert result.ok and result.source_map
+
+    def test_compile_file(self, compiler: M.Compiler, tmp_path: Path):
+        source = here / "test-basics" / "nesting/style.scss"
+        dest = tmp_path / "nesting.css"
+        result = M.compile_file(
+            source, dest, compiler=compiler, separate_sourcemap=True
+        )
+        assert result.ok and result.source_map_data
+        assert not (tmp_path / "nesting.css.map").exists()
+        assert "sourceMappingURL" not in dest.read_text()
+        assert result.source_map_data["file"] == "nesting.css"
+        assert not result.source_map_data["sources"][0].startswith("file:")
+
+    def test_with_embed_sourcemap(self):
+        with pytest.raises(ValueError):
+            M.compile_string("a{b:c}", embed_sourcemap=True, separate_sourcemap=True)
+
+    def test_default(self, compiler: M.Compiler):
+        result = M.compile_string("a { b: c; }", compiler=compiler)
+        assert result.source_map is None
+        assert result.source_map_data is None
+
+
+class TestFor_compile_many:
+    def _sources(self, count: int) -> list[str]:
+        return [f".item-{i} {{ width: {i}px; }}" for i in range(count)]
+
+    def _expected(self, idx: int) -> str:
+        return f".item-{idx} {{\n  width: {idx}px;\n}}\n"
+
+    @pytest.mark.parametrize("window", [1, 8, 64])
+    def test_ordered(self, window: int, compiler):
+        results = list(
+            M.compile_many(self._sources(30), compiler=compiler, window=window)
+        )
+        assert [i for i, _ in results] == list(range(30))
+        assert all(r.output == self._expected(i) for i, r in results)
+
+    def test_unordered(self, compiler):
+        results = dict(
+            M.compile_many(
+                iter(self._sources(30)), compiler=compiler, ordered=False, window=4
+            )
+        )
+        assert sorted(results) == list(range(30))
+        assert all(r.output == self._expected(i) for i, r in results.items())
+
+    def test_with_failure(self, compiler):
+        sources = ["a { color: red; }", "a { color: red; ", "b { color: blue; }"]
+        results = [r for _, r in M.compile_many(sources, compiler=compiler)]
+        assert [r.ok for r in results] == [True, False, True]
+
+    @pytest.mark.parametrize("ordered", [True, False])
+    def test_timeout(self, ordered: bool):
+        sources = ["@for $i from 1 through 50000 { .a-#{$i} { b: $i; } }", "a{b:c}"]
+        with M.Compiler() as compiler:
+            results = dict(
+                M.compile_many(sources, compiler=compiler, ordered=ordered, timeout=0.2)
+            )
+        assert not results[0].ok and "not received" in (results[0].error or "")
+        assert results[1].ok
+
+    def test_slow_request_does_not_expire_others(self, monkeypatch):
+        from concurrent.futures import Future
+        from threading import Timer
+
+        from sass_embedded.protocol.compiler import HostTimeoutError
+        from sass_embedded.protocol.embedded_sass_pb2 import OutboundMessage
+
+        def submit(source, *args):
+            # Host fails hung request by its own deadline, after limit of others.
+            future: Future = Future()
+            if source == "hung":
+                error = HostTimeoutError("Response is not received in 0.1 seconds.")
+                Timer(0.15, future.set_exception, (error,)).start()
+            else:
+                response = OutboundMessage.CompileResponse()
+                response.success.css = "a {}"
+                Timer(0.3, future.set_result, (response,)).start()
+            return future
+
+        with M.Compiler() as compiler:
+            monkeypatch.setattr(compiler, "_submit_string", submit)
+            results = dict(
+                M.compile_many(
+                    ["hung", "a {}"],
+                    compiler=compiler,
+                    ordered=False,
+                    window=2,
+                    timeout=0.1,
+                )
+            )
+        assert not results[0].ok
+        assert results[1].ok
+
+    def test_temporary_compiler_and_pool(self):
+        from sass_embedded.protocol.pool import HostPool
+
+        results = list(M.compile_many(self._sources(3)))
+        assert [r.output for _, r in results] == [self._expected(i) for i in range(3)]
+        with M.Compiler(HostPool(2)) as compiler:
+            results = list(M.compile_many(self._sources(20), compiler=compiler))
+        assert [r.output for _, r in results] == [self._expected(i) for i in range(20)]
+
+
 class TestFor_compile_directory:
     def _setup_items(
         self, base_dir: Path, syntax: str, style: str
@@ -224,3 +396,88 @@ class TestFor_compile_directory:
             output1_text = output1_filepath.read_text(encoding="utf8")
             output2_text = output2_filepath.read_text(encoding="utf8")
             assert output1_text != output2_text
+
+
+class TestFor_compile_directory_parallel:
+    def _setup_items(self, base_dir: Path) -> Path:
+        source = base_dir / "source"
+        shutil.copytree(here / "test-basics/modules/scss", source / "modules")
+        for s in (here / "test-basics").glob("*/style.scss"):
+            shutil.copy(s, source / f"{s.parent.name}.scss")
+        return source
+
+    @pytest.mark.parametrize("no_sourcemap", [True, False])
+    @pytest.mark.parametrize("style", ["expanded", "compressed"])
+    def test_same_as_cli(self, no_sourcemap: bool, style: str, tmp_path: Path):
+        source = self._setup_items(tmp_path)
+        M.compile_directory(
+            source, tmp_path / "cli", style=style, no_sourcemap=no_sourcemap
+        )  # type: ignore[arg-type]
+        results = M.compile_directory_parallel(
+            source,
+            tmp_path / "parallel",
+            style=style,  # type: ignore[arg-type]
+            no_sourcemap=no_sourcemap,
+            workers=2,
+        )
+        assert list(results) == M.find_entries(source)
+        assert all(r.ok and r.elapsed is not None for r in results.values())
+        expected = sorted(
+            p.relative_to(tmp_path / "cli") for p in (tmp_path / "cli").rglob("*.css*")
+        )
+        actual = sorted(
+            p.relative_to(tmp_path / "parallel")
+            for p in (tmp_path / "parallel").rglob("*.css*")
+        )
+        assert actual == expected
+        for path in expected:
+            assert (tmp_path / "parallel" / path).read_bytes() == (
+                tmp_path / "cli" / path
+            ).read_bytes()
+
+    def test_failure_per_file(self, tmp_path: Path, compiler):
+        source = tmp_path / "source"
+        source.mkdir()
+        (source / "ok.scss").write_text("a { color: red; }")
+        (source / "ng.scss").write_text("a { color: red; ")
+        results = M.compile_directory_parallel(
+            source, tmp_path / "dist", compiler=compiler
+        )
+        assert results[source / "ok.scss"].ok
+        assert not results[source / "ng.scss"].ok
+        assert not (tmp_path / "dist/ng.css").exists()
+
+
+class TestFor_async_functions:
+    @pytest.mark.parametrize("target", targets)
+    @pytest.mark.parametrize("syntax", ["sass", "scss"])
+    def test_compile_string(self, target: str, syntax: str):
+        source = here / "test-basics" / f"{target}/style.{syntax}"
+        expect = here / "test-basics" / f"{target}/style.expanded.css"
+        result = asyncio.run(M.compile_string_async(source.read_text(), syntax=syntax))  # type: ignore[arg-type]
+        assert result.output == expect.read_text()
+
+    @pytest.mark.parametrize("no_sourcemap", [True, False])
+    @pytest.mark.parametrize("embed_sourcemap", [True, False])
+    @pytest.mark.parametrize("source_urls", ["relative", "absolute"])
+    def test_compile_file_same_as_cli(
+        self, no_sourcemap: bool, embed_sourcemap: bool, source_urls, tmpdir: Path
+    ):
+        source = here / "test-basics" / "modules/scss/style.scss"
+        kwargs = dict(
+            load_paths=[source.parent],
+            no_sourcemap=no_sourcemap,
+            embed_sourcemap=embed_sourcemap,
+            source_urls=source_urls,
+        )
+        cli_dest = Path(tmpdir) / "cli/style.css"
+        M.compile_file(source, cli_dest, **kwargs)  # type: ignore[arg-type]
+        dest = Path(tmpdir) / "async/style.css"
+        result = asyncio.run(M.compile_file_async(source, dest, **kwargs))  # type: ignore[arg-type]
+        assert result.output == dest
+        assert dest.read_text() == cli_dest.read_text()
+        cli_map = cli_dest.parent / "style.css.map"
+        map_ = dest.parent / "style.css.map"
+        assert map_.exists() == cli_map.exists()
+        if map_.exists():
+            assert map_.read_text() == cli_map.read_text()
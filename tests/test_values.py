@@ -0,0 +1,113 @@
+import pytest
+
+from sass_embedded.protocol.compiler import Host, make_compile_request
+from sass_embedded.protocol.functions import Functions
+from sass_embedded.values import (
+    CalculationInterpolation,
+    CalculationOperation,
+    SassArgumentList,
+    SassCalculation,
+    SassColor,
+    SassList,
+    SassMap,
+    SassNumber,
+    SassString,
+    decode,
+    encode,
+)
+
+
+@pytest.mark.parametrize(
+    "obj",
+    [
+        None,
+        True,
+        False,
+        SassString("text"),
+        SassString("unquoted", quoted=False),
+        SassNumber(1.5),
+        SassNumber(2, "px"),
+        SassNumber(1, numerators=["px"], denominators=["s"]),
+        SassColor("rgb", 1.0, 2.0, 3.0, 0.5),
+        SassColor("hsl", None, 20.0, 30.0, None),
+        SassList([SassNumber(1), SassString("a")], separator="space", brackets=True),
+        SassMap({SassString("a"): SassList([SassNumber(1)])}),
+        SassArgumentList([SassNumber(1)], {"size": SassNumber(2, "px")}, id=3),
+        SassCalculation(
+            "calc",
+            [
+                CalculationOperation(
+                    "+", SassNumber(100, "%"), CalculationInterpolation("$x")
+                ),
+                SassString("var(--x)", quoted=False),
+                SassCalculation("min", [SassNumber(1, "px")]),
+            ],
+        ),
+    ],
+)
+def test_round_trip(obj):
+    assert decode(encode(obj)) == obj
+
+
+def test_python_objects():
+    assert decode(encode("a")) == SassString("a")
+    assert decode(encode(1)) == SassNumber(1)
+    assert decode(encode([1, "a"])) == SassList([SassNumber(1), SassString("a")])
+    assert decode(encode({"a": [1]})) == {"a": [1]}
+    with pytest.raises(ValueError):
+        encode(object())
+
+
+def test_equality_with_python():
+    assert SassString("a", quoted=False) == "a"
+    assert {SassString("a"): 1}["a"] == 1
+    assert SassNumber(2) == 2
+    assert SassNumber(2, "px") != 2
+    assert SassList([1, 2]) == [1, 2]
+    assert SassMap({"a": 1}) == {"a": 1}
+
+
+def test_immutable():
+    value = SassNumber(1, "px")
+    with pytest.raises(AttributeError):
+        value.value = 2  # type: ignore[misc]
+    with pytest.raises(AttributeError):
+        value.other = 2  # type: ignore[attr-defined]
+    assert SassNumber(1, "px").unit == "px"
+    assert SassNumber(1, numerators=["px", "em"], denominators=["s"]).unit == "px*em/s"
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        SassList([], separator="tab")
+    with pytest.raises(ValueError):
+        CalculationOperation("%", 1, 2)
+
+
+def test_decode_from_compiler():
+    received = []
+    functions = Functions()
+    functions.add("capture($value)", lambda v: received.append(v) or v)
+    source = """
+    a {
+      b: capture([1px 2px]);
+      $map: capture((key: rgba(1, 2, 3, 0.5)));
+      d: capture(calc(100% - 10px));
+    }
+    """
+    host = Host()
+    host.connect()
+    try:
+        message = make_compile_request(source=source, functions=functions)
+        response = host.compile(message, functions=functions)
+    finally:
+        host.close()
+    assert response.success.css
+    assert received[0] == SassList(
+        [SassNumber(1, "px"), SassNumber(2, "px")], separator="space", brackets=True
+    )
+    assert received[1] == {SassString("key"): SassColor("rgb", 1, 2, 3, 0.5)}
+    assert received[2] == SassCalculation(
+        "calc",
+        [CalculationOperation("-", SassNumber(100, "%"), SassNumber(10, "px"))],
+    )
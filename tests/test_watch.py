@@ -0,0 +1,163 @@
+import threading
+from pathlib import Path
+
+import pytest
+
+from sass_embedded import simple
+from sass_embedded import watch as M
+
+here = Path(__file__).parent
+
+
+class TestFor_DependencyGraph:
+    def test_affected(self):
+        graph = M.DependencyGraph()
+        graph.update(Path("/a.scss"), [Path("/_base.scss"), Path("/_a.scss")])
+        graph.update(Path("/b.scss"), [Path("/_base.scss")])
+        assert graph.affected([Path("/_base.scss")]) == {
+            Path("/a.scss"),
+            Path("/b.scss"),
+        }
+        assert graph.affected([Path("/_a.scss")]) == {Path("/a.scss")}
+        assert graph.affected([Path("/b.scss")]) == {Path("/b.scss")}
+        assert graph.affected([Path("/_other.scss")]) == set()
+
+    def test_update_replaces(self):
+        graph = M.DependencyGraph()
+        graph.update(Path("/a.scss"), [Path("/_a.scss")])
+        graph.update(Path("/a.scss"), [Path("/_b.scss")])
+        assert graph.affected([Path("/_a.scss")]) == set()
+        assert graph.files == {Path("/a.scss"), Path("/_b.scss")}
+
+    def test_remove(self):
+        graph = M.DependencyGraph()
+        graph.update(Path("/a.scss"), [Path("/_a.scss")])
+        graph.remove(Path("/a.scss"))
+        assert graph.files == set()
+        assert graph.entries == set()
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "_base.scss").write_text("$color: #333;\n")
+    (src / "_other.scss").write_text("$size: 1px;\n")
+    (src / "a.scss").write_text('@use "base";\na { color: base.$color; }\n')
+    (src / "b.scss").write_text('@use "other";\nb { width: other.$size; }\n')
+    return tmp_path
+
+
+class TestFor_Watcher:
+    def _watcher(self, project: Path, compiled: list[Path]) -> M.Watcher:
+        options = simple._file_options(None, "expanded", True, False, False, "relative")
+        return M.Watcher(
+            project / "src",
+            project / "dist",
+            options,
+            on_compiled=lambda entry, result: compiled.append(entry.name),
+        )
+
+    def test_build(self, project: Path):
+        compiled: list[Path] = []
+        with self._watcher(project, compiled) as watcher:
+            results = watcher.build()
+        assert all(r.ok for r in results.values())
+        assert compiled == ["a.scss", "b.scss"]
+        assert (project / "dist/a.css").read_text() == "a {\n  color: #333;\n}\n"
+
+    def test_rebuild_only_affected(self, project: Path):
+        compiled: list[Path] = []
+        with self._watcher(project, compiled) as watcher:
+            watcher.build()
+            compiled.clear()
+            (project / "src/_base.scss").write_text("$color: #444;\n")
+            watcher.rebuild(watcher.poll())
+        assert compiled == ["a.scss"]
+        assert "#444" in (project / "dist/a.css").read_text()
+
+    def test_rebuild_added_entry(self, project: Path):
+        compiled: list[Path] = []
+        with self._watcher(project, compiled) as watcher:
+            watcher.build()
+            compiled.clear()
+            (project / "src/c.scss").write_text("c { color: red; }\n")
+            watcher.rebuild(watcher.poll())
+        assert compiled == ["c.scss"]
+
+    def test_retry_failed_entry(self, project: Path):
+        compiled: list[Path] = []
+        (project / "src/c.scss").write_text('@use "missing";\n')
+        with self._watcher(project, compiled) as watcher:
+            results = watcher.build()
+            assert not results[project / "src/c.scss"].ok
+            compiled.clear()
+            (project / "src/_missing.scss").write_text("c { color: red; }\n")
+            results = watcher.rebuild(watcher.poll())
+        assert compiled == ["c.scss"]
+        assert results[project / "src/c.scss"].ok
+
+    def test_restart_crashed_host(self, project: Path):
+        compiled: list[Path] = []
+        with self._watcher(project, compiled) as watcher:
+            watcher.build()
+            host = watcher.compiler.host
+            host._proc.kill()  # type: ignore[union-attr]
+            host._proc.wait()  # type: ignore[union-attr]
+            host._reader.join()  # type: ignore[union-attr]
+            (project / "src/_base.scss").write_text("$color: #444;\n")
+            results = watcher.rebuild(watcher.poll())
+            assert watcher.compiler.host is not host
+        assert results[project / "src/a.scss"].ok
+        assert "#444" in (project / "dist/a.css").read_text()
+
+    def test_scan_removed_partial(self, project: Path, monkeypatch):
+        compiled: list[Path] = []
+        (project / "src/c.scss").write_text('@use "missing";\n')
+        with self._watcher(project, compiled) as watcher:
+            watcher.build()
+            removed = project / "src/_removed.scss"
+            removed.write_text("")
+            original = Path.rglob
+
+            def rglob(self, pattern):
+                paths = list(original(self, pattern))
+                removed.unlink(missing_ok=True)
+                return paths
+
+            monkeypatch.setattr(Path, "rglob", rglob)
+            stats = watcher._scan()
+        assert removed not in stats
+
+    def test_run_debounce(self, project: Path):
+        compiled: list[Path] = []
+        stop = threading.Event()
+        with self._watcher(project, compiled) as watcher:
+            thread = threading.Thread(
+                target=watcher.run, kwargs={"interval": 0.05, "stop": stop}
+            )
+            thread.start()
+            try:
+                while len(compiled) < 2:
+                    stop.wait(0.01)
+                for i in range(3):
+                    (project / "src/_base.scss").write_text(f"$color: #{i}{i}{i};\n")
+                while len(compiled) < 3:
+                    stop.wait(0.01)
+                stop.wait(0.5)
+            finally:
+                stop.set()
+                thread.join()
+        assert compiled.count("a.scss") == 2
+        assert "#222" in (project / "dist/a.css").read_text()
+
+
+def test_main_parser():
+    from sass_embedded.__main__ import make_parser
+
+    args = make_parser().parse_args(["watch", "src", "dist", "-I", "vendor"])
+    assert args.source == Path("src")
+    assert args.load_paths == [Path("vendor")]
+    assert args.debounce == 0.1
+    args = make_parser().parse_args(["watch", "src", "dist", "--debounce", "1.5"])
+    assert args.debounce == 1.5